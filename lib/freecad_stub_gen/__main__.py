@@ -1,6 +1,14 @@
+import argparse
 import logging
+from pathlib import Path
 
-from freecad_stub_gen.config import LOGGER_LEVEL
+from freecad_stub_gen.config import (
+    LOGGER_LEVEL,
+    PROFILE_PATH,
+    PROFILE_TOP,
+    TARGET_DIR,
+    TRACE_PATH,
+)
 from freecad_stub_gen.logger import RepeatedFilter
 
 
@@ -9,15 +17,132 @@ def configLogger():
     logging.getLogger().addFilter(RepeatedFilter())
 
 
-def main():
-    from freecad_stub_gen.generate import generateFreeCadStubs
+def parseArgs(args: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='freecad_stub_gen', description='Generate python stubs for FreeCAD.'
+    )
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        type=int,
+        default=1,
+        help='number of processes generating modules (0 - use all processors)',
+    )
+    parser.add_argument(
+        '-i',
+        '--incremental',
+        action='store_true',
+        help='generate only stubs of files changed since the previous run',
+    )
+    parser.add_argument(
+        '-k',
+        '--keep-unchanged',
+        action='store_true',
+        help='do not remove target directory, write only changed stub files',
+    )
+    parser.add_argument(
+        '--profile',
+        type=Path,
+        default=PROFILE_PATH,
+        metavar='REPORT',
+        help='save JSON report with time of stages, generators, files and functions',
+    )
+    parser.add_argument(
+        '--profile-top',
+        type=int,
+        default=PROFILE_TOP,
+        help='number of the slowest files and functions in the profiler report',
+    )
+    parser.add_argument(
+        '--trace',
+        type=Path,
+        default=TRACE_PATH,
+        metavar='TRACE',
+        help='save trace events of the generation (chrome://tracing, Perfetto)',
+    )
+    parser.add_argument(
+        '-t',
+        '--target',
+        type=Path,
+        default=TARGET_DIR,
+        help='directory where stubs are generated (it may be removed)',
+    )
+    parser.add_argument(
+        '-r',
+        '--revision',
+        metavar='REV',
+        help='read sources from this revision of FreeCAD git repository '
+        '(the repository does not have to be checked out)',
+    )
+    irGroup = parser.add_mutually_exclusive_group()
+    irGroup.add_argument(
+        '--dump-ir',
+        type=Path,
+        metavar='IR',
+        help='save intermediate representation of stubs (JSON if suffix is `.json`)',
+    )
+    irGroup.add_argument(
+        '--from-ir',
+        type=Path,
+        metavar='IR',
+        help='save stubs from intermediate representation without FreeCAD sources',
+    )
+    return parser.parse_args(args)
+
+
+def main(
+    jobs: int = 1,
+    *,
+    incremental: bool = False,
+    keepUnchanged: bool = False,
+    profilePath: Path | None = None,
+    profileTop: int = PROFILE_TOP,
+    tracePath: Path | None = None,
+    dumpIrPath: Path | None = None,
+    fromIrPath: Path | None = None,
+    targetPath: Path = TARGET_DIR,
+    revision: str | None = None,
+):
+    from freecad_stub_gen.file_functions import getSourceTree
+    from freecad_stub_gen.generate import (
+        generateFreeCadStubs,
+        generateFreeCadStubsFromIr,
+    )
     from freecad_stub_gen.generators.types_enum import generateTypes
+    from freecad_stub_gen.profiler import profiler
 
-    generateTypes()
-    generateFreeCadStubs()
+    profiler.enabled = profilePath is not None or tracePath is not None
+    if fromIrPath is not None:
+        generateFreeCadStubsFromIr(fromIrPath, targetPath, keepUnchanged=keepUnchanged)
+    else:
+        generateFreeCadStubs(
+            targetPath=targetPath,
+            jobs=jobs,
+            incremental=incremental,
+            keepUnchanged=keepUnchanged,
+            irPath=dumpIrPath,
+            revision=revision,
+            typeConsts=generateTypes(getSourceTree(revision=revision)),
+        )
+    if profilePath is not None:
+        profiler.saveReport(profilePath, profileTop)
+    if tracePath is not None:
+        profiler.saveTrace(tracePath)
 
 
 if __name__ == '__main__':
+    arguments = parseArgs()
     configLogger()
-    main()
+    main(
+        jobs=arguments.jobs,
+        incremental=arguments.incremental,
+        keepUnchanged=arguments.keep_unchanged,
+        profilePath=arguments.profile,
+        profileTop=arguments.profile_top,
+        tracePath=arguments.trace,
+        dumpIrPath=arguments.dump_ir,
+        fromIrPath=arguments.from_ir,
+        targetPath=arguments.target,
+        revision=arguments.revision,
+    )
     logging.info("freecad_stub_gen finished successfully")
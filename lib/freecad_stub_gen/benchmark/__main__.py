@@ -0,0 +1,81 @@
+import argparse
+import json
+import logging
+import shutil
+import tempfile
+from pathlib import Path
+
+from freecad_stub_gen.benchmark.harness import formatTimings, runBenchmark
+from freecad_stub_gen.benchmark.synthetic_tree import generateSourceTree
+from freecad_stub_gen.logger import RepeatedFilter
+
+
+def parseArgs(args: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='freecad_stub_gen.benchmark',
+        description='Measure time of stub generation for a synthetic source tree.',
+    )
+    parser.add_argument(
+        '-s',
+        '--size',
+        type=int,
+        default=50,
+        help='number of generated classes in each directory of the synthetic tree',
+    )
+    parser.add_argument(
+        '--source',
+        type=Path,
+        help='use existing FreeCAD `src` directory instead of the synthetic tree',
+    )
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=3, help='number of measured runs'
+    )
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1, help='number of generating processes'
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='read source files through the persistent cache',
+    )
+    parser.add_argument(
+        '--work-dir',
+        type=Path,
+        default=Path(tempfile.gettempdir()) / 'freecad_stub_gen_benchmark',
+        help='directory for the synthetic tree and generated stubs',
+    )
+    parser.add_argument('-o', '--output', type=Path, help='save all times to JSON file')
+    return parser.parse_args(args)
+
+
+def main(arguments: argparse.Namespace):
+    workDir: Path = arguments.work_dir
+    if (sourcePath := arguments.source) is None:
+        sourcePath = workDir / 'src'
+        shutil.rmtree(sourcePath, ignore_errors=True)
+        generateSourceTree(sourcePath, arguments.size)
+
+    timings = runBenchmark(
+        sourcePath,
+        workDir / 'stubs',
+        arguments.jobs,
+        arguments.repeat,
+        useCache=arguments.cache,
+    )
+    print(formatTimings(timings))  # noqa: T201
+
+    if arguments.output is not None:
+        report = {
+            'source': str(arguments.source or f'synthetic:{arguments.size}'),
+            'jobs': arguments.jobs,
+            'cache': arguments.cache,
+            'timings': timings,
+        }
+        arguments.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().addFilter(RepeatedFilter())
+    logging.getLogger('freecad_stub_gen.benchmark').setLevel(logging.INFO)
+    main(parseArgs())
@@ -0,0 +1,120 @@
+import logging
+import statistics
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from freecad_stub_gen.config import CACHE_DIR
+from freecad_stub_gen.file_functions import (
+    SourceTree,
+    StrippedContentCache,
+    setSourceTree,
+)
+from freecad_stub_gen.generate import buildIndexes, generateFreeCadStubs
+from freecad_stub_gen.generators.common.cpp_function import (
+    getBracketIndex,
+    getClassDeclarationIndex,
+    getFunctionBodyIndex,
+    getMemberDeclarationIndex,
+    getPreprocessorRegions,
+)
+
+logger = logging.getLogger(__name__)
+
+type Timings = dict[str, list[float]]
+
+
+def _newSourceTree(sourcePath: Path, *, useCache: bool) -> SourceTree:
+    """Share a new (not scanned) source tree, so nothing is reused between runs."""
+    cache = StrippedContentCache(CACHE_DIR) if useCache and CACHE_DIR else None
+    sourceTree = SourceTree(sourcePath.resolve(), cache)
+    setSourceTree(sourceTree)
+    for getIndex in (
+        getBracketIndex,
+        getPreprocessorRegions,
+        getFunctionBodyIndex,
+        getClassDeclarationIndex,
+        getMemberDeclarationIndex,
+    ):
+        getIndex.cache_clear()
+    return sourceTree
+
+
+def timeEndToEnd(
+    sourcePath: Path, targetPath: Path, jobs: int = 1, *, useCache: bool = False
+) -> float:
+    _newSourceTree(sourcePath, useCache=useCache)
+    start = time.perf_counter()
+    generateFreeCadStubs(sourcePath, targetPath, jobs)
+    return time.perf_counter() - start
+
+
+def timeStages(
+    sourcePath: Path, targetPath: Path, jobs: int = 1, *, useCache: bool = False
+) -> dict[str, float]:
+    """Run the generation stage by stage, each stage reuses data of previous ones.
+
+    The last stage (`generate`) contains generators, merging modules and saving.
+    """
+    sourceTree = _newSourceTree(sourcePath, useCache=useCache)
+    timings: dict[str, float] = {}
+
+    def measure(stage: str, start: float):
+        timings[stage] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cppFiles = list(sourceTree.genCppFiles())
+    xmlFiles = list(sourceTree.genXmlFiles())
+    measure('walk', start)
+
+    start = time.perf_counter()
+    for file in cppFiles:
+        sourceTree.readContent(file)
+    measure('read', start)
+
+    start = time.perf_counter()
+    for file in xmlFiles:
+        sourceTree.parseXml(file)
+    measure('parseXml', start)
+
+    start = time.perf_counter()
+    buildIndexes(sourceTree)
+    measure('indexes', start)
+
+    start = time.perf_counter()
+    generateFreeCadStubs(sourcePath, targetPath, jobs)
+    measure('generate', start)
+    return timings
+
+
+def runBenchmark(
+    sourcePath: Path,
+    targetPath: Path,
+    jobs: int = 1,
+    repeat: int = 3,
+    *,
+    useCache: bool = False,
+) -> Timings:
+    """Return times of all runs for the whole generation (`total`) and each stage."""
+    timings: Timings = defaultdict(list)
+    for i in range(repeat):
+        logger.info(f'Benchmark run {i + 1}/{repeat}')
+        timings['total'].append(
+            timeEndToEnd(sourcePath, targetPath, jobs, useCache=useCache)
+        )
+        for stage, seconds in timeStages(
+            sourcePath, targetPath, jobs, useCache=useCache
+        ).items():
+            timings[stage].append(seconds)
+    return dict(timings)
+
+
+def formatTimings(timings: Timings) -> str:
+    nameWidth = max(map(len, timings), default=0)
+    lines = [f'{"stage":<{nameWidth}}  {"min":>9}  {"median":>9}  {"max":>9}']
+    for stage, times in timings.items():
+        lines.append(
+            f'{stage:<{nameWidth}}  {min(times):9.4f}  '
+            f'{statistics.median(times):9.4f}  {max(times):9.4f}'
+        )
+    return '\n'.join(lines)
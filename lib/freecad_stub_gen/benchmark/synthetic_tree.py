@@ -0,0 +1,418 @@
+"""Generator of a synthetic source tree with the same layout as FreeCAD `src`."""
+
+from pathlib import Path
+
+XML_TEMPLATE = """\
+<?xml version="1.0" encoding="UTF-8"?>
+<GenerateModel xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" \
+xsi:noNamespaceSchemaLocation="generateMetaModel_Module.xsd">
+  <PythonExport
+      Father="{father}"
+      Name="{name}Py"
+      Twin="{name}"
+      TwinPointer="{name}"
+      Include="{include}"
+      Namespace="{namespace}"
+      FatherInclude="{fatherNamespace}/{father}.h"
+      FatherNamespace="{fatherNamespace}"
+      Constructor="true"
+      RichCompare="{richCompare}"
+      NumberProtocol="{richCompare}">
+    <Documentation>
+      <Author Licence="LGPL" Name="Benchmark" EMail="benchmark@example.com" />
+      <UserDocu>{name} class documentation.</UserDocu>
+    </Documentation>
+    <Methode Name="scale">
+      <Documentation>
+        <UserDocu>scale(factor, copy=False) -> {name}
+Scale this object.</UserDocu>
+      </Documentation>
+    </Methode>
+    <Methode Name="getName" Const="true">
+      <Documentation>
+        <UserDocu>getName() -> str</UserDocu>
+      </Documentation>
+    </Methode>
+    <Attribute Name="Length" ReadOnly="false">
+      <Documentation>
+        <UserDocu>Length of the object.</UserDocu>
+      </Documentation>
+      <Parameter Name="Length" Type="Float"/>
+    </Attribute>
+    <Attribute Name="Items" ReadOnly="true">
+      <Documentation>
+        <UserDocu>Items of the object.</UserDocu>
+      </Documentation>
+      <Parameter Name="Items" Type="List"/>
+    </Attribute>
+  </PythonExport>
+</GenerateModel>
+"""
+
+IMP_TEMPLATE = """\
+#include "PreCompiled.h"
+
+#include "{name}Py.h"
+#include "{name}Py.cpp"
+
+using namespace {namespace};
+
+// returns a string which represents the object e.g. when printed in python
+std::string {name}Py::representation() const
+{{
+    return std::string("<{name} object>");
+}}
+
+PyObject *{name}Py::PyMake(struct _typeobject *, PyObject *, PyObject *)
+{{
+    return new {name}Py(new {name}());
+}}
+
+int {name}Py::PyInit(PyObject* args, PyObject* kwd)
+{{
+    double x = 0.0;
+    char* label = "label";
+    static char* kwlist[] = {{"x", "label", nullptr}};
+    if (!PyArg_ParseTupleAndKeywords(args, kwd, "|ds", kwlist, &x, &label))
+        return -1;
+    return 0;
+}}
+
+PyObject* {name}Py::scale(PyObject *args)
+{{
+    double factor;
+    PyObject* copy = Py_False;
+    if (!PyArg_ParseTuple(args, "d|O!", &factor, &PyBool_Type, &copy)) {{
+        PyErr_SetString(PyExc_ValueError, "Invalid factor");
+        return nullptr;
+    }}
+    if (factor < 0)
+        throw Py::Exception(Base::PyExc_FC_GeneralError, "Negative factor");
+    return new {name}Py(new {name}());
+}}
+
+PyObject* {name}Py::getName(PyObject *args)
+{{
+    if (!PyArg_ParseTuple(args, ""))
+        return nullptr;
+    return Py::new_reference_to(Py::String("{name}"));
+}}
+
+Py::Float {name}Py::getLength() const
+{{
+    return Py::Float(1.0);
+}}
+
+void {name}Py::setLength(Py::Float arg)
+{{
+}}
+
+Py::List {name}Py::getItems() const
+{{
+    Py::List list;
+    list.append(Py::Long(1));
+    return list;
+}}
+
+PyObject *{name}Py::getCustomAttributes(const char* /*attr*/) const
+{{
+    return nullptr;
+}}
+
+int {name}Py::setCustomAttributes(const char* /*attr*/, PyObject* /*obj*/)
+{{
+    return 0;
+}}
+"""
+
+BASE_HEADER_TEMPLATE = """\
+#ifndef BASE_{name}_H
+#define BASE_{name}_H
+
+namespace Base
+{{
+
+class BaseExport {name}
+{{
+public:
+    {name}();
+    double length() const;
+}};
+
+}} // namespace Base
+
+#endif // BASE_{name}_H
+"""
+
+FEATURE_HEADER_TEMPLATE = """\
+#ifndef {namespace}_{name}_H
+#define {namespace}_{name}_H
+
+namespace {namespace}
+{{
+
+class {namespace}Export {name} : public App::DocumentObject
+{{
+    PROPERTY_HEADER_WITH_OVERRIDE({namespace}::{name});
+
+public:
+    {name}();
+
+    App::PropertyFloat Size;
+    App::PropertyString Label2, Description;
+    App::PropertyBool Visible;
+}};
+
+}} // namespace {namespace}
+
+#endif // {namespace}_{name}_H
+"""
+
+FEATURE_TEMPLATE = """\
+#include "PreCompiled.h"
+
+#include "{name}.h"
+
+using namespace {namespace};
+
+PROPERTY_SOURCE({namespace}::{name}, App::DocumentObject)
+
+{name}::{name}()
+{{
+    ADD_PROPERTY(Size, (1.0));
+    ADD_PROPERTY_TYPE(Label2, (""), "Base", App::Prop_ReadOnly, "Second label");
+    ADD_PROPERTY_TYPE(Visible, (true), "Base", App::Prop_Hidden, "Visibility");
+}}
+"""
+
+METHODS_TEMPLATE = """\
+#include "PreCompiled.h"
+
+#include "Application.h"
+
+using namespace App;
+
+PyMethodDef Application::Methods[] = {{
+{methods}
+    {{nullptr, nullptr, 0, nullptr}}  /* Sentinel */
+}};
+{functions}
+"""
+
+METHOD_DEF_TEMPLATE = """\
+    {{"make{i}", (PyCFunction) Application::sMake{i}, METH_VARARGS,
+     "make{i}(name, count=1) -> None\\nMake {i} objects."}},"""
+
+METHOD_TEMPLATE = """
+PyObject* Application::sMake{i}(PyObject * /*self*/, PyObject *args)
+{{
+    char *name;
+    int count = 1;
+    if (!PyArg_ParseTuple(args, "s|i", &name, &count))
+        return nullptr;
+    Py_Return;
+}}
+"""
+
+EXCEPTIONS = """\
+#include "PreCompiled.h"
+
+PyObject* Base::PyExc_FC_GeneralError = nullptr;
+PyObject* Base::PyExc_FC_CADKernelError = nullptr;
+
+void Base::Interpreter::initExceptions()
+{
+    Base::PyExc_FC_GeneralError = PyErr_NewException(
+        "Base.FreeCADError", PyExc_RuntimeError, nullptr);
+    Base::PyExc_FC_CADKernelError = PyErr_NewException(
+        "Base.CADKernelError", Base::PyExc_FC_GeneralError, nullptr);
+}
+"""
+
+PY_OBJECT_BASE = """\
+#include "PreCompiled.h"
+
+PyObject* PyObjectBase::__repr()
+{
+    return nullptr;
+}
+"""
+
+EXTENSION_CLASS_HEADER = """\
+class PyResource : public Py::PythonExtension<PyResource>
+{
+public:
+    static void init_type();
+
+Q_SIGNALS:
+    void changed(int value);
+};
+"""
+
+EXTENSION_CLASS = """\
+#include "PreCompiled.h"
+
+void PyResource::init_type()
+{
+    behaviors().name("PyResource");
+    behaviors().doc("PythonResource");
+    add_varargs_method("value", &PyResource::value);
+    add_varargs_method("setValue", &PyResource::setValue, "setValue(name, value)");
+}
+
+Py::Object PyResource::value(const Py::Tuple& args)
+{
+    char *psName;
+    if (!PyArg_ParseTuple(args.ptr(), "s", &psName))
+        throw Py::Exception();
+    return Py::String("value");
+}
+
+Py::Object PyResource::setValue(const Py::Tuple& args)
+{
+    char *psName;
+    PyObject *psValue;
+    if (!PyArg_ParseTuple(args.ptr(), "sO", &psName, &psValue))
+        throw Py::Exception();
+    return Py::None();
+}
+"""
+
+EXTENSION_MODULE_TEMPLATE = """\
+#include "PreCompiled.h"
+
+namespace {module}
+{{
+class Module : public Py::ExtensionModule<Module>
+{{
+public:
+    Module() : Py::ExtensionModule<Module>("{module}")
+    {{
+        add_varargs_method("show", &Module::show,
+            "show(shape, name) -- Add the shape to the active document."
+        );
+        add_keyword_method("read", &Module::read, "read(filename)");
+        initialize("This module is the {module} module.");
+    }}
+
+private:
+    Py::Object show(const Py::Tuple& args)
+    {{
+        PyObject *pcObj;
+        char *name = "Shape";
+        if (!PyArg_ParseTuple(args.ptr(), "O!|s",
+                              &(Base::Vector0Py::Type), &pcObj, &name))
+            throw Py::Exception();
+        return Py::None();
+    }}
+
+    Py::Object read(const Py::Tuple& args, const Py::Dict& kwds)
+    {{
+        char* Name;
+        static char* kwd_list[] = {{"filename", nullptr}};
+        if (!PyArg_ParseTupleAndKeywords(args.ptr(), kwds.ptr(), "et", kwd_list,
+                                         "utf-8", &Name))
+            throw Py::Exception();
+        return Py::Long(1);
+    }}
+}};
+}} // namespace {module}
+
+PyObject* {module}::{module}Exception;
+
+PyMOD_INIT_FUNC({module})
+{{
+    {module}::{module}Exception = PyErr_NewException(
+        "{module}.{module}Error", PyExc_RuntimeError, nullptr);
+}}
+"""
+
+
+def _write(file: Path, content: str):
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_text(content, 'utf-8')
+
+
+def _writePyClass(
+    sourcePath: Path,
+    directory: str,
+    name: str,
+    namespace: str,
+    *,
+    richCompare: bool = False,
+):
+    """Write python class with its twin class.
+
+    Twin classes outside `Base` directory are document objects with properties.
+    """
+    _write(
+        sourcePath / directory / f'{name}Py.xml',
+        XML_TEMPLATE.format(
+            name=name,
+            namespace=namespace,
+            include=f'{directory}/{name}.h',
+            father='PyObjectBase',
+            fatherNamespace='Base',
+            richCompare=str(richCompare).lower(),
+        ),
+    )
+    _write(
+        sourcePath / directory / f'{name}PyImp.cpp',
+        IMP_TEMPLATE.format(name=name, namespace=namespace),
+    )
+    if namespace == 'Base':
+        _write(
+            sourcePath / directory / f'{name}.h', BASE_HEADER_TEMPLATE.format(name=name)
+        )
+        return
+
+    _write(
+        sourcePath / directory / f'{name}.h',
+        FEATURE_HEADER_TEMPLATE.format(name=name, namespace=namespace),
+    )
+    _write(
+        sourcePath / directory / f'{name}.cpp',
+        FEATURE_TEMPLATE.format(name=name, namespace=namespace),
+    )
+
+
+def generateSourceTree(sourcePath: Path, size: int = 10) -> Path:
+    """Write a synthetic FreeCAD `src` directory into `sourcePath`.
+
+    Each of `Base`, `App` and `Gui` directories contains `size` python classes
+    (`*Py.xml` with `*PyImp.cpp` and twin class with properties), there are
+    also `size` workbench modules in `Mod` directory.
+    """
+    _write(sourcePath / 'Base' / 'PyObjectBase.cpp', PY_OBJECT_BASE)
+    _write(sourcePath / 'Base' / 'Interpreter.cpp', EXCEPTIONS)
+    for i in range(size):
+        _writePyClass(sourcePath, 'Base', f'Vector{i}', 'Base', richCompare=True)
+
+    for i in range(size):
+        _writePyClass(sourcePath, 'App', f'Object{i}', 'App')
+    _write(
+        sourcePath / 'App' / 'ApplicationPy.cpp',
+        METHODS_TEMPLATE.format(
+            methods='\n'.join(METHOD_DEF_TEMPLATE.format(i=i) for i in range(size)),
+            functions=''.join(METHOD_TEMPLATE.format(i=i) for i in range(size)),
+        ),
+    )
+
+    for i in range(size):
+        _writePyClass(sourcePath, 'Gui', f'View{i}', 'Gui')
+    _write(sourcePath / 'Gui' / 'PyResource.h', EXTENSION_CLASS_HEADER)
+    _write(sourcePath / 'Gui' / 'PyResource.cpp', EXTENSION_CLASS)
+    _write(sourcePath / 'Main' / 'MainGui.cpp', 'int main() { return 0; }\n')
+
+    for i in range(size):
+        module = f'Workbench{i}'
+        _write(
+            sourcePath / 'Mod' / module / 'App' / f'App{module}.cpp',
+            EXTENSION_MODULE_TEMPLATE.format(module=module),
+        )
+        _writePyClass(sourcePath, f'Mod/{module}/App', f'{module}Feature', module)
+        _writePyClass(
+            sourcePath, f'Mod/{module}/Gui', f'{module}ViewProvider', f'{module}Gui'
+        )
+
+    return sourcePath
@@ -1,4 +1,5 @@
 import logging
+import os
 from pathlib import Path
 
 myDir = Path(__file__).resolve().parent
@@ -6,3 +7,36 @@ myDir = Path(__file__).resolve().parent
 LOGGER_LEVEL = logging.INFO
 SOURCE_DIR = (myDir / '../../FreeCAD/src/').resolve()
 TARGET_DIR = (myDir / '../../freecad_stubs/').resolve()
+
+# globs of source file paths (relative to `SOURCE_DIR`) used by generators
+SOURCE_INCLUDE = ('*.cpp', '*.xml')
+# globs of directory paths (relative to `SOURCE_DIR`) which are never walked,
+# `*` also matches `/`
+SOURCE_EXCLUDE = (
+    '3rdParty',
+    'Doc',
+    'Tools',
+    'Mod/Test',
+    'build',
+    '*/build',
+    'cmake-build-*',
+)
+
+# cache of source files without comments, set to `None` to disable
+CACHE_DIR: Path | None = (
+    Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache')
+    / 'freecad_stub_gen'
+)
+# compare content hash instead of trusting file size and modification time
+CACHE_VERIFY_HASH = False
+
+# save profiler report (JSON) of generation time to this path, `None` to disable
+PROFILE_PATH: Path | None = (
+    Path(p) if (p := os.environ.get('FREECAD_STUB_GEN_PROFILE')) else None
+)
+# number of the slowest files and functions listed in the profiler report
+PROFILE_TOP = 20
+# save trace of generation (`chrome://tracing` or Perfetto format) to this path
+TRACE_PATH: Path | None = (
+    Path(p) if (p := os.environ.get('FREECAD_STUB_GEN_TRACE')) else None
+)
@@ -1,24 +1,24 @@
 from __future__ import annotations
 
-import itertools
 import logging
-import re
-from functools import cached_property
-from typing import TYPE_CHECKING, Generic, Self, TypeVar, cast, overload
+from typing import TYPE_CHECKING, Generic, Self, TypeVar, overload
 
 from freecad_stub_gen.generators.common.cpp_function import (
     generateExpressionUntilChar,
     genFuncArgs,
+    getClassDeclarationIndex,
 )
 from freecad_stub_gen.generators.common.return_type_converter.full import (
     ReturnTypeConverter,
 )
 from freecad_stub_gen.ordered_set import OrderedStrSet
+from freecad_stub_gen.python_code.ir import QtSignalDef
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Iterator
 
-R = TypeVar('R')
+    from freecad_stub_gen.generators.common.cpp_function import ClassBlock
+
 T = TypeVar('T')
 logger = logging.getLogger(__name__)
 
@@ -43,13 +43,17 @@ class QtSignal(BlockItem):
         returnTypeAndName = self.raw[: self.raw.find('(')]
         self.name = returnTypeAndName.rsplit(' ', maxsplit=1)[-1]
 
-    def getStrRepr(self, requiredImports: OrderedStrSet):
+    def getSignalDef(self, requiredImports: OrderedStrSet) -> QtSignalDef:
         """triggered: typing.ClassVar[QtCore.pyqtSignal]."""
         requiredImports.update(self.requiredImports)
         requiredImports.add('typing')
         requiredImports.add('FreeCADTemplates.qt_types as qt')
 
-        protocolNames = []
+        signalDef = QtSignalDef(
+            self.name,
+            self.cppBlock.cppClass.name,
+            tuple(map(str, self.sigArgPythonTypes)),
+        )
         for argNum in range(len(self.sigArgPythonTypes) + 1):
             protArgs = ['self']
             protArgs += [
@@ -58,16 +62,12 @@ class QtSignal(BlockItem):
             if len(protArgs) > 1:
                 protArgs.append('/')
 
-            pn = f'__{self.cppBlock.cppClass.name}_{self.name}_{argNum}'
-            protocolNames.append(pn)
-
             requiredImports.add(
-                f'class {pn}(typing.Protocol):\n'
+                f'class {signalDef.getProtocolName(argNum)}(typing.Protocol):\n'
                 f'    def __call__({", ".join(protArgs)}): ...'
             )
 
-        slots = " | ".join(protocolNames)
-        return f'{self.name}: typing.ClassVar[qt.pyqtSignal[{slots}]]'
+        return signalDef
 
 
 class ClassVarContainer(Generic[T]):
@@ -122,24 +122,15 @@ class CppBlock(Generic[BI]):
 
     cppClass = LateInit['CppClass']()
 
-    def __init__(
-        self,
-        firstMatch: re.Match[str],
-        secondMatch: re.Match[str] | None,
-        classBody: str,
-    ):
-        self._firstMatch = firstMatch
-        self._secondMatch = secondMatch
-        self._classBody = classBody
+    def __init__(self, classBlock: ClassBlock):
+        self._classBlock = classBlock
 
     def __repr__(self):
-        return self._firstMatch.group()
+        return self._classBlock.header
 
-    @cached_property
+    @property
     def body(self) -> str:
-        start = self._firstMatch.end()
-        end = None if self._secondMatch is None else self._secondMatch.start()
-        return self._classBody[start:end].strip()
+        return self._classBlock.body
 
     def __iter__(self) -> Iterator[BI]:
         for e in generateExpressionUntilChar(
@@ -171,57 +162,22 @@ class CppClass:
         block.cppClass = self
 
 
-REG_BLOCK = re.compile(
-    r"""
-(
-    ((public|protected|private)\s+)?    # optional QT access modifier
-    (?P<qt_mod>Q_SLOTS|Q_SIGNALS)       # QT macro
-    \s*:                                # must ends on `:`
-)|(
-    (public|protected|private)          # c++ modifier
-    \s*:                                # must ends on `:`
-)""",
-    re.VERBOSE,
-)
-
-
-def pairwiseLongest(
-    it: Iterable[T], fill: R | None = None
-) -> Iterator[tuple[T, T | R]]:
-    return itertools.pairwise(itertools.chain(it, [cast(T, fill)]))
-
-
 def parseClass(className: str, fileContent: str) -> CppClass:
-    classBodyReg = re.compile(
-        rf"""
-class\s+            # keyword `class`
-(?:\w+\s+)?         # there may be optional macro: GuiExport|AppExport
-{className}\s*      # original class name
-[^{{]*              # optional inheritance
-{{                  # class body block
-    """,
-        re.VERBOSE,
-    )
-    if not (match := re.search(classBodyReg, fileContent)):
+    classBlocks = getClassDeclarationIndex(fileContent).findBlocks(className)
+    if classBlocks is None:
         msg = f'Cannot find class {className}'
         raise ValueError(msg)
 
-    classBody = next(
-        generateExpressionUntilChar(
-            fileContent, match.end(), splitChar='NONE', bracketL='{', bracketR='}'
-        )
-    )
-
     cppClass = CppClass(className)
 
-    for first, sec in pairwiseLongest(REG_BLOCK.finditer(classBody)):
-        if 'Q_SIGNALS' in first.group():
+    for classBlock in classBlocks:
+        if 'Q_SIGNALS' in classBlock.header:
             blockType: type[CppBlock] = QtSignalBlock
-        elif 'Q_SLOT' in first.group():
+        elif 'Q_SLOT' in classBlock.header:
             blockType = QtSlotBlock
         else:
             blockType = CppBlock
 
-        cppClass.addBlock(blockType(first, sec, classBody))
+        cppClass.addBlock(blockType(classBlock))
 
     return cppClass
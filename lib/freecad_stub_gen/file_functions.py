@@ -1,21 +1,518 @@
+from __future__ import annotations
+
+import contextlib
+import fnmatch
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import xml.etree.ElementTree as ET
+from functools import cached_property
 from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar
 
-from freecad_stub_gen.config import SOURCE_DIR
+from freecad_stub_gen.config import (
+    CACHE_DIR,
+    CACHE_VERIFY_HASH,
+    SOURCE_DIR,
+    SOURCE_EXCLUDE,
+    SOURCE_INCLUDE,
+)
 from freecad_stub_gen.cpp_code.converters import removeComments
+from freecad_stub_gen.profiler import profiler
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
 
-def readContent(file: Path):
+logger = logging.getLogger(__name__)
+
+
+def decodeText(data: bytes) -> str:
+    """Decode file content the same way as `Path.read_text` (universal newlines).
+
+    Legacy files which are not valid UTF-8 are decoded from the same buffer.
+    """
     try:
-        content = file.read_text('utf-8')
+        text = data.decode('utf-8')
     except UnicodeDecodeError:
-        content = file.read_text('iso8859-1')
+        text = data.decode('iso8859-1')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
 
-    return removeComments(content)
+def readText(file: Path) -> str:
+    return decodeText(file.read_bytes())
+
+
+def readContent(file: Path):
+    return removeComments(readText(file))
 
 
 def genCppFiles(sourcePath: Path = SOURCE_DIR):
-    yield from Path(sourcePath).glob('**/*.cpp')
+    yield from PathFilter(('*.cpp',)).walk(Path(sourcePath))
 
 
 def genXmlFiles(sourcePath: Path = SOURCE_DIR):
-    yield from Path(sourcePath).glob('**/*.xml')
+    yield from PathFilter(('*.xml',)).walk(Path(sourcePath))
+
+
+class PathFilter:
+    """Walk a directory, excluded directories are pruned (their content is not listed).
+
+    Globs are matched against paths relative to the walked directory
+    (with `/` separator), `include` against files and `exclude` against directories.
+    """
+
+    def __init__(
+        self,
+        include: Iterable[str] = SOURCE_INCLUDE,
+        exclude: Iterable[str] = SOURCE_EXCLUDE,
+    ):
+        self._regInclude = self._compile(include)
+        self._regExclude = self._compile(exclude)
+
+    @staticmethod
+    def _compile(globs: Iterable[str]) -> re.Pattern[str]:
+        # a single regex for all globs, empty globs match nothing
+        return re.compile('|'.join(map(fnmatch.translate, globs)) or '(?!)')
+
+    def isExcluded(self, relativeDir: str) -> bool:
+        return self._regExclude.match(relativeDir) is not None
+
+    def filterPaths(self, relativePaths: Iterable[str]) -> Iterator[str]:
+        """Yield included file paths which are not in any excluded directory."""
+        excludedDirs: dict[str, bool] = {}
+        for relativePath in relativePaths:
+            if not self._regInclude.match(relativePath):
+                continue
+
+            parts = relativePath.split('/')[:-1]
+            for i in range(1, len(parts) + 1):
+                relativeDir = '/'.join(parts[:i])
+                if (excluded := excludedDirs.get(relativeDir)) is None:
+                    excluded = excludedDirs[relativeDir] = self.isExcluded(relativeDir)
+                if excluded:
+                    break
+            else:
+                yield relativePath
+
+    def walk(self, root: Path) -> Iterator[Path]:
+        """Yield included files in the same order as `os.walk`.
+
+        Files of a directory are before files of its subdirectories.
+        """
+        yield from self._walk(str(root), '')
+
+    def _walk(self, dirPath: str, relativeDir: str) -> Iterator[Path]:
+        subDirs = []
+        try:
+            with os.scandir(dirPath) as it:
+                for entry in it:
+                    relativePath = relativeDir + entry.name
+                    if entry.is_dir():
+                        if not (entry.is_symlink() or self.isExcluded(relativePath)):
+                            subDirs.append((entry.path, relativePath))
+                    elif self._regInclude.match(relativePath):
+                        yield Path(entry.path)
+        except OSError:
+            return
+
+        for subDirPath, relativePath in subDirs:
+            yield from self._walk(subDirPath, f'{relativePath}/')
+
+
+class StrippedContentCache:
+    """Persistent cache of `readContent` results.
+
+    An entry is valid when the file size and modification time did not change.
+    If they changed (or `verifyHash` is set), the content hash is compared,
+    so only really modified files are stripped from comments again.
+    """
+
+    VERSION = 2  # increase when `removeComments` output or digest changes
+
+    def __init__(self, cacheDir: Path, *, verifyHash: bool = CACHE_VERIFY_HASH):
+        self.cacheDir = cacheDir
+        self.verifyHash = verifyHash
+        self._writable = True
+
+    def readContent(self, file: Path) -> str:
+        stat = file.stat()
+        stamp = f'{self.VERSION} {stat.st_size} {stat.st_mtime_ns}'
+        cacheFile = self._getCacheFile(file)
+
+        cachedStamp, cachedDigest, content = self._load(cacheFile)
+        if cachedStamp == stamp and not self.verifyHash:
+            return content
+
+        data = file.read_bytes()
+        digest = hashlib.sha1(data, usedforsecurity=False).hexdigest()
+        if cachedDigest != digest:
+            content = removeComments(decodeText(data))
+        elif cachedStamp == stamp:
+            return content  # verified - nothing changed
+
+        self._save(cacheFile, f'{stamp} {digest}\n{content}')
+        return content
+
+    def readBlobContent(self, blobId: str, readData: Callable[[], bytes]) -> str:
+        """Return content of immutable data identified by `blobId` (ex. git blob).
+
+        The data are read by `readData` only if they are not cached.
+        """
+        stamp = f'{self.VERSION} blob'
+        cacheFile = self._getCacheFile(f'blob {blobId}')
+        cachedStamp, cachedDigest, content = self._load(cacheFile)
+        if (cachedStamp, cachedDigest) == (stamp, blobId):
+            return content
+
+        content = removeComments(decodeText(readData()))
+        self._save(cacheFile, f'{stamp} {blobId}\n{content}')
+        return content
+
+    def _getCacheFile(self, file: Path | str) -> Path:
+        name = file if isinstance(file, str) else str(file.absolute())
+        key = hashlib.sha1(name.encode('utf-8'), usedforsecurity=False).hexdigest()
+        return self.cacheDir / key[:2] / key
+
+    @staticmethod
+    def _load(cacheFile: Path) -> tuple[str, str, str]:
+        """Return stamp, digest and content of a cache entry (empty if missing)."""
+        try:
+            header, content = cacheFile.read_text('utf-8').split('\n', 1)
+            stamp, digest = header.rsplit(' ', 1)
+        except (OSError, ValueError):
+            return '', '', ''
+        return stamp, digest, content
+
+    def _save(self, cacheFile: Path, data: str):
+        if not self._writable:
+            return
+
+        try:
+            cacheFile.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', dir=cacheFile.parent, delete=False
+            ) as tmpFile:
+                tmpFile.write(data)
+            Path(tmpFile.name).replace(cacheFile)
+        except OSError:
+            logger.exception(f'Cannot write cache in {self.cacheDir}, cache disabled')
+            self._writable = False
+
+
+class SourceTree:
+    """Files from FreeCAD source directory.
+
+    The directory is walked only once (on first access) and each file is read
+    (and its comments are removed or it is parsed as XML) at most once,
+    so all scanners may share it.
+    Subclasses may read files from another storage (see `GitSourceTree`).
+    """
+
+    SUFFIXES = ('.cpp', '.xml')
+    revision: str | None = None  # revision of version control system if used
+
+    def __init__(
+        self,
+        sourcePath: Path = SOURCE_DIR,
+        cache: StrippedContentCache | None = None,
+        pathFilter: PathFilter | None = None,
+    ):
+        self.sourcePath = Path(sourcePath)
+        self.cache = cache
+        self.pathFilter = PathFilter() if pathFilter is None else pathFilter
+        self._contents: dict[Path, str] = {}
+        self._xmlTrees: dict[Path, ET.ElementTree[ET.Element]] = {}
+        self._dependencyRecorders: list[set[Path]] = []
+
+    @cached_property
+    def _suffixToFiles(self) -> dict[str, list[Path]]:
+        suffixToFiles: dict[str, list[Path]] = {s: [] for s in self.SUFFIXES}
+        # the same order as `os.walk` (see `PathFilter.walk`) - directory files first
+        with profiler.span(profiler.STAGE, 'walk'):
+            for file in self._walkFiles():
+                if (suffix := file.suffix) in suffixToFiles:
+                    suffixToFiles[suffix].append(file)
+        return suffixToFiles
+
+    def _walkFiles(self) -> Iterator[Path]:
+        return self.pathFilter.walk(self.sourcePath)
+
+    def genSubDirs(self, directory: Path) -> Iterator[Path]:
+        """Yield subdirectories of `directory` which are not excluded."""
+        try:
+            subDirs = [p for p in directory.iterdir() if p.is_dir()]
+        except OSError:
+            return
+        for subDir in subDirs:
+            if not self.isExcluded(subDir):
+                yield subDir
+
+    def isExcluded(self, directory: Path) -> bool:
+        """Check if `directory` (or any its parent) is excluded from walking."""
+        relativeDir = directory.relative_to(self.sourcePath)
+        return any(
+            self.pathFilter.isExcluded(p.as_posix())
+            for p in (relativeDir, *relativeDir.parents[:-1])
+        )
+
+    def genCppFiles(self, subPath: Path | None = None) -> Iterator[Path]:
+        yield from self._genFiles(self._suffixToFiles['.cpp'], subPath)
+
+    def genXmlFiles(self, subPath: Path | None = None) -> Iterator[Path]:
+        yield from self._genFiles(self._suffixToFiles['.xml'], subPath)
+
+    @staticmethod
+    def _genFiles(files: Iterable[Path], subPath: Path | None) -> Iterator[Path]:
+        if subPath is None:
+            yield from files
+            return
+
+        prefix = f'{subPath}{os.sep}'
+        for file in files:
+            if str(file).startswith(prefix):
+                yield file
+
+    @contextlib.contextmanager
+    def recordDependencies(self) -> Iterator[set[Path]]:
+        """Collect paths of all files accessed (or only checked) in this context."""
+        dependencies: set[Path] = set()
+        self._dependencyRecorders.append(dependencies)
+        try:
+            yield dependencies
+        finally:
+            self._dependencyRecorders.remove(dependencies)
+
+    def _addDependency(self, file: Path):
+        for dependencies in self._dependencyRecorders:
+            dependencies.add(file)
+
+    def exists(self, file: Path) -> bool:
+        self._addDependency(file)
+        return self._exists(file)
+
+    def _exists(self, file: Path) -> bool:
+        return file.exists()
+
+    def getFileStamp(self, file: Path) -> FileStamp:
+        return getFileStamp(file)
+
+    def parseXml(self, file: Path) -> ET.ElementTree[ET.Element]:
+        """Return parsed XML file (shared - do not modify it), parsed only once."""
+        self._addDependency(file)
+        try:
+            return self._xmlTrees[file]
+        except KeyError:
+            pass
+
+        with profiler.span(profiler.STAGE, 'parseXml'):
+            tree = self._xmlTrees[file] = self._parseXml(file)
+        return tree
+
+    def _parseXml(self, file: Path) -> ET.ElementTree[ET.Element]:
+        return ET.parse(file)
+
+    def readContent(self, file: Path) -> str:
+        """Return file content without comments, read only on the first call."""
+        self._addDependency(file)
+        try:
+            return self._contents[file]
+        except KeyError:
+            pass
+
+        with profiler.span(profiler.STAGE, 'readContent'):
+            content = self._readContent(file)
+        self._contents[file] = content
+        return content
+
+    def _readContent(self, file: Path) -> str:
+        if self.cache is None:
+            return readContent(file)
+        return self.cache.readContent(file)
+
+    def close(self):
+        """Release resources used to read files (they are acquired again if needed)."""
+
+
+class SourceFile:
+    """Implementation file with data shared by all generators created for it.
+
+    For `*Py.xml` file (and for `*Py.cpp` file) the implementation is
+    `*PyImp.cpp` file, otherwise it is the file itself.
+    """
+
+    # literals required by generators to produce any output (see `markers`)
+    MARKERS: ClassVar = (
+        'PyMethodDef',
+        '::init_type(',
+        'Py::ExtensionModule<',
+        'PyErr_NewException',
+    )
+    REG_MARKERS: ClassVar = re.compile('|'.join(map(re.escape, MARKERS)))
+
+    def __init__(self, filePath: Path, sourceTree: SourceTree):
+        self.path = filePath
+        self.sourceTree = sourceTree
+
+        impPath = filePath.with_stem(filePath.stem + 'Imp').with_suffix('.cpp')
+        if not sourceTree.exists(impPath):  # special case for PyObjectBase
+            impPath = filePath.with_suffix('.cpp')
+        self.impPath = impPath
+        self.content = sourceTree.readContent(impPath)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.path})'
+
+    @cached_property
+    def markers(self) -> dict[str, list[int]]:
+        """Positions of each marker found in the content (single scan)."""
+        markers: dict[str, list[int]] = {}
+        for match in self.REG_MARKERS.finditer(self.content):
+            markers.setdefault(match.group(), []).append(match.start())
+        return markers
+
+    def findMarker(self, marker: str) -> int:
+        """Return position of the first `marker` or -1 if there is none."""
+        if positions := self.markers.get(marker):
+            return positions[0]
+        return -1
+
+    @cached_property
+    def twinHeaderContent(self) -> str | None:
+        currentName = self.path.stem
+        if currentName.endswith('Py'):
+            twinName = currentName.removesuffix('Py')
+            twinFile = self.path.with_stem(twinName).with_suffix('.h')
+            try:
+                return self.sourceTree.readContent(twinFile)
+            except OSError:
+                # rare case when twin file is with not standard name
+                twinFile = self.path.with_stem(currentName).with_suffix('.h')
+                try:
+                    return self.sourceTree.readContent(twinFile)
+                except OSError:
+                    logger.exception(f"Cannot read {twinFile}")
+
+        return None
+
+
+class FileWriter:
+    """Write files atomically, but only if their content changed.
+
+    Unchanged files keep their modification time, so caches of type checkers
+    using the stubs stay valid. Files which were not written are stale
+    and they are removed separately by `removeStale`.
+    """
+
+    def __init__(self):
+        self.writtenPaths: set[Path] = set()
+        self.changedCount = 0
+        self.removedCount = 0
+
+    def write(self, file: Path, data: bytes) -> bool:
+        """Write `data` to `file`, return `True` if the file was changed."""
+        self.writtenPaths.add(file)
+        try:
+            oldDigest = self._digest(file.read_bytes())
+        except OSError:
+            oldDigest = b''
+        if oldDigest == self._digest(data):
+            return False
+
+        file.parent.mkdir(parents=True, exist_ok=True)
+        tmpFile = file.with_name(f'.{file.name}.{os.getpid()}.tmp')
+        tmpFile.write_bytes(data)
+        tmpFile.replace(file)
+        self.changedCount += 1
+        return True
+
+    @staticmethod
+    def _digest(data: bytes) -> bytes:
+        return hashlib.sha1(data, usedforsecurity=False).digest()
+
+    def removeStale(self, directory: Path):
+        """Remove not written files and empty directories from `directory`."""
+        for dirPath, _dirNames, fileNames in os.walk(directory, topdown=False):
+            for fileName in fileNames:
+                if (file := Path(dirPath, fileName)) not in self.writtenPaths:
+                    file.unlink()
+                    self.removedCount += 1
+
+            with contextlib.suppress(OSError):  # directory is not empty
+                Path(dirPath).rmdir()
+
+
+# size and modification time of a file, or other identifier of its content
+type FileStamp = tuple[int, int] | str | None
+
+
+def getFileStamp(file: Path) -> FileStamp:
+    """Return size and modification time of the file or `None` if it is missing."""
+    try:
+        stat = file.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+_sourceTrees: dict[tuple[Path, str | None], SourceTree] = {}
+
+
+def getSourceTree(
+    sourcePath: Path = SOURCE_DIR, revision: str | None = None
+) -> SourceTree:
+    """Return a shared `SourceTree` for `sourcePath`.
+
+    If `revision` is given, files are read from the git repository
+    containing `sourcePath` (see `GitSourceTree`).
+    """
+    key = (Path(sourcePath).resolve(), revision)
+    if (tree := _sourceTrees.get(key)) is None:
+        cache = None if CACHE_DIR is None else StrippedContentCache(CACHE_DIR)
+        if revision is None:
+            tree = SourceTree(key[0], cache)
+        else:
+            from freecad_stub_gen.git_source import GitSourceTree
+
+            tree = GitSourceTree(key[0], revision, cache)
+        _sourceTrees[key] = tree
+    return tree
+
+
+def setSourceTree(sourceTree: SourceTree):
+    """Share `sourceTree` instead of the tree created by `getSourceTree`."""
+    _sourceTrees[sourceTree.sourcePath.resolve(), sourceTree.revision] = sourceTree
+
+
+class SourceTreeIndex:
+    """Data collected from a whole source tree, built once on the first use.
+
+    Call `build` to choose the source tree (and the moment of scanning),
+    otherwise the default source tree is used.
+    """
+
+    def __init__(self):
+        self._sourceTree: SourceTree | None = None
+
+    def build(self, sourceTree: SourceTree):
+        """Scan `sourceTree` (nothing is done if it was already scanned)."""
+        if sourceTree is not self._sourceTree:
+            with profiler.span(profiler.STAGE, f'{type(self).__name__}.build'):
+                self._build(sourceTree)
+            self._sourceTree = sourceTree
+
+    def _build(self, sourceTree: SourceTree):
+        raise NotImplementedError
+
+    def _ensureBuilt(self) -> SourceTree:
+        if (sourceTree := self._sourceTree) is None:
+            sourceTree = getSourceTree()
+            self.build(sourceTree)
+        return sourceTree
+
+    @property
+    def sourceTree(self) -> SourceTree:
+        return self._ensureBuilt()
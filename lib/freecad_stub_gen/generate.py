@@ -1,12 +1,23 @@
+import functools
 import logging
+import multiprocessing
+import os
 import shutil
 import typing
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from freecad_stub_gen.config import SOURCE_DIR, TARGET_DIR
-from freecad_stub_gen.file_functions import genCppFiles, genXmlFiles
+from freecad_stub_gen.file_functions import (
+    FileWriter,
+    SourceFile,
+    SourceTree,
+    getSourceTree,
+)
 from freecad_stub_gen.FreeCADTemplates import additionalPath
 from freecad_stub_gen.generators.common.gen_base import BaseGenerator
+from freecad_stub_gen.generators.exceptions.container import exceptionContainer
 from freecad_stub_gen.generators.exceptions.gen import ExceptionGenerator
 from freecad_stub_gen.generators.from_cpp.functions import (
     FreecadStubGeneratorFromCppFunctions,
@@ -16,7 +27,11 @@ from freecad_stub_gen.generators.from_cpp.module import (
     FreecadStubGeneratorFromCppModule,
 )
 from freecad_stub_gen.generators.from_xml.full import FreecadStubGeneratorFromXML
+from freecad_stub_gen.generators.types_enum import TYPES_FILE_NAME
+from freecad_stub_gen.importable_map import importableMap
+from freecad_stub_gen.incremental import DependencyGraph, FileStub
 from freecad_stub_gen.module_namespace import moduleNamespace
+from freecad_stub_gen.profiler import Span, profiler
 from freecad_stub_gen.python_code.module_container import Module
 
 logger = logging.getLogger(__name__)
@@ -28,50 +43,329 @@ generators: typing.Sequence[type[BaseGenerator]] = (
 )
 
 
-def _genModule(
+def buildIndexes(sourceTree: SourceTree):
+    """Scan `sourceTree` for data shared by all generators."""
+    moduleNamespace.build(sourceTree)
+    importableMap.build(sourceTree)
+    exceptionContainer.build(sourceTree)
+    exceptionContainer.checkAllExceptionsCorrect()
+
+
+class ModuleDir(typing.NamedTuple):
+    """Source directory generated independently of other directories."""
+
+    path: Path
+    moduleName: str
+    subModuleName: str = ''
+
+    def genFiles(self, sourceTree: SourceTree) -> Iterator[Path]:
+        yield from sourceTree.genXmlFiles(self.path)
+        yield from sourceTree.genCppFiles(self.path)
+
+
+def _genFileStub(
+    sourcesRoot: Module, filePath: Path, sourceTree: SourceTree, moduleDir: ModuleDir
+):
+    moduleName = moduleDir.moduleName
+    if filePath.suffix == '.xml':
+        if tg := FreecadStubGeneratorFromXML.safeCreate(filePath, sourceTree):
+            with profiler.span(profiler.GENERATOR, type(tg).__name__):
+                tg.getStub(sourcesRoot, moduleName, submodule=moduleDir.subModuleName)
+        return
+
+    match filePath.stem:
+        # this is special case when we create separate module
+        case 'Translate':
+            curModuleName = f'{moduleName}.Qt'
+        case 'UnitsApiPy':
+            curModuleName = f'{moduleName}.Units'
+        case ('Selection' | 'Console' | 'TaskDialogPython') as stem:
+            curModuleName = f'{moduleName}.{stem}'
+        case _:
+            curModuleName = moduleName
+
+    try:
+        sourceFile = SourceFile(filePath, sourceTree)
+    except FileNotFoundError:
+        return
+
+    # all generators share the same file content,
+    # most files do not contain any marker required by a generator
+    for cl in generators:
+        if not cl.isTriggered(sourceFile):
+            continue
+        with profiler.span(profiler.GENERATOR, cl.__name__):
+            cl(sourceFile).getStub(sourcesRoot, curModuleName)
+
+
+def _genModuleDirs(sourceTree: SourceTree) -> Iterator[ModuleDir]:
+    for mod in sourceTree.genSubDirs(sourceTree.sourcePath / 'Mod'):
+        moduleName = moduleNamespace.convertNamespaceToModule(mod.name)
+        yield ModuleDir(mod / 'App', moduleName)
+        yield ModuleDir(mod / 'Gui', moduleName)
+
+
+def _genFileStubs(
+    moduleDir: ModuleDir,
+    filePaths: Sequence[Path],
+    sourcePath: Path,
+    revision: str | None = None,
+    *,
+    profile=False,
+) -> tuple[dict[Path, FileStub], list[Span]]:
+    """Generate stubs from each file into a new (picklable) module tree.
+
+    Spans recorded by the profiler are also returned.
+    """
+    profiler.enabled = profile
+    spansStart = len(profiler.spans)
+    sourceTree = getSourceTree(sourcePath, revision)
+    fileStubs = {}
+    try:
+        buildIndexes(sourceTree)  # already built unless the worker was spawned
+        with profiler.span(profiler.DIRECTORY, str(moduleDir.path)):
+            for filePath in filePaths:
+                fileRoot = Module()
+                with (
+                    profiler.span(profiler.FILE, str(filePath)),
+                    sourceTree.recordDependencies() as dependencies,
+                ):
+                    _genFileStub(fileRoot, filePath, sourceTree, moduleDir)
+
+                dependencies.add(filePath)
+                stamps = {p: sourceTree.getFileStamp(p) for p in sorted(dependencies)}
+                fileStubs[filePath] = FileStub(fileRoot, stamps)
+    finally:
+        sourceTree.close()
+    return fileStubs, profiler.takeSpans(spansStart)
+
+
+def _genAllFileStubs(
+    moduleDirs: Sequence[ModuleDir],
+    dirtyFiles: Sequence[Sequence[Path]],
+    sourcePath: Path,
+    jobs: int,
+    revision: str | None = None,
+) -> dict[Path, FileStub]:
+    """Generate stubs from `dirtyFiles` of corresponding `moduleDirs`.
+
+    If `jobs` is different from 1, directories are processed in parallel
+    (0 means all available processors).
+    """
+    genStubs = functools.partial(
+        _genFileStubs,
+        sourcePath=sourcePath,
+        revision=revision,
+        profile=profiler.enabled,
+    )
+    if jobs == 1:
+        results = list(map(genStubs, moduleDirs, dirtyFiles))
+    else:
+        # forked workers inherit already scanned source tree
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+        else:
+            context = None
+
+        with ProcessPoolExecutor(max_workers=jobs or None, mp_context=context) as ex:
+            results = list(ex.map(genStubs, moduleDirs, dirtyFiles))
+
+    fileStubs = {}
+    for result, spans in results:
+        fileStubs.update(result)
+        profiler.spans.extend(spans)
+    return fileStubs
+
+
+def _getStubPackagePath(targetPath: Path, packageName: str) -> Path:
+    newName = moduleNamespace.getModFromAlias(packageName, packageName)
+    return targetPath / f'{newName}-stubs'
+
+
+def _saveStubPackages(
     sourcesRoot: Module,
-    modulePath: Path,
+    targetPath: Path,
+    packageNames: Iterable[str],
+    writer: FileWriter | None = None,
+):
+    """Replace only stub packages from `packageNames`, keep other packages.
+
+    If `writer` is given, only changed files are written and stale files
+    are removed, otherwise whole packages are saved again.
+    """
+    for packageName in sorted(packageNames):
+        stubPackage = _getStubPackagePath(targetPath, packageName)
+        with profiler.span(profiler.SAVE, stubPackage.name):
+            _saveStubPackage(
+                sourcesRoot.subModules.get(packageName), stubPackage, writer
+            )
+
+
+def _saveStubPackage(mod: Module | None, stubPackage: Path, writer: FileWriter | None):
+    if writer is None:
+        shutil.rmtree(stubPackage, ignore_errors=True)
+
+    if mod is not None:
+        for filePath, content in mod.genFiles(stubPackage):
+            if writer is None:
+                filePath.parent.mkdir(parents=True, exist_ok=True)
+                filePath.write_text(content)
+            else:
+                writer.write(filePath, content.encode('utf-8'))
+
+    if writer is not None:
+        writer.removeStale(stubPackage)
+
+
+def _copyTemplates(
+    targetPath: Path, writer: FileWriter | None = None, typeConsts: str | None = None
+):
+    """Copy templates to `targetPath`, `typeConsts` replaces the default types file."""
+    templatesPath = targetPath / additionalPath.name
+    replaced = {} if typeConsts is None else {TYPES_FILE_NAME: typeConsts}
+    if writer is None:
+        shutil.copytree(additionalPath, templatesPath, dirs_exist_ok=True)
+        for fileName, content in replaced.items():
+            (templatesPath / fileName).write_text(content, encoding='utf-8')
+        return
+
+    for dirPath, _dirNames, fileNames in os.walk(additionalPath):
+        for fileName in fileNames:
+            relativePath = Path(dirPath, fileName).relative_to(additionalPath)
+            if (replacement := replaced.get(relativePath.as_posix())) is not None:
+                data = replacement.encode('utf-8')
+            else:
+                data = (additionalPath / relativePath).read_bytes()
+            writer.write(templatesPath / relativePath, data)
+    writer.removeStale(templatesPath)
+
+
+def _saveAllStubs(
+    sourcesRoot: Module,
+    targetPath: Path,
+    writer: FileWriter | None,
+    typeConsts: str | None = None,
+):
+    if writer is not None:
+        writer.write(targetPath / '__init__.pyi', b'')
+        _saveStubPackages(sourcesRoot, targetPath, sourcesRoot.subModules, writer)
+        _copyTemplates(targetPath, writer, typeConsts)
+        writer.removeStale(targetPath)
+        return
+
+    shutil.rmtree(targetPath, ignore_errors=True)
+    targetPath.mkdir(parents=True, exist_ok=True)
+    (targetPath / '__init__.pyi').touch(exist_ok=True)
+    for mod in sourcesRoot.subModules.values():
+        with profiler.span(profiler.SAVE, mod.name):
+            mod.save(targetPath)
+
+    for stubPackage in targetPath.iterdir():
+        if stubPackage.is_dir():
+            stubPackage.rename(_getStubPackagePath(targetPath, stubPackage.name))
+
+    _copyTemplates(targetPath, typeConsts=typeConsts)
+
+
+def generateFreeCadStubsFromIr(
+    irPath: Path, targetPath=TARGET_DIR, *, keepUnchanged=False
+):
+    """Save stubs from intermediate representation dumped by `generateFreeCadStubs`.
+
+    FreeCAD sources are not needed.
+    """
+    with profiler.span(profiler.STAGE, 'load'):
+        sourcesRoot, typeConsts = Module.load(irPath)
+
+    writer = FileWriter() if keepUnchanged else None
+    with profiler.span(profiler.STAGE, 'save'):
+        _saveAllStubs(sourcesRoot, targetPath, writer, typeConsts)
+
+    if writer is not None:
+        logger.info(
+            f'Stub files changed: {writer.changedCount}, removed: {writer.removedCount}'
+        )
+
+
+def generateFreeCadStubs(
     sourcePath=SOURCE_DIR,
-    moduleName='',
-    subModuleName='',
+    targetPath=TARGET_DIR,
+    jobs=1,
+    *,
+    incremental=False,
+    keepUnchanged=False,
+    irPath: Path | None = None,
+    revision: str | None = None,
+    typeConsts: str | None = None,
 ):
-    for xmlPath in genXmlFiles(modulePath):
-        if not (tg := FreecadStubGeneratorFromXML.safeCreate(xmlPath, sourcePath)):
-            continue
-        tg.getStub(sourcesRoot, moduleName, submodule=subModuleName)
-
-    for cppPath in genCppFiles(modulePath):
-        match cppPath.stem:
-            # this is special case when we create separate module
-            case 'Translate':
-                curModuleName = f'{moduleName}.Qt'
-            case 'UnitsApiPy':
-                curModuleName = f'{moduleName}.Units'
-            case ('Selection' | 'Console' | 'TaskDialogPython') as stem:
-                curModuleName = f'{moduleName}.{stem}'
-            case _:
-                curModuleName = moduleName
-
-        for cl in generators:
-            if not (mg := cl.safeCreate(cppPath, sourcePath)):
-                continue
-            mg.getStub(sourcesRoot, curModuleName)
-
-
-def generateFreeCadStubs(sourcePath=SOURCE_DIR, targetPath=TARGET_DIR):
+    """Generate stubs for all FreeCAD modules.
+
+    Stubs of each file are saved with paths (and stamps) of files used
+    to generate them. In `incremental` mode, only files with changed
+    dependencies are generated again and only affected packages are saved.
+    In `keepUnchanged` mode, `targetPath` is not removed - only changed files
+    are written and stale files are removed.
+    If `irPath` is given, intermediate representation of all stubs is also saved
+    (see `generateFreeCadStubsFromIr`).
+    If `revision` is given, sources are read from this revision of git repository
+    containing `sourcePath` (the repository does not have to be checked out).
+    If `typeConsts` is given, it is saved as `type_consts.py` template
+    in `targetPath` (see `generateTypes`).
+    """
+    sourceTree = getSourceTree(sourcePath, revision)
+    sourcePath = sourceTree.sourcePath
+    try:
+        buildIndexes(sourceTree)
+
+        graph = DependencyGraph.forPaths(sourcePath, targetPath, sourceTree.revision)
+        if incremental and (graph is None or not graph.load()):
+            logger.info('There is no saved dependency graph, generating all stubs')
+            incremental = False
+        oldGraph = graph if incremental else None
+        oldStubs = oldGraph.fileStubs if oldGraph else {}
+
+        # all directories are generated first (maybe in parallel),
+        # then they are merged in the fixed order, so the result is always the same
+        moduleDirs = [
+            ModuleDir(sourcePath / 'Base', 'FreeCAD', subModuleName='Base'),
+            ModuleDir(sourcePath / 'App', 'FreeCAD'),
+            ModuleDir(sourcePath / 'Gui', 'FreeCADGui'),
+            ModuleDir(sourcePath / 'Main', 'FreeCADGui'),
+            *_genModuleDirs(sourceTree),
+        ]
+        moduleFiles = [list(md.genFiles(sourceTree)) for md in moduleDirs]
+        dirtyFiles = [
+            [f for f in files if not (oldGraph and oldGraph.isUpToDate(f, sourceTree))]
+            for files in moduleFiles
+        ]
+        with profiler.span(profiler.STAGE, 'generate'):
+            newStubs = _genAllFileStubs(
+                moduleDirs, dirtyFiles, sourcePath, jobs, sourceTree.revision
+            )
+    finally:
+        sourceTree.close()  # all source files are already read
+    fileStubs = {
+        f: newStubs.get(f) or oldStubs[f] for files in moduleFiles for f in files
+    }
+    if graph is not None:
+        graph.fileStubs = fileStubs
+        graph.save()
+
+    partialModules = []
+    for files in moduleFiles:
+        partialRoot = Module()
+        for f in files:
+            partialRoot.update(fileStubs[f].module)
+        partialModules.append(partialRoot)
+    baseMod, appMod, guiMod, mainMod, *modMods = partialModules
+
     sourcesRoot = Module()
 
     freeCad = sourcesRoot['FreeCAD']
     freeCad += 'class PyObjectBase(object): ...\n\n\n'
 
-    _genModule(
-        sourcesRoot,
-        sourcePath / 'Base',
-        sourcePath,
-        moduleName='FreeCAD',
-        subModuleName='Base',
-    )
-    _genModule(sourcesRoot, sourcePath / 'App', sourcePath, moduleName='FreeCAD')
+    sourcesRoot.update(baseMod)
+    sourcesRoot.update(appMod)
 
     freeCad += """
 App = FreeCAD
@@ -97,8 +391,8 @@ Wrn = FreeCAD.Console.PrintWarning
         )
     )
 
-    _genModule(sourcesRoot, sourcePath / 'Gui', sourcePath, moduleName='FreeCADGui')
-    _genModule(sourcesRoot, sourcePath / 'Main', sourcePath, moduleName='FreeCADGui')
+    sourcesRoot.update(guiMod)
+    sourcesRoot.update(mainMod)
     freeCadGui = sourcesRoot['FreeCADGui']
     freeCadGui += 'Workbench = FreeCADGui.PythonWorkbench  # noqa'
     freeCadGui += 'ActiveDocument: FreeCADGui.Document | None'
@@ -112,14 +406,8 @@ Wrn = FreeCAD.Console.PrintWarning
         )
     )
 
-    for mod in (sourcePath / 'Mod').iterdir():
-        moduleName = mod.name
-        if moduleName in ('Test',):
-            continue
-
-        moduleName = moduleNamespace.convertNamespaceToModule(moduleName)
-        _genModule(sourcesRoot, mod / 'App', sourcePath, moduleName=moduleName)
-        _genModule(sourcesRoot, mod / 'Gui', sourcePath, moduleName=moduleName)
+    for modMod in modMods:
+        sourcesRoot.update(modMod)
 
     freeCADUnits = sourcesRoot['FreeCAD.Units']
     freeCADUnits.imports.add('from FreeCAD.Base import Unit, Quantity')
@@ -128,22 +416,41 @@ Wrn = FreeCAD.Console.PrintWarning
     freeCADUnits += UNITS
 
     sourcesRoot.setSubModulesAsPackage()
-
-    shutil.rmtree(targetPath, ignore_errors=True)
-    targetPath.mkdir(parents=True, exist_ok=True)
-    (targetPath / '__init__.pyi').touch(exist_ok=True)
-    sourcesRoot.save(targetPath)
-
-    for stubPackage in targetPath.iterdir():
-        if stubPackage.is_dir():
-            if mod := moduleNamespace.getModFromAlias(stubPackage.name):
-                newName = mod
-            else:
-                newName = stubPackage.name
-
-            stubPackage.rename(stubPackage.with_name(f'{newName}-stubs'))
-
-    shutil.copytree(additionalPath, targetPath / additionalPath.name)
+    if irPath is not None:
+        sourcesRoot.dump(irPath, typeConsts)
+
+    writer = FileWriter() if keepUnchanged else None
+    with profiler.span(profiler.STAGE, 'save'):
+        if incremental:
+            changedPackages = {
+                name
+                for f in oldStubs.keys() | fileStubs.keys()
+                if oldStubs.get(f) is not fileStubs.get(f)
+                for stub in (oldStubs.get(f), fileStubs.get(f))
+                if stub is not None
+                for name in stub.packageNames
+            }
+            changedPackages.update(
+                name
+                for name in sourcesRoot.subModules
+                if not _getStubPackagePath(targetPath, name).exists()
+            )
+            if changedPackages:
+                logger.info(f'Changed packages: {", ".join(sorted(changedPackages))}')
+
+            if not (rootInitFile := targetPath / '__init__.pyi').exists():
+                targetPath.mkdir(parents=True, exist_ok=True)
+                rootInitFile.touch()
+            _saveStubPackages(sourcesRoot, targetPath, changedPackages, writer)
+            _copyTemplates(targetPath, writer, typeConsts)
+
+        else:
+            _saveAllStubs(sourcesRoot, targetPath, writer, typeConsts)
+
+    if writer is not None:
+        logger.info(
+            f'Stub files changed: {writer.changedCount}, removed: {writer.removedCount}'
+        )
 
 
 # TODO @PO: [P4] preprocess and remove macros
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import logging
 from collections.abc import Iterable, Mapping, Sequence
-from inspect import Parameter, Signature, _empty, _void
+from inspect import _empty, _ParameterKind, _void, formatannotation
+from keyword import iskeyword
+from types import MappingProxyType
 from typing import cast
 
 from freecad_stub_gen.ordered_set import OrderedStrSet
@@ -18,8 +20,8 @@ class RawRepr:
 
     def __new__(cls, *values):
         match values:
-            case () | (Parameter.empty | 'typing.Any',):
-                return Parameter.empty
+            case () | (AnnotationParam.empty | 'typing.Any',):
+                return AnnotationParam.empty
         return super().__new__(cls)
 
     def __init__(self, *values):
@@ -54,17 +56,102 @@ class RawStringRepresentation(str):
         return str(self)
 
 
-class AnnotationParam(Parameter):
-    """Add annotation in __str__ method."""
+class AnnotationParam:
+    """Immutable function parameter, a lightweight version of `inspect.Parameter`.
 
-    SELF_PARAM = Parameter('self', Parameter.POSITIONAL_ONLY)
-    CLS_PARAM = Parameter('cls', Parameter.POSITIONAL_ONLY)
-    ARGS_PARAM = Parameter('args', Parameter.VAR_POSITIONAL)
+    Kinds and `empty` value are the same as in `inspect.Parameter`.
+    """
+
+    __slots__ = ('_annotation', '_default', '_kind', '_name')
+
+    POSITIONAL_ONLY = _ParameterKind.POSITIONAL_ONLY
+    POSITIONAL_OR_KEYWORD = _ParameterKind.POSITIONAL_OR_KEYWORD
+    VAR_POSITIONAL = _ParameterKind.VAR_POSITIONAL
+    KEYWORD_ONLY = _ParameterKind.KEYWORD_ONLY
+    VAR_KEYWORD = _ParameterKind.VAR_KEYWORD
+
+    empty = _empty
+
+    SELF_PARAM: AnnotationParam
+    CLS_PARAM: AnnotationParam
+    ARGS_PARAM: AnnotationParam
+
+    def __init__(
+        self, name: str, kind: _ParameterKind, *, default=_empty, annotation=_empty
+    ):
+        if default is not _empty and kind in (self.VAR_POSITIONAL, self.VAR_KEYWORD):
+            msg = f'{kind.description} parameters cannot have default values'
+            raise ValueError(msg)
+        if not name.isidentifier() or iskeyword(name):
+            msg = f'{name!r} is not a valid parameter name'
+            raise ValueError(msg)
+
+        self._name = name
+        self._kind = kind
+        self._default = default
+        self._annotation = annotation
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def kind(self) -> _ParameterKind:
+        return self._kind
+
+    @property
+    def default(self):
+        return self._default
+
+    @property
+    def annotation(self):
+        return self._annotation
+
+    def replace(
+        self, *, name=_void, kind=_void, default=_void, annotation=_void
+    ) -> AnnotationParam:
+        return type(self)(
+            self._name if name is _void else name,
+            self._kind if kind is _void else kind,
+            default=self._default if default is _void else default,
+            annotation=self._annotation if annotation is _void else annotation,
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, AnnotationParam):
+            return NotImplemented
+        return (
+            self._name == other._name
+            and self._kind == other._kind
+            and self._default == other._default
+            and self._annotation == other._annotation
+        )
+
+    def __hash__(self):
+        return hash((self._name, self._kind, self._annotation, self._default))
+
+    def __repr__(self):
+        return f'<{type(self).__name__} "{self}">'
+
+    def __str__(self):
+        """Format the same as `inspect.Parameter`."""
+        formatted = self._name
+        if self._annotation is not _empty:
+            formatted = f'{formatted}: {formatannotation(self._annotation)}'
+        if self._default is not _empty:
+            separator = '=' if self._annotation is _empty else ' = '
+            formatted = f'{formatted}{separator}{self._default!r}'
+
+        if self._kind == self.VAR_POSITIONAL:
+            return '*' + formatted
+        if self._kind == self.VAR_KEYWORD:
+            return '**' + formatted
+        return formatted
 
     @classmethod
     def getFirstParam(
         cls, *, isStaticMethod: bool, isClassMethod: bool
-    ) -> Parameter | None:
+    ) -> AnnotationParam | None:
         if isStaticMethod:
             return None
 
@@ -74,28 +161,48 @@ class AnnotationParam(Parameter):
         return cls.SELF_PARAM
 
 
-type InitParameters_t = Sequence[Parameter] | None
-type ReplaceParameters_t = InitParameters_t | Mapping[str, Parameter] | type[_void]
+AnnotationParam.SELF_PARAM = AnnotationParam('self', AnnotationParam.POSITIONAL_ONLY)
+AnnotationParam.CLS_PARAM = AnnotationParam('cls', AnnotationParam.POSITIONAL_ONLY)
+AnnotationParam.ARGS_PARAM = AnnotationParam('args', AnnotationParam.VAR_POSITIONAL)
+
 
+type InitParameters_t = Sequence[AnnotationParam] | None
+type ReplaceParameters_t = (
+    InitParameters_t | Mapping[str, AnnotationParam] | type[_void]
+)
 
-class SelfSignature(Signature):
-    """Skip separator if there is only self parameter."""
 
-    __slots__ = ('exceptions', 'unknown_parameters')
+class SelfSignature:
+    """Immutable signature, a lightweight version of `inspect.Signature`.
+
+    Skip separator if there is only self parameter.
+    The string representation is the same as in `inspect.Signature`
+    and it is computed only once.
+    """
+
+    __slots__ = (
+        '_exceptions',
+        '_parameters',
+        '_returnAnnotation',
+        '_str',
+        '_unknownParameters',
+    )
+
+    empty = _empty
 
     def __init__(
         self,
         parameters: InitParameters_t = None,
         *,
         unknown_parameters: bool = False,
-        return_annotation: RawRepr | type[_empty] = Signature.empty,
+        return_annotation: RawRepr | type[_empty] = _empty,
         exceptions: OrderedStrSet | None = None,
     ):
         parameters = self._convertFirstParam(parameters)
         try:
-            super().__init__(parameters, return_annotation=return_annotation)
-            self.exceptions = OrderedStrSet() if exceptions is None else exceptions
-            self.unknown_parameters = unknown_parameters
+            self._parameters: Mapping[str, AnnotationParam] = MappingProxyType(
+                self._validate(parameters or ())
+            )
         except ValueError:
             if parameters is not None:
                 paramsStr = '\n'.join(indent(f'{p} [{p.kind}]') for p in parameters)
@@ -104,14 +211,70 @@ class SelfSignature(Signature):
 
             raise
 
+        self._returnAnnotation = return_annotation
+        self._exceptions = OrderedStrSet() if exceptions is None else exceptions
+        self._unknownParameters = unknown_parameters
+        self._str: str | None = None
+
+    @staticmethod
+    def _validate(parameters: Sequence[AnnotationParam]) -> dict[str, AnnotationParam]:
+        """Check parameters in the same way as `inspect.Signature`."""
+        params: dict[str, AnnotationParam] = {}
+        topKind = AnnotationParam.POSITIONAL_ONLY
+        seenDefault = False
+        for param in parameters:
+            kind = param.kind
+            if kind < topKind:
+                msg = (
+                    f'wrong parameter order: {topKind.description} parameter'
+                    f' before {kind.description} parameter'
+                )
+                raise ValueError(msg)
+            topKind = kind
+
+            if kind <= AnnotationParam.POSITIONAL_OR_KEYWORD:
+                if param.default is not _empty:
+                    seenDefault = True
+                elif seenDefault:
+                    msg = 'non-default argument follows default argument'
+                    raise ValueError(msg)
+
+            if param.name in params:
+                msg = f'duplicate parameter name: {param.name!r}'
+                raise ValueError(msg)
+            params[param.name] = param
+        return params
+
+    @property
+    def parameters(self) -> Mapping[str, AnnotationParam]:
+        return self._parameters
+
+    @property
+    def return_annotation(self) -> RawRepr | type[_empty]:
+        return self._returnAnnotation
+
+    @property
+    def exceptions(self) -> OrderedStrSet:
+        return self._exceptions
+
+    @property
+    def unknown_parameters(self) -> bool:
+        return self._unknownParameters
+
     @classmethod
     def _convertFirstParam(cls, parameters: InitParameters_t) -> InitParameters_t:
         match parameters:
-            case [Parameter(name='self', kind=Parameter.POSITIONAL_ONLY) as selfParam]:
+            case [
+                AnnotationParam(
+                    name='self', kind=AnnotationParam.POSITIONAL_ONLY
+                ) as selfParam
+            ]:
                 pass
             case [
-                Parameter(name='self', kind=Parameter.POSITIONAL_ONLY) as selfParam,
-                Parameter(kind=Parameter.POSITIONAL_OR_KEYWORD),
+                AnnotationParam(
+                    name='self', kind=AnnotationParam.POSITIONAL_ONLY
+                ) as selfParam,
+                AnnotationParam(kind=AnnotationParam.POSITIONAL_OR_KEYWORD),
                 *_,
             ]:
                 pass
@@ -119,9 +282,68 @@ class SelfSignature(Signature):
                 return parameters
 
         parameters = list(parameters)
-        parameters[0] = selfParam.replace(kind=Parameter.POSITIONAL_OR_KEYWORD)
+        parameters[0] = selfParam.replace(kind=AnnotationParam.POSITIONAL_OR_KEYWORD)
         return parameters
 
+    def _hashBasis(self):
+        """Compare keyword only parameters regardless of order (as `inspect`)."""
+        params = tuple(
+            p
+            for p in self._parameters.values()
+            if p.kind != AnnotationParam.KEYWORD_ONLY
+        )
+        kwOnlyParams = {
+            p.name: p
+            for p in self._parameters.values()
+            if p.kind == AnnotationParam.KEYWORD_ONLY
+        }
+        return params, kwOnlyParams, self._returnAnnotation
+
+    def __eq__(self, other):
+        if not isinstance(other, SelfSignature):
+            return NotImplemented
+        return self._hashBasis() == other._hashBasis()
+
+    def __hash__(self):
+        params, kwOnlyParams, returnAnnotation = self._hashBasis()
+        return hash((params, frozenset(kwOnlyParams.values()), returnAnnotation))
+
+    def __repr__(self):
+        return f'<{type(self).__name__} {self}>'
+
+    def __str__(self):
+        if self._str is None:
+            self._str = self._format()
+        return self._str
+
+    def _format(self) -> str:
+        """Format the same as `inspect.Signature`."""
+        result = []
+        renderPosOnlySeparator = False
+        renderKwOnlySeparator = True
+        for param in self._parameters.values():
+            kind = param.kind
+            if kind == AnnotationParam.POSITIONAL_ONLY:
+                renderPosOnlySeparator = True
+            elif renderPosOnlySeparator:
+                result.append('/')
+                renderPosOnlySeparator = False
+
+            if kind == AnnotationParam.VAR_POSITIONAL:
+                renderKwOnlySeparator = False
+            elif kind == AnnotationParam.KEYWORD_ONLY and renderKwOnlySeparator:
+                result.append('*')
+                renderKwOnlySeparator = False
+            result.append(str(param))
+
+        if renderPosOnlySeparator:
+            result.append('/')
+
+        rendered = f'({", ".join(result)})'
+        if self._returnAnnotation is not _empty:
+            rendered += f' -> {formatannotation(self._returnAnnotation)}'
+        return rendered
+
     @classmethod
     def getExceptionsDocs(cls, signatures: Iterable[SelfSignature]) -> str:
         uniqueExceptions = OrderedStrSet()
@@ -143,15 +365,8 @@ class SelfSignature(Signature):
         exceptions: OrderedStrSet | type[_void] = _void,
         unknown_parameters: bool | type[_void] = _void,
     ) -> SelfSignature:
-        initParameters: InitParameters_t
-        match parameters:
-            case self.__void:
-                initParameters = list(self.parameters.values())
-            case Mapping():
-                initParameters = list(parameters.values())
-            case _:
-                initParameters = cast(InitParameters_t, parameters)
-
+        """Return a new signature, parameters are validated only if they changed."""
+        retAnnotation: RawRepr | type[_empty]
         if isinstance(return_annotation, RawRepr):
             retAnnotation = return_annotation
         else:
@@ -167,9 +382,33 @@ class SelfSignature(Signature):
         else:
             unknownParams = self.unknown_parameters
 
-        return type(self)(
-            initParameters,
-            unknown_parameters=unknownParams,
-            return_annotation=retAnnotation,
-            exceptions=initExc,
-        )
+        initParameters: InitParameters_t
+        validParameters: Mapping[str, AnnotationParam] | None
+        match parameters:
+            case self.__void:
+                validParameters = self._parameters
+            case MappingProxyType():
+                # parameters of other signature are already validated
+                validParameters = parameters
+            case Mapping():
+                initParameters = list(parameters.values())
+                validParameters = None
+            case _:
+                initParameters = cast(InitParameters_t, parameters)
+                validParameters = None
+
+        if validParameters is None:
+            return type(self)(
+                initParameters,
+                unknown_parameters=unknownParams,
+                return_annotation=retAnnotation,
+                exceptions=initExc,
+            )
+
+        sig = object.__new__(type(self))
+        sig._parameters = validParameters
+        sig._returnAnnotation = retAnnotation
+        sig._exceptions = initExc
+        sig._unknownParameters = unknownParams
+        sig._str = None
+        return sig
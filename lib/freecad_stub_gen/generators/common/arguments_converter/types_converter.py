@@ -1,7 +1,7 @@
 import logging
 import re
 from collections.abc import Iterator
-from inspect import Parameter, _ParameterKind
+from typing import TYPE_CHECKING
 
 from freecad_stub_gen.cpp_code.converters import convertToPythonValue
 from freecad_stub_gen.generators.common.annotation_parameter import (
@@ -31,6 +31,9 @@ from freecad_stub_gen.generators.common.return_type_converter.str_wrapper import
 )
 from freecad_stub_gen.ordered_set import OrderedStrSet
 
+if TYPE_CHECKING:
+    from inspect import _ParameterKind
+
 logger = logging.getLogger(__name__)
 
 
@@ -51,21 +54,21 @@ class TypesConverter:
         self._isArgOptional = False
 
         if self.fun.kwargList:
-            self._parameterKind: _ParameterKind = Parameter.POSITIONAL_OR_KEYWORD
+            self._parameterKind: _ParameterKind = AnnotationParam.POSITIONAL_OR_KEYWORD
         else:
-            self._parameterKind = Parameter.POSITIONAL_ONLY
+            self._parameterKind = AnnotationParam.POSITIONAL_ONLY
 
         self._pythonArgNum = 0
         self._cArgNum = cArgNum
         self._remainingFormat = self.fun.formatStr
 
-    def safeConvertFormatToTypes(self) -> Iterator[Parameter]:
+    def safeConvertFormatToTypes(self) -> Iterator[AnnotationParam]:
         try:
             yield from self._convertFormatToTypes()
         except InvalidPointerFormat:
             logger.exception(f'{self._remainingFormat=}, {self.fun}')
 
-    def _convertFormatToTypes(self) -> Iterator[Parameter]:
+    def _convertFormatToTypes(self) -> Iterator[AnnotationParam]:
         while self._remainingFormat:
             for formatSize in range(min(3, len(self._remainingFormat)), 0, -1):
                 pythonArgName = None
@@ -181,7 +184,7 @@ class TypesConverter:
         self._pythonArgNum += 1
 
     def _getDefaultValue(self, curFormat: str, cArgNum: int):
-        retVal = UNKNOWN_DEFAULT_ARG if self._isArgOptional else Parameter.empty
+        retVal = UNKNOWN_DEFAULT_ARG if self._isArgOptional else AnnotationParam.empty
         if not (cArgName := self.fun.getCurArgName(curFormat, cArgNum)):
             return retVal
 
@@ -214,13 +217,13 @@ class TypesConverter:
                     continue
             break
         else:
-            if fa and retVal is not Parameter.empty:
+            if fa and retVal is not AnnotationParam.empty:
                 expressions = [m.group('value') for m in fa]
                 ignoreText = ['->', '()', '::']
                 if all(i not in e for e in expressions for i in ignoreText):
                     logger.warning(f"Unable to convert c {expressions=} to python")
 
-        if retVal is not Parameter.empty:
+        if retVal is not AnnotationParam.empty:
             self._isArgOptional = True
 
         return retVal
@@ -231,7 +234,7 @@ class TypesConverter:
             self._isArgOptional = True
         elif curVal == '$':
             self._isArgOptional = True
-            self._parameterKind = Parameter.KEYWORD_ONLY
+            self._parameterKind = AnnotationParam.KEYWORD_ONLY
         elif curVal in ':;':
             self._remainingFormat = ''
         else:
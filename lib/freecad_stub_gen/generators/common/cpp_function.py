@@ -1,55 +1,505 @@
-from collections import deque
+import heapq
+import re
+from bisect import bisect_left, bisect_right
 from collections.abc import Iterable, Iterator
-from itertools import islice
-
-
-def _skipAdditionalDirectiveBlocks(it: Iterator[tuple[int, str]]):
-    directiveStack = [True]
-    buffer: deque[str] = deque(maxlen=8)
-
-    for index, char in it:
-        buffer.append(char)
-        if char in ' \n\t' and '#' in buffer:
-            text = ''.join(buffer)[:-1]
-            if text.endswith('#endif'):
-                if len(directiveStack) > 1:
-                    # there must exist at least one value,
-                    # maybe we started in the middle of directive
-                    directiveStack.pop()
-                buffer.clear()
-            elif text.endswith(('#elif', '#else')):
-                directiveStack[-1] = False
-                buffer.clear()
-            elif text.endswith(('#if', '#ifdef', '#ifndef')):
-                directiveStack.append(True)
-                buffer.clear()
-
-        if directiveStack[-1]:
-            yield index, char
+from functools import cached_property, lru_cache
+from typing import ClassVar, NamedTuple
+
+
+class PreprocessorRegions:
+    """Conditional preprocessor directives of a text, found once per text.
+
+    Activity of a position is relative to the branch where a scan starts,
+    as if the directives were tracked since the scan start. The starting branch
+    is active, its following `#elif` and `#else` branches are inactive. Only
+    the first branch of nested `#if`/`#ifdef`/`#ifndef` directives is active,
+    `#elif` and `#else` branches (with all nested directives) are inactive.
+    """
+
+    REG_DIRECTIVE: ClassVar = re.compile(
+        r'^[ \t]*#[ \t]*(if|ifdef|ifndef|elif|else|endif)\b', re.MULTILINE
+    )
+
+    def __init__(self, text: str):
+        self.textLength = len(text)
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+        self.kinds: list[str] = []
+        for match in self.REG_DIRECTIVE.finditer(text):
+            self.starts.append(match.start())
+            self.ends.append(match.end())
+            self.kinds.append(match.group(1))
+
+    def hasDirective(self, start: int, end: int) -> bool:
+        """Check if there is any directive between `start` and `end`."""
+        i = bisect_left(self.starts, start)
+        return i < len(self.starts) and self.starts[i] < end
+
+    def genInactiveSpans(self, scanStart: int = 0) -> Iterator[tuple[int, int]]:
+        """Generate sorted spans of inactive text since `scanStart`."""
+        activeBranches = [True]  # the branch of scan start
+        inactiveStart = scanStart
+        for i in range(bisect_left(self.starts, scanStart), len(self.starts)):
+            wasActive = all(activeBranches)
+            match self.kinds[i]:
+                case 'if' | 'ifdef' | 'ifndef':
+                    activeBranches.append(True)
+                case 'elif' | 'else':
+                    activeBranches[-1] = False
+                case 'endif' if len(activeBranches) > 1:
+                    activeBranches.pop()
+
+            isActive = all(activeBranches)
+            if wasActive and not isActive:
+                inactiveStart = self.ends[i]
+            elif isActive and not wasActive:
+                yield inactiveStart, self.starts[i]
+
+        if not all(activeBranches):
+            yield inactiveStart, self.textLength
+
+
+@lru_cache(maxsize=64)
+def getPreprocessorRegions(text: str) -> PreprocessorRegions:
+    return PreprocessorRegions(text)
+
+
+class BracketIndex:
+    """Positions of brackets in a text with their matching brackets.
+
+    The text is lexed in a single pass - brackets inside string literals,
+    character literals or escaped by backslash are ignored.
+    Each bracket type is matched independently of other types.
+    """
+
+    OPEN_TO_CLOSE: ClassVar = {'(': ')', '[': ']', '{': '}'}
+    CLOSE_TO_OPEN: ClassVar = {v: k for k, v in OPEN_TO_CLOSE.items()}
+    REG_TOKEN: ClassVar = re.compile(
+        r'"(?:\\.|[^"\\\n])*"'  # string literal
+        r"|'(?:\\[^'\n]{1,8}|[^'\\\n])'"  # character literal
+        r'|\\.'  # escaped character
+        r'|[()\[\]{}]',
+        re.DOTALL,
+    )
+
+    def __init__(self, text: str):
+        self.text = text
+        self.ignoredStarts: list[int] = []
+        self.ignoredEnds: list[int] = []
+        self.positions: dict[str, list[int]] = {
+            c: [] for c in (*self.OPEN_TO_CLOSE, *self.CLOSE_TO_OPEN)
+        }
+        self.openToClose: dict[int, int] = {}
+
+        stacks: dict[str, list[int]] = {c: [] for c in self.OPEN_TO_CLOSE}
+        for match in self.REG_TOKEN.finditer(text):
+            start, token = match.start(), match.group()
+            if len(token) > 1:
+                self.ignoredStarts.append(start)
+                self.ignoredEnds.append(match.end())
+                continue
+
+            self.positions[token].append(start)
+            if token in stacks:
+                stacks[token].append(start)
+            elif stack := stacks[self.CLOSE_TO_OPEN[token]]:
+                self.openToClose[stack.pop()] = start
+
+    def isIgnored(self, pos: int) -> bool:
+        i = bisect_right(self.ignoredStarts, pos) - 1
+        return i >= 0 and pos < self.ignoredEnds[i]
+
+    def findNext(self, brackets: str, start: int) -> int | None:
+        """Return position of the first bracket from `brackets` since `start`."""
+        result = None
+        for bracket in brackets:
+            positions = self.positions[bracket]
+            i = bisect_left(positions, start)
+            if i < len(positions) and (result is None or positions[i] < result):
+                result = positions[i]
+        return result
+
+    def findActiveClose(
+        self, bracketL: str, bracketR: str, start: int, regions: PreprocessorRegions
+    ) -> int | None:
+        """Return position of the bracket closing the first bracket since `start`.
+
+        Brackets in inactive preprocessor branches (relative to `start`)
+        are skipped.
+        """
+        inactiveSpans = regions.genInactiveSpans(start)
+        inactive = next(inactiveSpans, None)
+        positions = (
+            self.positions[b][bisect_left(self.positions[b], start) :]
+            for b in bracketL + bracketR
+        )
+        bracketDeep = 0
+        for pos in heapq.merge(*positions):
+            while inactive is not None and inactive[1] <= pos:
+                inactive = next(inactiveSpans, None)
+            if inactive is not None and inactive[0] <= pos:
+                continue
+
+            if self.text[pos] in bracketL:
+                bracketDeep += 1
+            elif bracketDeep:
+                bracketDeep -= 1
+                if not bracketDeep:
+                    return pos
+        return None
+
+    def findSplit(self, splitChar: str, start: int, end: int) -> int | None:
+        """Return position of not ignored `splitChar` between `start` and `end`."""
+        while (pos := self.text.find(splitChar, start, end)) >= 0:
+            if not self.isIgnored(pos):
+                return pos
+            start = pos + 1
+        return None
+
+
+@lru_cache(maxsize=64)
+def getBracketIndex(text: str) -> BracketIndex:
+    return BracketIndex(text)
+
+
+class FunctionBodyIndex:
+    """Positions where bodies of functions may start, found once per text.
+
+    A lookup returns the end of the first declaration of a function
+    with the given name (and class name, if the function is a class member).
+    """
+
+    REG_PY_OBJECT_FUNCTION: ClassVar = re.compile(
+        r'\b(\w+)(?=(\s*\(\s*PyObject\s*\*.*?\)))'
+    )
+    REG_CLASS_FUNCTION: ClassVar = re.compile(r'(?<!\w)(\w*)::(\w+)(?=(\s*\([^)]*\)))')
+    REG_PY_FUNCTION: ClassVar = re.compile(r'Py::Object (\w+)(?=(\s*\([^)]*\)))')
+    REG_PY_MAKE: ClassVar = re.compile(r'PyMake\s*\(\s*struct\s*_typeobject\s*\*')
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def findDeclarationEnd(self, cFuncName: str, cClassName: str) -> int | None:
+        if cFuncName == 'PyMake':
+            return self._pyMakeEnd
+
+        end = self._pyObjectFunctions.get(cFuncName)
+        if end is None:
+            end = self._classFunctions.get((cClassName, cFuncName))
+        if end is None:
+            end = self._pyFunctions.get(cFuncName)
+        return end
+
+    @cached_property
+    def _pyMakeEnd(self) -> int | None:
+        if match := self.REG_PY_MAKE.search(self.text):
+            return match.end()
+        return None
+
+    @cached_property
+    def _pyObjectFunctions(self) -> dict[str, int]:
+        functions: dict[str, int] = {}
+        for match in self.REG_PY_OBJECT_FUNCTION.finditer(self.text):
+            functions.setdefault(match.group(1), match.end(2))
+        return functions
+
+    @cached_property
+    def _classFunctions(self) -> dict[tuple[str, str], int]:
+        functions: dict[tuple[str, str], int] = {}
+        for match in self.REG_CLASS_FUNCTION.finditer(self.text):
+            className, name, end = match.group(1), match.group(2), match.end(3)
+            functions.setdefault((className, name), end)
+            functions.setdefault(('', name), end)  # a function of any class
+        return functions
+
+    @cached_property
+    def _pyFunctions(self) -> dict[str, int]:
+        functions: dict[str, int] = {}
+        for match in self.REG_PY_FUNCTION.finditer(self.text):
+            functions.setdefault(match.group(1), match.end(2))
+        return functions
+
+
+@lru_cache(maxsize=64)
+def getFunctionBodyIndex(text: str) -> FunctionBodyIndex:
+    return FunctionBodyIndex(text)
+
+
+class ClassBlock(NamedTuple):
+    """Block of a class body after an access modifier or Qt macro."""
+
+    header: str  # ex. `public:` or `Q_SIGNALS:`
+    body: str
+
+
+class ClassDeclarationIndex:
+    """Class declarations of a header text, found once per text.
+
+    Lookups return the same positions as searches of declaration patterns
+    created for a given class (the class name may be also a prefix
+    of longer identifier), so the header is not searched for each name.
+    Bodies and blocks of each class are also split only once.
+    """
+
+    # `class` keyword with the next two identifiers (ex. export macro and name)
+    REG_CLASS: ClassVar = re.compile(r'class(?=\s+(\w+)(?:\s+(\w+))?)')
+    REG_WORD: ClassVar = re.compile(r'\w+')
+    REG_COLON: ClassVar = re.compile(r'\s*:')
+    REG_BLOCK: ClassVar = re.compile(
+        r"""
+(
+    ((public|protected|private)\s+)?    # optional QT access modifier
+    (?P<qt_mod>Q_SLOTS|Q_SIGNALS)       # QT macro
+    \s*:                                # must ends on `:`
+)|(
+    (public|protected|private)          # c++ modifier
+    \s*:                                # must ends on `:`
+)""",
+        re.VERBOSE,
+    )
+
+    def __init__(self, text: str):
+        self.text = text
+        self._classBlocks: dict[str, tuple[ClassBlock, ...] | None] = {}
+        self._declarationBodies: dict[str, tuple[str, ...]] = {}
+
+    @cached_property
+    def _prefixToToken(self) -> dict[str, int]:
+        """Map each prefix of identifiers after `class` to the identifier start."""
+        prefixToToken: dict[str, int] = {}
+        for match in self.REG_CLASS.finditer(self.text):
+            for group in (2, 1):
+                if (token := match.group(group)) is not None:
+                    for i in range(1, len(token) + 1):
+                        prefixToToken.setdefault(token[:i], match.start(group))
+        return prefixToToken
+
+    @cached_property
+    def _nameToColonEnd(self) -> dict[str, int]:
+        """Map each class name followed by `:` (inheritance) to the end of `:`."""
+        nameToColonEnd: dict[str, int] = {}
+        for match in self.REG_CLASS.finditer(self.text):
+            for group in (2, 1):
+                if (token := match.group(group)) is None:
+                    continue
+                if colonMatch := self.REG_COLON.match(self.text, match.end(group)):
+                    nameToColonEnd.setdefault(token, colonMatch.end())
+                    break
+        return nameToColonEnd
+
+    @cached_property
+    def _classLines(self) -> list[tuple[int, list[re.Match[str]]]]:
+        """Positions of `class ` with identifiers till the end of line."""
+        classLines = []
+        start = 0
+        while (pos := self.text.find('class ', start)) >= 0:
+            start = pos + len('class ')
+            lineEnd = self.text.find('\n', start)
+            lineEnd = len(self.text) if lineEnd < 0 else lineEnd
+            classLines.append(
+                (pos, list(self.REG_WORD.finditer(self.text, start, lineEnd)))
+            )
+        return classLines
+
+    def findBodyStart(self, className: str) -> int | None:
+        r"""Return position after `{` of the first class matching `className`.
+
+        The same as search of `class\s+(?:\w+\s+)?{className}\s*[^{]*{`.
+        """
+        if (tokenStart := self._prefixToToken.get(className)) is None:
+            return None
+        if (bracketPos := self.text.find('{', tokenStart)) < 0:
+            return None
+        return bracketPos + 1
+
+    def findBody(self, className: str) -> str | None:
+        """Return body of the first class matching `className` (after `{`)."""
+        if (bodyStart := self.findBodyStart(className)) is None:
+            return None
+        return next(
+            generateExpressionUntilChar(
+                self.text, bodyStart, splitChar='NONE', bracketL='{', bracketR='}'
+            )
+        )
+
+    def findBlocks(self, className: str) -> tuple[ClassBlock, ...] | None:
+        """Return blocks of the first class matching `className`."""
+        try:
+            return self._classBlocks[className]
+        except KeyError:
+            pass
+
+        blocks = None
+        if (classBody := self.findBody(className)) is not None:
+            headers = list(self.REG_BLOCK.finditer(classBody))
+            ends = [h.start() for h in headers[1:]] + [len(classBody)]
+            blocks = tuple(
+                ClassBlock(header.group(), classBody[header.end() : end].strip())
+                for header, end in zip(headers, ends, strict=True)
+            )
+        self._classBlocks[className] = blocks
+        return blocks
+
+    def findInheritance(self, className: str) -> str | None:
+        r"""Return text of base classes (terminated by `{`) of `className`.
+
+        The same as search of `class\s+(?:\w+\s+)?{className}\s*:\s*([^{]*{)`.
+        """
+        if (colonEnd := self._nameToColonEnd.get(className)) is None:
+            return None
+        if (bracketPos := self.text.find('{', colonEnd)) < 0:
+            return None
+        return self.text[colonEnd : bracketPos + 1].lstrip()
+
+    def findDeclarationStarts(self, className: str) -> list[int]:
+        r"""Return positions of all class declarations containing `className`.
+
+        The same as iteration over `class .*\b{className}[^{]*`,
+        there may be few separated declarations (ex. in preprocessor branches).
+        """
+        starts = []
+        end = 0
+        for pos, words in self._classLines:
+            if pos < end:
+                continue
+            for word in reversed(words):
+                if word.group().startswith(className):
+                    starts.append(pos)
+                    end = self.text.find('{', word.start() + len(className))
+                    end = len(self.text) if end < 0 else end
+                    break
+        return starts
+
+    def findDeclarationBodies(self, className: str) -> tuple[str, ...]:
+        """Return all class declarations containing `className` with their bodies."""
+        try:
+            return self._declarationBodies[className]
+        except KeyError:
+            pass
+
+        bodies = tuple(
+            findFunctionCall(self.text, start)
+            for start in self.findDeclarationStarts(className)
+        )
+        self._declarationBodies[className] = bodies
+        return bodies
+
+
+@lru_cache(maxsize=64)
+def getClassDeclarationIndex(text: str) -> ClassDeclarationIndex:
+    return ClassDeclarationIndex(text)
+
+
+class MemberDeclarationIndex:
+    r"""Member declarations of a class body, indexed by declared names once per body.
+
+    A lookup returns the same type as a search of a declaration pattern
+    `(\w([\w \t]|::)*)\s[\w,\s]*\b{name}\b[\w,\s]*;` created for the name.
+    The type is the longest text of a type (starting as early as possible)
+    followed by whitespace and names declared with the same type.
+    """
+
+    # names declared at the end of a statement
+    REG_STATEMENT_TAIL: ClassVar = re.compile(r'(?<![\w,\s])[\w,\s]*;')
+    # text which may be a part of a type, ex. `App::PropertyLinkList`
+    REG_TYPE_PART: ClassVar = re.compile(r'(?:[\w \t]|::)+')
+    REG_WORD: ClassVar = re.compile(r'\w+')
+
+    def __init__(self, body: str):
+        self.body = body
+
+    def findType(self, name: str) -> str | None:
+        """Return declared type of member `name` (as written in the declaration)."""
+        return self._nameToType.get(name)
+
+    @cached_property
+    def _nameToType(self) -> dict[str, str]:
+        nameToType: dict[str, str] = {}
+        for tailMatch in self.REG_STATEMENT_TAIL.finditer(self.body):
+            tailStart, tailEnd = tailMatch.start(), tailMatch.end() - 1
+            # the last occurrence of each name
+            nameToStart = {
+                m.group(): m.start()
+                for m in self.REG_WORD.finditer(self.body, tailStart, tailEnd)
+            }
+            if not nameToStart:
+                continue
+
+            typeParts = self._findTypeParts(tailStart, tailEnd)
+            for name, nameStart in nameToStart.items():
+                if name in nameToType:
+                    continue  # the first declaration is used
+                if declaredType := self._findDeclaredType(
+                    typeParts, tailStart, nameStart
+                ):
+                    nameToType[name] = declaredType
+        return nameToType
+
+    def _findTypeParts(self, tailStart: int, tailEnd: int) -> list[tuple[int, int]]:
+        """Return spans of texts which may start a type of names from the tail."""
+        # the type may start before the tail, if it contains a namespace
+        start = tailStart
+        while self.body.startswith('::', start - 2):
+            start -= 2
+            while start > 0 and self.REG_TYPE_PART.fullmatch(self.body[start - 1]):
+                start -= 1
+
+        # a type starts with a word character
+        return [
+            (wordMatch.start(), match.end())
+            for match in self.REG_TYPE_PART.finditer(self.body, start, tailEnd)
+            if (wordMatch := self.REG_WORD.search(self.body, *match.span()))
+        ]
+
+    def _findDeclaredType(
+        self, typeParts: list[tuple[int, int]], tailStart: int, nameStart: int
+    ) -> str | None:
+        for typeStart, typeEnd in typeParts:
+            if typeStart >= nameStart:
+                break
+            # the type ends with the last whitespace before the name
+            for end in range(
+                min(typeEnd, nameStart - 1), max(typeStart, tailStart - 1), -1
+            ):
+                if self.body[end].isspace():
+                    return self.body[typeStart:end]
+        return None
+
+
+@lru_cache(maxsize=256)
+def getMemberDeclarationIndex(body: str) -> MemberDeclarationIndex:
+    return MemberDeclarationIndex(body)
+
+
+def _checkBrackets(bracketL: str, bracketR: str):
+    if any(b not in BracketIndex.OPEN_TO_CLOSE for b in bracketL) or any(
+        b not in BracketIndex.CLOSE_TO_OPEN for b in bracketR
+    ):
+        msg = f"Unsupported brackets {bracketL=}, {bracketR=}"
+        raise ValueError(msg)
 
 
 def findFunctionCall(
     text: str, bodyStart: int | None = None, bracketL='{', bracketR='}'
 ):
+    _checkBrackets(bracketL, bracketR)
     if bodyStart is None:
         bodyStart = text.find('(')
-    bracketDeep = 0
-
-    sliceIt: Iterable[str] = islice(text, bodyStart, len(text))
-    it = enumerate(sliceIt, bodyStart)
-    if '#if' in text:
-        it = _skipAdditionalDirectiveBlocks(it)
-
-    bodyEnd = 0
-    for i, char in it:
-        bodyEnd = i
-        if char == bracketL:
-            bracketDeep += 1
-        elif char == bracketR:
-            bracketDeep -= 1
-            if not bracketDeep:
-                break
+    if bodyStart < 0:
+        msg = f"Invalid function call start {bodyStart}"
+        raise ValueError(msg)
 
+    index = getBracketIndex(text)
+    if (openPos := index.findNext(bracketL, bodyStart)) is None:
+        return text[bodyStart:]
+
+    bodyEnd = index.openToClose.get(openPos, len(text) - 1)
+    if '#if' in text and (regions := getPreprocessorRegions(text)).hasDirective(
+        bodyStart, bodyEnd
+    ):
+        # the branch of `bodyStart` is active, even if it is `#else` branch
+        closePos = index.findActiveClose(bracketL, bracketR, bodyStart, regions)
+        bodyEnd = len(text) - 1 if closePos is None else closePos
     return text[bodyStart : bodyEnd + 1]
 
 
@@ -59,34 +509,32 @@ def generateExpressionUntilChar(
     if splitChar in f'\\"{bracketL}{bracketR}':
         msg = f"Cannot use {splitChar=} when generating expression"
         raise ValueError(msg)
+    _checkBrackets(bracketL, bracketR)
 
-    bracketDeep = 0
-    expEnd = 0
-    ignore = False
-    escaped = False
-
-    sliceIt = islice(text, expStart, len(text) + 1)
-    for expEnd, char in enumerate(sliceIt, expStart):
-        if escaped:
-            escaped = False
-        elif char == '\\':
-            escaped = True
-        elif char == '"':
-            ignore = not ignore
-        elif ignore:
-            pass
-        elif char in bracketL:
-            bracketDeep += 1
-        elif char in bracketR:
-            bracketDeep -= 1
-            if bracketDeep < 0:
-                yield text[expStart:expEnd]
-                return
-        elif char == splitChar and bracketDeep == 0:
-            yield text[expStart:expEnd]
-            expStart = expEnd + 1
-
-    yield text[expStart : expEnd + 1]
+    index = getBracketIndex(text)
+    pos = expStart
+    while True:
+        openPos = index.findNext(bracketL, pos)
+        closePos = index.findNext(bracketR, pos)
+        nextBracket = min(p for p in (openPos, closePos, len(text)) if p is not None)
+
+        splitPos = None
+        if len(splitChar) == 1:
+            splitPos = index.findSplit(splitChar, pos, nextBracket)
+
+        if splitPos is not None:
+            yield text[expStart:splitPos]
+            expStart = pos = splitPos + 1
+        elif nextBracket == openPos:
+            if (pos := index.openToClose.get(openPos, -1) + 1) == 0:
+                break  # not closed bracket
+        elif nextBracket == closePos:
+            yield text[expStart:closePos]
+            return
+        else:
+            break
+
+    yield text[expStart:]
 
 
 def genFuncArgs(text: str, textStart: int | None = None) -> Iterable[str]:
@@ -1,8 +1,8 @@
 import keyword
 import re
 from collections.abc import Generator, Iterator
-from inspect import Parameter, _empty, _ParameterKind
 from itertools import count
+from typing import TYPE_CHECKING
 from xml.etree import ElementTree as ET
 
 from freecad_stub_gen.cpp_code.converters import validatePythonValue
@@ -19,6 +19,9 @@ from freecad_stub_gen.generators.common.cpp_function import (
     generateExpressionUntilChar,
 )
 
+if TYPE_CHECKING:
+    from inspect import _empty, _ParameterKind
+
 
 def generateSignaturesFromDocstring(name: str, docString: str, argNumStart: int = 0):
     for match in re.finditer(fr'{name}\((.*?)\):?', docString):
@@ -33,7 +36,7 @@ def generateSignaturesFromDocstring(name: str, docString: str, argNumStart: int
         yield SelfSignature(list(_signatureGen(funCall, argNumStart)))
 
 
-def _signatureGen(funDocString: str, argNumStart: int) -> Iterator[Parameter]:
+def _signatureGen(funDocString: str, argNumStart: int) -> Iterator[AnnotationParam]:
     if not funDocString:
         return
 
@@ -44,18 +47,18 @@ def _signatureGen(funDocString: str, argNumStart: int) -> Iterator[Parameter]:
         msg = 'Unique generator should never end'
         raise ValueError(msg) from exc
 
-    paramType: _ParameterKind = Parameter.POSITIONAL_ONLY
+    paramType: _ParameterKind = AnnotationParam.POSITIONAL_ONLY
 
     for rawArgText in generateExpressionUntilChar(funDocString, 0, ','):
         argText = rawArgText.strip()
-        annotation: type[_empty] | str = Parameter.empty
+        annotation: type[_empty] | str = AnnotationParam.empty
 
         if argText[-2:] == '[]':
             argText = argText[:-2] + 'None'
             annotation = 'list'
 
         if argText.startswith('[') and argText.endswith(']'):
-            paramType = Parameter.POSITIONAL_OR_KEYWORD
+            paramType = AnnotationParam.POSITIONAL_OR_KEYWORD
 
         argText = argText.removeprefix('[').removesuffix(']')
 
@@ -65,16 +68,22 @@ def _signatureGen(funDocString: str, argNumStart: int) -> Iterator[Parameter]:
             defValue = validatePythonValue(defValue)
         elif argText == '...':
             yield AnnotationParam.ARGS_PARAM
-            paramType = Parameter.KEYWORD_ONLY
+            paramType = AnnotationParam.KEYWORD_ONLY
             continue
 
         else:
-            argName, defValue = argText, Parameter.empty
+            argName, defValue = argText, AnnotationParam.empty
 
-        if defValue is Parameter.empty and paramType != Parameter.POSITIONAL_ONLY:
+        if (
+            defValue is AnnotationParam.empty
+            and paramType != AnnotationParam.POSITIONAL_ONLY
+        ):
             defValue = None
-        if defValue is not Parameter.empty and paramType == Parameter.POSITIONAL_ONLY:
-            paramType = Parameter.POSITIONAL_OR_KEYWORD
+        if (
+            defValue is not AnnotationParam.empty
+            and paramType == AnnotationParam.POSITIONAL_ONLY
+        ):
+            paramType = AnnotationParam.POSITIONAL_OR_KEYWORD
 
         uniqueName, _argNum = uniqueNameGen.send(argName)
         yield AnnotationParam(
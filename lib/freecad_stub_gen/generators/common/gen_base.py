@@ -1,29 +1,37 @@
 from pathlib import Path
+from typing import ClassVar
 from xml.etree.ElementTree import ParseError
 
-from freecad_stub_gen.file_functions import readContent
+from freecad_stub_gen.file_functions import SourceFile, SourceTree
 from freecad_stub_gen.ordered_set import OrderedStrSet
 from freecad_stub_gen.python_code.module_container import Module
 
 
 class BaseGenerator:
+    # generator produces output only if the file contains any of these markers,
+    # empty - the generator is always used
+    TRIGGER_MARKERS: ClassVar[tuple[str, ...]] = ()
+
+    @classmethod
+    def isTriggered(cls, sourceFile: SourceFile) -> bool:
+        if not cls.TRIGGER_MARKERS:
+            return True
+        return any(m in sourceFile.markers for m in cls.TRIGGER_MARKERS)
+
     @classmethod
-    def safeCreate(cls, *args, **kwargs):
+    def safeCreate(cls, filePath: Path, sourceTree: SourceTree):
         try:
-            return cls(*args, **kwargs)
+            return cls(SourceFile(filePath, sourceTree))
         except (FileNotFoundError, ParseError):
             return None
 
-    def __init__(self, filePath: Path, sourceDir: Path):
-        self.sourceDir = sourceDir
-        self.baseGenFilePath = filePath
+    def __init__(self, sourceFile: SourceFile):
+        self.sourceFile = sourceFile
+        self.sourceTree = sourceFile.sourceTree
+        self.sourceDir = self.sourceTree.sourcePath
+        self.baseGenFilePath = sourceFile.path
         self.requiredImports = OrderedStrSet()
-
-        impPath = filePath.with_stem(filePath.stem + 'Imp').with_suffix('.cpp')
-        if not impPath.exists():  # special case for PyObjectBase
-            impPath = filePath.with_suffix('.cpp')
-
-        self.impContent = readContent(impPath)
+        self.impContent = sourceFile.content
 
     def getStub(self, mod: Module, moduleName: str):
         """Generate stub file for module `mod`.
@@ -1,68 +1,49 @@
+import dataclasses
 import logging
 from abc import ABC
 from collections.abc import Sequence
-from typing import Protocol
 
-from freecad_stub_gen.generators.common.doc_string import formatDocstring
+from freecad_stub_gen.generators.common.annotation_parameter import SelfSignature
 from freecad_stub_gen.generators.common.gen_python_api import PythonApiGenerator
-from freecad_stub_gen.python_code import indent
+from freecad_stub_gen.python_code.ir import FunctionDef, SignatureData
 
 logger = logging.getLogger(__name__)
 
 
-class PythonSignatureProtocol(Protocol):
-    def formatPythonSignature(self) -> str:
-        ...
-
-
 class MethodGenerator(PythonApiGenerator, ABC):
-    _NEW_LINE = '\n'  # future change (3.12) PEP 701 - inline
-
-    def convertMethodToStr(
+    def createFunction(
         self,
         methodName: str,
-        strSignatures: Sequence[PythonSignatureProtocol | str],
+        signatures: Sequence[SelfSignature],
         docs: str = '',
         *,
         isClassic=False,
         isStatic=False,
         functionSpacing=1,
-    ) -> str:
-        ret = ''
-        if not strSignatures:
-            return ret
-        signatures = [
-            ss if isinstance(ss, str) else ss.formatPythonSignature()
-            for ss in strSignatures
-        ]
+    ) -> FunctionDef | None:
+        if not signatures:
+            return None
 
         # only single signature should not have overload
         if len(signatures) > 1:
             self.requiredImports.add('typing')
-            overload = '@typing.overload\n'
-        else:
-            overload = ''
 
-        forcedType = self._getForcedReturnType(methodName)
-        pattern = (
-            f'{"@staticmethod" + self._NEW_LINE if isStatic else ""}'
-            f'{"@classmethod" + self._NEW_LINE if isClassic else ""}'
-            f'{overload}'
-            f'def {methodName}{{signature}}:'
-            f'{{docs}}'
-            f'{self._NEW_LINE * functionSpacing}'
+        signaturesData = [SignatureData.fromSignature(sig) for sig in signatures]
+        if forcedType := self._getForcedReturnType(methodName):
+            signaturesData = [
+                dataclasses.replace(sd, returnAnnotation=forcedType)
+                for sd in signaturesData
+            ]
+
+        return FunctionDef(
+            methodName,
+            tuple(signaturesData),
+            docs,
+            isStatic=isStatic,
+            isClassic=isClassic,
+            functionSpacing=functionSpacing,
         )
 
-        for sig in signatures[:-1]:
-            retSig = self._formatSignatureWithReturnType(sig, forcedType)
-            ret += pattern.format(signature=retSig, docs=' ...\n')
-
-        # last signature should have docstring
-        docs = f'\n{indent(doc)}' if (doc := formatDocstring(docs)) else ' ...\n'
-        sig = self._formatSignatureWithReturnType(signatures[-1], forcedType)
-        ret += pattern.format(signature=sig, docs=docs)
-        return ret
-
     def _getForcedReturnType(self, methodName: str) -> str | None:
         ret = None
         if methodName == 'activeDocument':
@@ -76,11 +57,3 @@ class MethodGenerator(PythonApiGenerator, ABC):
         elif methodName == 'getParentGroup':
             ret = 'FreeCAD.DocumentObjectGroup | None'
         return ret
-
-    @classmethod
-    def _formatSignatureWithReturnType(cls, sig: str, forcedType: str | None):
-        if forcedType:
-            if ' ->' in sig:
-                sig = sig.rsplit(' ->', maxsplit=1)[0]
-            return f'{sig} -> {forcedType}'
-        return sig
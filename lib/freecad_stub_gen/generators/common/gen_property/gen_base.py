@@ -1,10 +1,9 @@
 import re
 from abc import ABC
 
-from freecad_stub_gen.generators.common.doc_string import formatDocstring
 from freecad_stub_gen.generators.common.gen_base import BaseGenerator
 from freecad_stub_gen.generators.common.names import getModuleName
-from freecad_stub_gen.python_code import indent
+from freecad_stub_gen.python_code.ir import PropertyDef
 
 
 class BasePropertyGenerator(BaseGenerator, ABC):
@@ -16,21 +15,18 @@ class BasePropertyGenerator(BaseGenerator, ABC):
         docs: str = '',
         *,
         readOnly=True,
-    ):
+    ) -> PropertyDef:
         """Generate property for specified arguments."""
         pythonGetType = self._extractTypeAlias(pythonGetType)
         self.requiredImports.update(self._genImportsFromType(pythonGetType))
-        retType = f' -> {pythonGetType}' if pythonGetType else ''
-        docs = f'\n{indent(doc)}' if (doc := formatDocstring(docs)) else ' ...\n'
-        prop = f'@property\ndef {name}(self){retType}:{docs}\n'
 
-        if not readOnly:
+        if readOnly:
+            pythonSetType = ''
+        else:
             pythonSetType = self._extractTypeAlias(pythonSetType)
             self.requiredImports.update(self._genImportsFromType(pythonSetType))
-            valueType = f': {pythonSetType}' if pythonSetType else ''
-            prop += f'@{name}.setter\ndef {name}(self, value{valueType}): ...\n\n'
 
-        return prop
+        return PropertyDef(name, pythonGetType, pythonSetType, docs, readOnly)
 
     def _extractTypeAlias(self, pythonType: str):
         if pythonType == '':
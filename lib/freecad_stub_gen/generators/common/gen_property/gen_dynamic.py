@@ -7,11 +7,14 @@ from itertools import chain
 from freecad_stub_gen.generators.common.cpp_function import (
     findFunctionCall,
     genFuncArgs,
+    getClassDeclarationIndex,
 )
 from freecad_stub_gen.generators.common.gen_property.gen_base import (
     BasePropertyGenerator,
 )
+from freecad_stub_gen.generators.common.gen_property.macro.base import ClassContext
 from freecad_stub_gen.generators.common.gen_property.macro.full import PropertyMacro
+from freecad_stub_gen.python_code.ir import PropertyDef
 
 
 class DynamicPropertyGenerator(BasePropertyGenerator, ABC):
@@ -29,9 +32,7 @@ class DynamicPropertyGenerator(BasePropertyGenerator, ABC):
     REG_DYNAMIC_PROPERTY_EXP = re.compile(r'\bEXTENSION_ADD_PROPERTY\(')
     REG_DYNAMIC_PROPERTY_EXP_TYPE = re.compile(r'\bEXTENSION_ADD_PROPERTY_TYPE\(')
 
-    REG_PATTERN_CLASS_DEC = r'class .*\b{}[^{{]*'
-
-    def genDynamicProperties(self) -> Iterable[str]:
+    def genDynamicProperties(self) -> Iterable[PropertyDef]:
         """Generate dynamic properties added in cpp code."""
         if not (cppIncludeContent := self.getCppContent()):
             return
@@ -43,14 +44,13 @@ class DynamicPropertyGenerator(BasePropertyGenerator, ABC):
         if not isinstance(hIncludeContent, str):
             raise TypeError
 
-        reg = re.compile(self.REG_PATTERN_CLASS_DEC.format(cppClassName))
-        classDeclarationBodies = [
-            findFunctionCall(hIncludeContent, classMatch.start())
-            for classMatch in re.finditer(reg, hIncludeContent)
-        ]
+        classDeclarationBodies = getClassDeclarationIndex(
+            hIncludeContent
+        ).findDeclarationBodies(cppClassName)
 
         for match in re.finditer(f'{cppClassName}::{cppClassName}', cppIncludeContent):
             constructorBody = findFunctionCall(cppIncludeContent, match.start())
+            context: ClassContext | None = None  # shared by all properties
             for propMatch in chain(
                 re.finditer(self.REG_DYNAMIC_PROPERTY, constructorBody),
                 re.finditer(self.REG_DYNAMIC_PROPERTY_TYPE, constructorBody),
@@ -58,12 +58,16 @@ class DynamicPropertyGenerator(BasePropertyGenerator, ABC):
                 re.finditer(self.REG_DYNAMIC_PROPERTY_EXP_TYPE, constructorBody),
             ):
                 macroArgs = list(genFuncArgs(constructorBody, propMatch.start()))
+                if context is None:
+                    context = ClassContext(
+                        constructorBody,
+                        self._curNamespace,
+                        cppIncludeContent,
+                        classDeclarationBodies,
+                    )
                 pm = PropertyMacro(
                     *macroArgs,  # type: ignore[misc,arg-type]
-                    constructorBody=constructorBody,
-                    namespace=self._curNamespace,
-                    cppContent=cppIncludeContent,
-                    classDeclarationBodies=classDeclarationBodies,
+                    context=context,
                     macroCallStartPos=propMatch.start(),
                 )
                 yield self.getProperty(
@@ -1,16 +1,28 @@
 import logging
 import re
 from dataclasses import dataclass, field
-from functools import cached_property
 
 from freecad_stub_gen.cpp_code.converters import removeQuote
+from freecad_stub_gen.generators.common.cpp_function import (
+    getMemberDeclarationIndex,
+)
 from freecad_stub_gen.generators.common.doc_string import prepareDocs
 from freecad_stub_gen.generators.common.gen_property.property_type import PropertyType
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class ClassContext:
+    """Code of a class shared by all its properties."""
+
+    constructorBody: str = field(default='', repr=False)
+    namespace: str = ''
+    cppContent: str = field(default='', repr=False)
+    classDeclarationBodies: tuple[str, ...] = field(default=(), repr=False)
+
+
+@dataclass(slots=True)
 class PropertyMacroBase:
     name: str
     default: str
@@ -19,17 +31,28 @@ class PropertyMacroBase:
     _docs: str = ''
 
     propertyType: PropertyType = PropertyType.Prop_None
-    constructorBody: str = field(default='', repr=False)
-    namespace: str = ''
-    cppContent: str = field(default='', repr=False)
-    classDeclarationBodies: list[str] = field(default_factory=list, repr=False)
+    context: ClassContext = field(default=ClassContext(), repr=False)
     macroCallStartPos: int = -1
+    typeId: str | None = field(default=None, init=False)
 
     def __post_init__(self):
         self._docs = self._convertRawText(self._docs, isSentence=True)
         self.group = self._convertRawText(self.group)
         if self._rawType:
             self.propertyType = self._convertPropertyTypes(self._rawType)
+        self.typeId = self._findTypeId()
+
+    @property
+    def constructorBody(self) -> str:
+        return self.context.constructorBody
+
+    @property
+    def namespace(self) -> str:
+        return self.context.namespace
+
+    @property
+    def cppContent(self) -> str:
+        return self.context.cppContent
 
     REG_PATTERN_GROUP_CHAR = r'char\s*\*\s*{}\s*=\s*\"([^"]+)"'
 
@@ -91,21 +114,12 @@ class PropertyMacroBase:
             case _:
                 raise ValueError
 
-    REG_PATTERN_PROP_DECLARATION = r'''(?x)
-(\w([\w \t]|::)*)   # namespace + type, ex. `App::PropertyLinkList`
-\s                  # whitespace
-[\w,\s]*            # there may be declared some other variables with same type
-\b{}\b              # the searched property name
-[\w,\s]*            # there may be declared some other variables with same type
-;                   # declaration must be ended with ;
-'''
-
-    @cached_property
-    def typeId(self) -> str | None:
-        reg = self.REG_PATTERN_PROP_DECLARATION.format(self.name)
-        for classDecBody in self.classDeclarationBodies:
-            if match := re.search(reg, classDecBody):
-                typeId = match.group(1).replace(' ', '').replace('\t', '')
+    def _findTypeId(self) -> str | None:
+        for classDecBody in self.context.classDeclarationBodies:
+            if declaredType := getMemberDeclarationIndex(classDecBody).findType(
+                self.name
+            ):
+                typeId = declaredType.replace(' ', '').replace('\t', '')
                 if '::' not in typeId:
                     typeId = f'{self.namespace}::{typeId}'
 
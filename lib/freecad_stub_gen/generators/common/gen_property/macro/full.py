@@ -8,6 +8,8 @@ from freecad_stub_gen.generators.common.gen_property.property_type import Proper
 
 
 class PropertyMacro(PropertyMacroGetter, PropertyMacroSetter):
+    __slots__ = ()
+
     @property
     def docs(self):
         result = '\n'
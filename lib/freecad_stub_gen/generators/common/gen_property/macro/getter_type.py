@@ -9,6 +9,8 @@ seen = set()
 
 
 class PropertyMacroGetter(PropertyMacroBase):
+    __slots__ = ()
+
     @property
     def pythonGetType(self) -> str:
         if not (typeId := self.typeId):
@@ -16,6 +16,8 @@ seen = set[str]()
 
 
 class PropertyMacroSetter(PropertyMacroBase):
+    __slots__ = ()
+
     # pylint: disable=too-many-statements
     @property
     def pythonSetType(self) -> str:
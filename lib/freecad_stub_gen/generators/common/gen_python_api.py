@@ -2,10 +2,10 @@ import logging
 import re
 from abc import ABC
 from itertools import chain
-from pathlib import Path
 
 import more_itertools
 
+from freecad_stub_gen.file_functions import SourceFile
 from freecad_stub_gen.generators.common.annotation_parameter import SelfSignature
 from freecad_stub_gen.generators.common.arguments_converter.function_conv import (
     FunctionConv,
@@ -13,11 +13,15 @@ from freecad_stub_gen.generators.common.arguments_converter.function_conv import
 from freecad_stub_gen.generators.common.arguments_converter.types_converter import (
     TypesConverter,
 )
-from freecad_stub_gen.generators.common.cpp_function import findFunctionCall
+from freecad_stub_gen.generators.common.cpp_function import (
+    findFunctionCall,
+    getFunctionBodyIndex,
+)
 from freecad_stub_gen.generators.common.gen_base import BaseGenerator
 from freecad_stub_gen.generators.common.return_type_converter.full import (
     ReturnTypeConverter,
 )
+from freecad_stub_gen.profiler import profiler
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +30,8 @@ class PythonApiGenerator(BaseGenerator, ABC):
     REG_TUP = re.compile(r'PyArg_ParseTuple(?!\w)\s*\(')
     REG_TUP_KW = re.compile(r'PyArg_ParseTupleAndKeywords\s*\(')
 
-    def __init__(self, filePath: Path, sourceDir: Path):
-        super().__init__(filePath, sourceDir)
+    def __init__(self, sourceFile: SourceFile):
+        super().__init__(sourceFile)
         self.classNameWithModules = ''
 
         self._cFunctionName = ''
@@ -41,40 +45,37 @@ class PythonApiGenerator(BaseGenerator, ABC):
 
         There may be more than one possible signature.
         """
-        fnBody = self.findFunctionBody(cFunctionName, cClassName)
-        if not isinstance(fnBody, str):
-            return
-
-        self._cFunctionName = cFunctionName
-        self._functionBody = fnBody
-        self._argNumStart = argNumStart
-
-        returnSig = self._getReturnSignature()
-        signatures = chain(
-            self._findParseTuple(),
-            self._findParseTupleAndKeywords(),
-            # TODO @PO: [P5] PyArg_UnpackTuple
-            # https://docs.python.org/3/c-api/arg.html#c.PyArg_UnpackTuple
-        )
-        hasAnySig, sigIter = more_itertools.spy(signatures)
-        for sig in sigIter:
-            yield returnSig.replace(parameters=sig.parameters, unknown_parameters=False)
+        funcName = f'{cClassName}::{cFunctionName}' if cClassName else cFunctionName
+        with profiler.span(profiler.FUNCTION, funcName):
+            with profiler.span(profiler.STAGE, 'findFunctionBody'):
+                fnBody = self.findFunctionBody(cFunctionName, cClassName)
+            if not isinstance(fnBody, str):
+                return
+
+            self._cFunctionName = cFunctionName
+            self._functionBody = fnBody
+            self._argNumStart = argNumStart
+
+            returnSig = self._getReturnSignature()
+            signatures = chain(
+                self._findParseTuple(),
+                self._findParseTupleAndKeywords(),
+                # TODO @PO: [P5] PyArg_UnpackTuple
+                # https://docs.python.org/3/c-api/arg.html#c.PyArg_UnpackTuple
+            )
+            hasAnySig, sigIter = more_itertools.spy(signatures)
+            for sig in sigIter:
+                yield returnSig.replace(
+                    parameters=sig.parameters, unknown_parameters=False
+                )
 
-        if not hasAnySig:
-            yield returnSig
+            if not hasAnySig:
+                yield returnSig
 
     def findFunctionBody(self, cFuncName: str, cClassName: str) -> str | None:
-        if cFuncName == 'PyMake':
-            regs = [re.compile(fr'{cFuncName}\s*\(\s*struct\s*_typeobject\s*\*')]
-        else:
-            regs = [
-                re.compile(fr'{cFuncName}\s*\(\s*PyObject\s*\*.*?\)'),
-                re.compile(fr'{cClassName}::{cFuncName}\s*\([^)]*\)'),
-                re.compile(fr'Py::Object {cFuncName}\s*\([^)]*\)'),
-            ]
-        for searchRegex in regs:
-            if match := re.search(searchRegex, self.impContent):
-                return findFunctionCall(self.impContent, match.end())
+        index = getFunctionBodyIndex(self.impContent)
+        if (end := index.findDeclarationEnd(cFuncName, cClassName)) is not None:
+            return findFunctionCall(self.impContent, end)
 
         return None
 
@@ -92,14 +93,15 @@ class PythonApiGenerator(BaseGenerator, ABC):
         )
 
     def _getReturnSignature(self):
-        rtc = ReturnTypeConverter(
-            self._functionBody,
-            self.requiredImports,
-            self.classNameWithModules,
-            self._cFunctionName,
-        )
-        rt = rtc.getReturnType()
-        ex = rtc.getExceptionsFromCode()
+        with profiler.span(profiler.STAGE, 'ReturnTypeConverter'):
+            rtc = ReturnTypeConverter(
+                self._functionBody,
+                self.requiredImports,
+                self.classNameWithModules,
+                self._cFunctionName,
+            )
+            rt = rtc.getReturnType()
+            ex = rtc.getExceptionsFromCode()
         return SelfSignature(
             unknown_parameters=True, return_annotation=rt, exceptions=ex
         )
@@ -123,10 +125,11 @@ class PythonApiGenerator(BaseGenerator, ABC):
                 onlyPositional=onlyPositional,
                 argNumStart=self._argNumStart,
             )
-            tc = TypesConverter(fc, self.requiredImports, cArgNum=cArgNum)
-            if cArgNum > len(tc.fun.argumentStrings):
-                msg = "Invalid format - expected bigger size"
-                raise ValueError(msg)
+            with profiler.span(profiler.STAGE, 'TypesConverter'):
+                tc = TypesConverter(fc, self.requiredImports, cArgNum=cArgNum)
+                if cArgNum > len(tc.fun.argumentStrings):
+                    msg = "Invalid format - expected bigger size"
+                    raise ValueError(msg)
 
-            params = list(tc.safeConvertFormatToTypes())
+                params = list(tc.safeConvertFormatToTypes())
             yield SelfSignature(params)
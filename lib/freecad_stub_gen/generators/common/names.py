@@ -53,7 +53,7 @@ def getClassWithModulesFromStem(stem: str, namespace: str) -> str:
         mod = moduleNamespace.convertNamespaceToModule(namespace)
         return f'{mod}.{stem}'
 
-    root = ET.parse(file).getroot()
+    root = moduleNamespace.sourceTree.parseXml(file).getroot()
     if not (exportElement := root.find('PythonExport')):
         raise ValueError
     return getClassWithModulesFromNode(exportElement)
@@ -1,26 +1,27 @@
-from inspect import Parameter
-
-from freecad_stub_gen.generators.common.annotation_parameter import SelfSignature
+from freecad_stub_gen.generators.common.annotation_parameter import (
+    AnnotationParam,
+    SelfSignature,
+)
 from freecad_stub_gen.generators.common.arguments_converter.definitions import (
     DEFAULT_ARG_NAME,
 )
 
 
 class SignatureMerger:
-    NO_ANNOTATIONS = (None, 'object', Parameter.empty)
+    NO_ANNOTATIONS = (None, 'object', AnnotationParam.empty)
 
     def __init__(
         self,
         codeSignatures: list[SelfSignature],
         docSignatures: list[SelfSignature],
-        firstParam: Parameter | None = None,
+        firstParam: AnnotationParam | None = None,
         cFunName: str = '',
     ):
         self.codeSignatures = codeSignatures
         self.docSignatures = docSignatures
         self.cFunName = cFunName
 
-        self._retParam: list[Parameter] = []
+        self._retParam: list[AnnotationParam] = []
         self._yielded = False
         self._remainingSig: list[SelfSignature] = []
 
@@ -63,20 +64,20 @@ class SignatureMerger:
 
     @classmethod
     def _mergeParamNamesGen(
-        cls, codeParams: list[Parameter], docsParams: list[Parameter]
+        cls, codeParams: list[AnnotationParam], docsParams: list[AnnotationParam]
     ):
         cParamIt = iter(codeParams)
         pos = 0
         # we iterate over `docsParams` first to not exhaust `cParamIt` iterator
         for dp, cp in zip(docsParams, cParamIt, strict=False):
-            if dp.kind == Parameter.VAR_POSITIONAL:
+            if dp.kind == AnnotationParam.VAR_POSITIONAL:
                 # docs are vague about params from this position,
                 # so we prefer code params
                 yield cp
                 break
 
             default = cp.default
-            if dp.default not in (Parameter.empty, None):
+            if dp.default not in (AnnotationParam.empty, None):
                 default = dp.default
             yield cp.replace(name=dp.name, default=default)
             pos += 1
@@ -108,7 +109,7 @@ class SignatureMerger:
             codeS for codeS in self.codeSignatures if codeS not in usedCodeSignatures
         ]
 
-    def _matchParameters(self, codeParams, docParams) -> list[Parameter] | None:
+    def _matchParameters(self, codeParams, docParams) -> list[AnnotationParam] | None:
         matchedParam = list(self._retParam)
         docSignatureIt = iter(docParams.values())
 
@@ -116,7 +117,7 @@ class SignatureMerger:
             try:
                 docParam = next(docSignatureIt)
             except StopIteration:
-                if codeParam.default is not Parameter.empty:
+                if codeParam.default is not AnnotationParam.empty:
                     # maybe docs have only required params
                     matchedParam.append(codeParam)
                     continue
@@ -131,7 +132,7 @@ class SignatureMerger:
 
             if codeParam.default is None and docParam.default not in (
                 None,
-                Parameter.empty,
+                AnnotationParam.empty,
             ):
                 newArg = newArg.replace(default=docParam.default)
 
@@ -1,7 +1,7 @@
 import re
 
 from freecad_stub_gen.cpp_code.converters import removeQuote
-from freecad_stub_gen.file_functions import genCppFiles, readContent
+from freecad_stub_gen.file_functions import SourceTree, SourceTreeIndex
 from freecad_stub_gen.generators.common.cpp_function import generateExpressionUntilChar
 from freecad_stub_gen.generators.common.names import (
     getClassName,
@@ -10,7 +10,7 @@ from freecad_stub_gen.generators.common.names import (
 )
 from freecad_stub_gen.module_namespace import moduleNamespace
 from freecad_stub_gen.ordered_set import OrderedStrSet
-from freecad_stub_gen.python_code import indent
+from freecad_stub_gen.python_code.ir import ExceptionDef
 
 
 class ExceptionData:
@@ -38,7 +38,7 @@ class ExceptionData:
 
         self.requiredImports = OrderedStrSet()
 
-    def __str__(self):
+    def getExceptionDef(self) -> ExceptionDef:
         if self.baseCppNamespace == '__python__':
             baseClass = self.baseCppClass.removeprefix('PyExc_')
         else:
@@ -48,7 +48,7 @@ class ExceptionData:
             self.requiredImports.add(ed.pyModule)
             baseClass = f'{ed.pyModule}.{ed.pyClass}'
 
-        return f'class {self.pyClass}({baseClass}):\n{indent("pass")}\n'
+        return ExceptionDef(self.pyClass, baseClass)
 
     def __repr__(self):
         return (
@@ -56,7 +56,7 @@ class ExceptionData:
         )
 
 
-class ExceptionContainer:
+class ExceptionContainer(SourceTreeIndex):
     REG_NEW_EXCEPTION = re.compile(
         r"""
     (?P<name>
@@ -72,16 +72,36 @@ class ExceptionContainer:
     )
 
     def __init__(self):
-        self.exceptions = list(self._genExceptions())
+        super().__init__()
+        self._exceptions: list[ExceptionData] = []
+        self._byNamespaceClass: dict[tuple[str | None, str], ExceptionData] = {}
+        self._byClass: dict[str, ExceptionData] = {}
+
+    def _build(self, sourceTree: SourceTree):
+        self._exceptions = list(self._genExceptions(sourceTree))
+
+        # the first exception wins - the same as in a linear search
+        self._byNamespaceClass = {}
+        self._byClass = {}
+        for e in self._exceptions:
+            self._byNamespaceClass.setdefault((e.cppNamespace, e.cppClass), e)
+            self._byClass.setdefault(e.cppClass, e)
+
+    @property
+    def exceptions(self) -> list[ExceptionData]:
+        self._ensureBuilt()
+        return self._exceptions
 
     def checkAllExceptionsCorrect(self):
         for e in self.exceptions:
             repr(e)
 
-    def _genExceptions(self):
-        for file in genCppFiles():
-            content = readContent(file)
-            yield from self.findExceptions(content)
+    @classmethod
+    def _genExceptions(cls, sourceTree: SourceTree):
+        for file in sourceTree.genCppFiles():
+            content = sourceTree.readContent(file)
+            if 'PyErr_NewException' in content:
+                yield from cls.findExceptions(content)
 
     @classmethod
     def findExceptions(cls, content):
@@ -104,19 +124,19 @@ class ExceptionContainer:
             yield ed
 
     def getExceptionData(self, cppClass: str, cppNamespace: str):
-        for e in self.exceptions:
-            if e.cppClass == cppClass and e.cppNamespace == cppNamespace:
-                return e
+        self._ensureBuilt()
+        if (e := self._byNamespaceClass.get((cppNamespace, cppClass))) is not None:
+            return e
 
         msg = f'Cannot find exception: {cppClass=} {cppNamespace=}'
         raise ValueError(msg)
 
     def getExceptionText(self, cTypeExceptionText: str) -> str:
         _cppNamespace, cppClass = getNamespaceWithClass(cTypeExceptionText)
-        for e in self.exceptions:
-            if e.cppClass == cppClass:
-                pyModule = e.pyModuleRaw if e.pyModuleRaw != 'Base' else 'FreeCAD.Base'
-                return f'{pyModule}.{e.pyClass}'
+        self._ensureBuilt()
+        if (e := self._byClass.get(cppClass)) is not None:
+            pyModule = e.pyModuleRaw if e.pyModuleRaw != 'Base' else 'FreeCAD.Base'
+            return f'{pyModule}.{e.pyClass}'
 
         if cTypeExceptionText.startswith('PyExc_'):
             return cTypeExceptionText.removeprefix('PyExc_')
@@ -132,4 +152,3 @@ class ExceptionContainer:
 
 
 exceptionContainer = ExceptionContainer()
-exceptionContainer.checkAllExceptionsCorrect()
@@ -2,10 +2,13 @@ import more_itertools
 
 from freecad_stub_gen.generators.common.gen_python_api import PythonApiGenerator
 from freecad_stub_gen.generators.exceptions.container import exceptionContainer
+from freecad_stub_gen.python_code.ir import Code, Node
 from freecad_stub_gen.python_code.module_container import Module
 
 
 class ExceptionGenerator(PythonApiGenerator):
+    TRIGGER_MARKERS = ('PyErr_NewException',)
+
     def getStub(self, mod: Module, moduleName: str):
         hasException, it = more_itertools.spy(
             exceptionContainer.findExceptions(self.impContent)
@@ -13,8 +16,8 @@ class ExceptionGenerator(PythonApiGenerator):
         if not hasException:
             return
 
-        text = f'# {self.baseGenFilePath.name}\n'
+        nodes: list[Node] = [Code(f'# {self.baseGenFilePath.name}\n')]
         for e in it:
-            text += f'{e}\n\n'
+            nodes.append(e.getExceptionDef())
             self.requiredImports.update(e.requiredImports)
-        mod[moduleName].update(Module(text, self.requiredImports))
+        mod[moduleName].update(Module(nodes, self.requiredImports))
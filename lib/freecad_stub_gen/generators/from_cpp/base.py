@@ -5,12 +5,14 @@ import re
 from abc import ABC
 from collections import defaultdict
 from collections.abc import Iterable
-from inspect import Parameter
 from itertools import chain
 from typing import ClassVar
 
 from freecad_stub_gen.cpp_code.converters import removeQuote
-from freecad_stub_gen.generators.common.annotation_parameter import SelfSignature
+from freecad_stub_gen.generators.common.annotation_parameter import (
+    AnnotationParam,
+    SelfSignature,
+)
 from freecad_stub_gen.generators.common.cpp_function import genFuncArgs
 from freecad_stub_gen.generators.common.doc_string import (
     generateSignaturesFromDocstring,
@@ -18,18 +20,20 @@ from freecad_stub_gen.generators.common.doc_string import (
 from freecad_stub_gen.generators.common.gen_method import MethodGenerator
 from freecad_stub_gen.generators.common.signature_merger import SignatureMerger
 from freecad_stub_gen.logger import LEVEL_CODE
+from freecad_stub_gen.python_code.ir import Code, FunctionDef, Node
 from freecad_stub_gen.python_code.module_container import Module
 
 logger = logging.getLogger(__name__)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Method:
     args: list[str]
     pythonMethodName: str = ''
     cFunction: str = ''
     doc: str | None = None
     _pythonSignature: SelfSignature | None = None
+    cClass: str = dataclasses.field(default='', init=False)
 
     REG_WHITESPACE_WITH_APOSTROPHE: ClassVar = re.compile(r'"\s*"')
     REQUIRED_ARGUMENT_NUM: ClassVar = 2
@@ -54,7 +58,7 @@ class Method:
             raise TypeError
         return match.group('class') or '', match.group('func')
 
-    def insertParam(self, param: Parameter):
+    def insertParam(self, param: AnnotationParam):
         newParameters = [param, *self.pythonSignature.parameters.values()]
         self._pythonSignature = self.pythonSignature.replace(parameters=newParameters)
 
@@ -75,20 +79,20 @@ class Method:
         return str(self.pythonSignature)
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class PyMethodDef(Method):
     flags: str | None = None
 
     def __post_init__(self):
-        super().__post_init__()
+        Method.__post_init__(self)  # `super` does not work in slots dataclass
         self.flags = self.args[2]
 
 
 class BaseGeneratorFromCpp(MethodGenerator, ABC):
     def getStub(self, mod: Module, moduleName: str):
-        if (result := ''.join(self._genStub(moduleName))).rstrip():
-            header = f'# {self.baseGenFilePath.name}\n'
-            newMod = Module(header + result, self.requiredImports)
+        if nodes := list(self._genStub(moduleName)):
+            header = Code(f'# {self.baseGenFilePath.name}\n')
+            newMod = Module([header, *nodes], self.requiredImports)
 
             if self.baseGenFilePath.name in ('Sequencer.cpp', 'GeometryPyCXX.cpp'):
                 # another exception from general rules:
@@ -100,12 +104,12 @@ class BaseGeneratorFromCpp(MethodGenerator, ABC):
 
             mod[moduleName].update(newMod)
 
-    def _genStub(self, moduleName: str) -> Iterable[str]:
+    def _genStub(self, moduleName: str) -> Iterable[Node]:
         raise NotImplementedError
 
     def _genAllMethods(
         self, it: Iterable[Method], firstParam=None, functionSpacing: int = 1
-    ) -> Iterable[str]:
+    ) -> Iterable[FunctionDef]:
         methodNameToMethod: defaultdict[str, list[Method]] = defaultdict(list)
         for method in it:
             methodNameToMethod[method.pythonMethodName].append(method)
@@ -122,12 +126,13 @@ class BaseGeneratorFromCpp(MethodGenerator, ABC):
             uniqueMethods = list(
                 {m.formatPythonSignature(): m for m in methods}.values()
             )
-            yield self.convertMethodToStr(
+            if function := self.createFunction(
                 methods[0].pythonMethodName,
-                uniqueMethods,
+                [m.pythonSignature for m in uniqueMethods],
                 docContent,
                 functionSpacing=functionSpacing,
-            )
+            ):
+                yield function
 
     REG_NOARGS_METHOD = re.compile('add_noargs_method')
     REG_VARGS_METHOD = re.compile('add_varargs_method')
@@ -13,6 +13,7 @@ from freecad_stub_gen.generators.from_cpp.base import (
     Method,
     PyMethodDef,
 )
+from freecad_stub_gen.python_code.ir import FunctionDef
 
 logger = logging.getLogger(__name__)
 
@@ -20,16 +21,20 @@ logger = logging.getLogger(__name__)
 class FreecadStubGeneratorFromCppFunctions(BaseGeneratorFromCpp):
     """Generate functions from cpp code defined in array."""
 
-    def _genStub(self, moduleName: str) -> Iterable[str]:
+    def _genStub(self, moduleName: str) -> Iterable[FunctionDef]:
         it = self._findArrayGen()
         methods = self._genAllMethods(it, functionSpacing=2)
         yield from methods
 
+    TRIGGER_MARKERS = ('PyMethodDef',)
     REG_METHOD_DEF = re.compile(r'PyMethodDef(?!\s*\*)')
 
     def _findArrayGen(self) -> Iterable[Method]:
         """Based on https://docs.python.org/3/c-api/structures.html#c.PyMethodDef."""
-        for match in self.REG_METHOD_DEF.finditer(self.impContent):
+        start = self.sourceFile.findMarker('PyMethodDef')
+        if start < 0:
+            return
+        for match in self.REG_METHOD_DEF.finditer(self.impContent, start):
             arrayStr = findFunctionCall(self.impContent, match.start())
             arrayStrStartPos = arrayStr.find('{') + 1
 
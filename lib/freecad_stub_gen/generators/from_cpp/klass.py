@@ -4,10 +4,11 @@ from collections.abc import Iterable
 from itertools import chain
 
 from freecad_stub_gen.cpp_code.block import QtSignalBlock, parseClass
-from freecad_stub_gen.file_functions import readContent
 from freecad_stub_gen.generators.common.annotation_parameter import AnnotationParam
-from freecad_stub_gen.generators.common.cpp_function import findFunctionCall
-from freecad_stub_gen.generators.common.doc_string import formatDocstring
+from freecad_stub_gen.generators.common.cpp_function import (
+    findFunctionCall,
+    getClassDeclarationIndex,
+)
 from freecad_stub_gen.generators.common.names import (
     getClassWithModulesFromPointer,
     getModuleName,
@@ -17,7 +18,7 @@ from freecad_stub_gen.generators.common.return_type_converter.str_wrapper import
 )
 from freecad_stub_gen.generators.from_cpp.base import BaseGeneratorFromCpp
 from freecad_stub_gen.importable_map import importableMap
-from freecad_stub_gen.python_code import indent
+from freecad_stub_gen.python_code.ir import ClassDef, Code, Node
 
 logger = logging.getLogger(__name__)
 
@@ -25,12 +26,16 @@ logger = logging.getLogger(__name__)
 class FreecadStubGeneratorFromCppClass(BaseGeneratorFromCpp):
     """Generate class from cpp code with methods."""
 
+    TRIGGER_MARKERS = ('::init_type(',)
     REG_INIT_TYPE = re.compile(r'::init_type\([^{;]*{')
     REG_CLASS_NAME = re.compile(r'behaviors\(\)\.name\(\s*"([\w.]+)"\s*\);')
     REG_CLASS_DOC = re.compile(r'behaviors\(\).doc\("((?:[^"\\]|\\.|"\s*")+)"\);')
 
-    def _genStub(self, moduleName: str) -> Iterable[str]:
-        for match in self.REG_INIT_TYPE.finditer(self.impContent):
+    def _genStub(self, moduleName: str) -> Iterable[ClassDef]:
+        start = self.sourceFile.findMarker('::init_type(')
+        if start < 0:
+            return
+        for match in self.REG_INIT_TYPE.finditer(self.impContent, start):
             funcCall = findFunctionCall(self.impContent, match.start())
 
             classMatch = self.REG_CLASS_NAME.search(funcCall)
@@ -42,33 +47,28 @@ class FreecadStubGeneratorFromCppClass(BaseGeneratorFromCpp):
                 continue  # it is a template
 
             gen = self._findFunctionCallsGen(funcCall)
-            result = ''.join(
+            members = tuple(
                 chain(
                     self._genQtSignalAndSlots(className),
                     self._genAllMethods(gen, firstParam=AnnotationParam.SELF_PARAM),
                 )
             )
-            if not result:
-                result = 'pass'
-            content = indent(result)
 
             doc = ''
             if importableMap.isImportable(self.classNameWithModules):
                 doc = "This class can be imported.\n"
             if docsMatch := self.REG_CLASS_DOC.search(funcCall):
                 doc += docsMatch.group(1)
-            if doc:
-                doc = indent(formatDocstring(doc))
 
             baseClasses = self._getBaseClasses(className)
-            yield f"class {className}{baseClasses}:\n{doc}\n{content}\n"
+            yield ClassDef(className, baseClasses, doc, members)
 
-    def _genQtSignalAndSlots(self, className: str) -> Iterable[str]:
+    def _genQtSignalAndSlots(self, className: str) -> Iterable[Node]:
         if not className.endswith('Py'):
             return
 
         className = className.removesuffix('Py')
-        if not (twinHeaderContent := self._getTwinHeaderContent()):
+        if not (twinHeaderContent := self.sourceFile.twinHeaderContent):
             return
 
         found = False
@@ -79,11 +79,11 @@ class FreecadStubGeneratorFromCppClass(BaseGeneratorFromCpp):
                     # TODO @PO: [P4] create global context for imports?
                     #  currently it is very annoying to continuously pass
                     #  `requiredImports` - maybe `from contextvars import ContextVar`?
-                    yield f'{item.getStrRepr(self.requiredImports)}\n'
+                    yield item.getSignalDef(self.requiredImports)
                     found = True
 
         if found:
-            yield '\n'
+            yield Code('\n')
 
     REG_BASE_CLASS_INHERITANCE = re.compile(
         r"""
@@ -95,58 +95,25 @@ class FreecadStubGeneratorFromCppClass(BaseGeneratorFromCpp):
         re.VERBOSE,
     )
 
-    def _getBaseClasses(self, className: str) -> str:
+    def _getBaseClasses(self, className: str) -> tuple[str, ...]:
         if not className.endswith('Py'):
-            return ''
+            return ()
         className = className.removesuffix('Py')
 
-        if not (twinHeaderContent := self._getTwinHeaderContent()):
-            return ''
-
-        if not (
-            match := re.search(
-                rf"""
-class\s+                # keyword `class`
-(?:\w+\s+)?             # there may be optional macro: GuiExport|AppExport
-{className}\s*:\s*      # original class name
-(?P<inherited>[^{{]*    # all inherited classes until {{
-{{)                     # terminating char {{
-""",
-                twinHeaderContent,
-                re.VERBOSE,
-            )
-        ):
-            return ''  # there is no inheritance
+        if not (twinHeaderContent := self.sourceFile.twinHeaderContent):
+            return ()
+
+        index = getClassDeclarationIndex(twinHeaderContent)
+        if (inherited := index.findInheritance(className)) is None:
+            return ()  # there is no inheritance
 
         baseClasses = []
-        for baseClassMatch in re.finditer(
-            self.REG_BASE_CLASS_INHERITANCE, match.group('inherited')
-        ):
+        for baseClassMatch in self.REG_BASE_CLASS_INHERITANCE.finditer(inherited):
             baseClass = baseClassMatch.group('baseClass').strip()
             if pythonClass := self._getPythonClass(baseClass):
                 baseClasses.append(pythonClass)
 
-        if baseClasses:
-            return f"({', '.join(baseClasses)})"
-
-        return ''
-
-    def _getTwinHeaderContent(self) -> str | None:
-        currentName = self.baseGenFilePath.stem
-        if currentName.endswith('Py'):
-            twinName = currentName.removesuffix('Py')
-            twinFile = self.baseGenFilePath.with_stem(twinName).with_suffix('.h')
-            try:
-                return readContent(twinFile)
-            except OSError:
-                # rare case when twin file is with not standard name
-                twinFile = self.baseGenFilePath.with_stem(currentName).with_suffix('.h')
-                try:
-                    return readContent(twinFile)
-                except OSError:
-                    logger.exception(f"Cannot read {twinFile}")
-
-        return None
+        return tuple(baseClasses)
 
     def _getPythonClass(self, baseClass: str) -> str | None:
         match StrWrapper(baseClass):
@@ -5,6 +5,7 @@ from freecad_stub_gen.generators.common.cpp_function import findFunctionCall
 from freecad_stub_gen.generators.from_cpp.base import BaseGeneratorFromCpp
 from freecad_stub_gen.module_namespace import moduleNamespace
 from freecad_stub_gen.ordered_set import OrderedStrSet
+from freecad_stub_gen.python_code.ir import Code, FunctionDef
 from freecad_stub_gen.python_code.module_container import Module
 
 
@@ -15,27 +16,30 @@ class FreecadStubGeneratorFromCppModule(BaseGeneratorFromCpp):
         super().__init__(*args, **kwargs)
         self._modName: str | None = None
 
+    TRIGGER_MARKERS = ('Py::ExtensionModule<',)
     REG_MODULE_INIT = re.compile(r'Py::ExtensionModule<\w+>\("(\w+)"\)')
 
     def getStub(self, mod: Module, moduleName: str):
-        header = f'# {self.baseGenFilePath.name}\n'
-
-        for result in self._genStub(moduleName):
-            if result.rstrip():
-                # we prefer name with more details
-                if self._modName is None:
-                    raise TypeError
-                curModName = moduleName if '.' in moduleName else self._modName
-                curModName = moduleNamespace.convertNamespaceToModule(curModName)
-
-                mod[curModName].update(Module(header + result, self.requiredImports))
-                self.requiredImports = OrderedStrSet()
-
-    def _genStub(self, moduleName: str) -> Iterable[str]:
-        for match in self.REG_MODULE_INIT.finditer(self.impContent):
+        header = Code(f'# {self.baseGenFilePath.name}\n')
+
+        for functions in self._genModuleFunctions():
+            # we prefer name with more details
+            if self._modName is None:
+                raise TypeError
+            curModName = moduleName if '.' in moduleName else self._modName
+            curModName = moduleNamespace.convertNamespaceToModule(curModName)
+
+            mod[curModName].update(Module([header, *functions], self.requiredImports))
+            self.requiredImports = OrderedStrSet()
+
+    def _genModuleFunctions(self) -> Iterable[list[FunctionDef]]:
+        start = self.sourceFile.findMarker('Py::ExtensionModule<')
+        if start < 0:
+            return
+        for match in self.REG_MODULE_INIT.finditer(self.impContent, start):
             moduleInitBody = findFunctionCall(self.impContent, match.end())
 
             gen = self._findFunctionCallsGen(moduleInitBody)
-            if result := ''.join(self._genAllMethods(gen, functionSpacing=2)):
+            if functions := list(self._genAllMethods(gen, functionSpacing=2)):
                 self._modName = match.group(1)
-                yield result
+                yield functions
@@ -1,14 +1,13 @@
 from abc import ABC
-from pathlib import Path
 from xml.etree.ElementTree import Element
 
-from freecad_stub_gen.config import SOURCE_DIR
+from freecad_stub_gen.file_functions import SourceFile
 from freecad_stub_gen.generators.common.gen_base import BaseGenerator
 
 
 class BaseXmlGenerator(BaseGenerator, ABC):
-    def __init__(self, filePath: Path, sourceDir: Path = SOURCE_DIR):
-        super().__init__(filePath, sourceDir)
+    def __init__(self, sourceFile: SourceFile):
+        super().__init__(sourceFile)
         self._currentNode: Element | None = None
 
     @property
@@ -3,7 +3,6 @@ from abc import ABC
 from pathlib import Path
 from typing import Literal
 
-from freecad_stub_gen.file_functions import readContent
 from freecad_stub_gen.generators.common.gen_property.gen_dynamic import (
     DynamicPropertyGenerator,
 )
@@ -40,7 +39,7 @@ class XmlDynamicPropertyGenerator(BaseXmlGenerator, DynamicPropertyGenerator, AB
         for p in (pathFromSrc, pathFromLocal):
             for ext in (extension, Path(inc).suffix):
                 try:
-                    return readContent(p.with_suffix(ext))
+                    return self.sourceTree.readContent(p.with_suffix(ext))
                 except FileNotFoundError:
                     pass
 
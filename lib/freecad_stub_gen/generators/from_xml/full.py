@@ -2,10 +2,7 @@ import inspect
 from xml.etree import ElementTree as ET
 
 from freecad_stub_gen.cpp_code.converters import toBool
-from freecad_stub_gen.generators.common.doc_string import (
-    formatDocstring,
-    getDocFromNode,
-)
+from freecad_stub_gen.generators.common.doc_string import getDocFromNode
 from freecad_stub_gen.generators.common.names import (
     getClassName,
     getClassWithModulesFromNode,
@@ -18,7 +15,7 @@ from freecad_stub_gen.generators.from_xml.dynamic_property import (
 from freecad_stub_gen.generators.from_xml.method import XmlMethodGenerator
 from freecad_stub_gen.generators.from_xml.static_property import XmlPropertyGenerator
 from freecad_stub_gen.importable_map import importableMap
-from freecad_stub_gen.python_code import indent
+from freecad_stub_gen.python_code.ir import ClassDef, Code, Node
 from freecad_stub_gen.python_code.module_container import Module
 
 
@@ -31,57 +28,56 @@ class FreecadStubGeneratorFromXML(
     """
 
     def getStub(self, mod: Module, moduleName, submodule=''):
-        header = f'# {self.baseGenFilePath.name}\n'
+        header = Code(f'# {self.baseGenFilePath.name}\n')
 
-        tree = ET.parse(self.baseGenFilePath)
+        tree = self.sourceTree.parseXml(self.baseGenFilePath)
         for child in tree.getroot():
             if child.tag == 'PythonExport':
                 self.currentNode = child
-                content, classNameWithModules = self._getClassContent()
+                classDef = self._getClassDef()
 
-                modName = getModuleName(classNameWithModules, required=True)
+                modName = getModuleName(self.classNameWithModules, required=True)
                 if submodule:
                     modName = f'{modName}.{submodule}'
 
                 curMod = mod[modName]
-                curMod.update(Module(header + content + '\n', self.requiredImports))
+                curMod.update(Module([header, classDef], self.requiredImports))
                 self.requiredImports.clear()
 
-    def _getClassContent(self):
+    def _getClassDef(self) -> ClassDef:
         self.classNameWithModules = getClassWithModulesFromNode(self.currentNode)
         className = getClassName(self.classNameWithModules)
-        baseClasses = ', '.join(self.genBaseClasses())
-        classStr = f"class {className}({baseClasses}):\n"
+        baseClasses = tuple(self.genBaseClasses())
 
         doc = getDocFromNode(self.currentNode)
         if importableMap.isImportable(self.classNameWithModules):
             doc = "This class can be imported.\n" + (doc or '')
-        if doc:
-            classStr += indent(formatDocstring(doc))
-            classStr += '\n'
-        classStr += indent(self.genInit())
-
-        if specialCaseCode := self.getCodeForSpecialCase(className):
-            classStr += indent(specialCaseCode)
-
-        for attributeNode in sorted(
-            self.currentNode.findall('Attribute'), key=self._nodeSort
-        ):
-            classStr += indent(self.getAttributes(attributeNode))
-        for dynamicProperty in sorted(self.genDynamicProperties()):
-            classStr += indent(dynamicProperty)
-
-        for methodNode in sorted(
-            self.currentNode.findall('Methode'), key=self._nodeSort
-        ):
-            classStr += indent(self.genMethod(methodNode))
+
+        members: list[Node] = []
+        if init := self.genInit():
+            members.append(init)
+        members.extend(self.getCodeForSpecialCase(className))
+        members.extend(
+            self.getAttributes(attributeNode)
+            for attributeNode in sorted(
+                self.currentNode.findall('Attribute'), key=self._nodeSort
+            )
+        )
+        members.extend(sorted(self.genDynamicProperties(), key=lambda p: p.render()))
+        members.extend(
+            method
+            for methodNode in sorted(
+                self.currentNode.findall('Methode'), key=self._nodeSort
+            )
+            if (method := self.genMethod(methodNode))
+        )
 
         if toBool(self.currentNode.attrib.get('RichCompare', False)):
-            classStr += indent(self.genRichCompare())
+            members.extend(self.genRichCompare())
         if toBool(self.currentNode.attrib.get('NumberProtocol', False)):
-            classStr += indent(self.genNumberProtocol(className))
+            members.extend(self.genNumberProtocol(className))
 
-        return classStr, self.classNameWithModules
+        return ClassDef(className, baseClasses, doc, tuple(members), fromXml=True)
 
     @staticmethod
     def _nodeSort(node: ET.Element):
@@ -96,33 +92,42 @@ class FreecadStubGeneratorFromXML(
         if self.classNameWithModules == 'FreeCAD.DocumentObjectGroup':
             yield 'FreeCAD.GroupExtension'
 
-    def getCodeForSpecialCase(self, className: str) -> str:
-        ret = ''
+    def getCodeForSpecialCase(self, className: str) -> list[Node]:
+        ret: list[Node] = []
         if className == 'DocumentObject':
-            ret += self.getProperty(
-                'Proxy',
-                'FreeCADTemplates.templates.ProxyPython',
-                'FreeCADTemplates.templates.ProxyPython',
-                readOnly=False,
+            ret.append(
+                self.getProperty(
+                    'Proxy',
+                    'FreeCADTemplates.templates.ProxyPython',
+                    'FreeCADTemplates.templates.ProxyPython',
+                    readOnly=False,
+                )
             )
             self.requiredImports.add('FreeCADTemplates.templates')
 
         elif className == 'ViewProviderDocumentObject':
-            ret += self.getProperty(
-                'Proxy',
-                'FreeCADTemplates.templates.ViewProviderPython',
-                'FreeCADTemplates.templates.ViewProviderPython',
-                readOnly=False,
+            ret.append(
+                self.getProperty(
+                    'Proxy',
+                    'FreeCADTemplates.templates.ViewProviderPython',
+                    'FreeCADTemplates.templates.ViewProviderPython',
+                    readOnly=False,
+                )
             )
             self.requiredImports.add('FreeCADTemplates.templates')
 
         elif className == 'GroupExtension':
-            ret += self.getProperty(
-                'Group', 'list[DocumentObject]', 'list[DocumentObject]', readOnly=False
+            ret.append(
+                self.getProperty(
+                    'Group',
+                    'list[DocumentObject]',
+                    'list[DocumentObject]',
+                    readOnly=False,
+                )
             )
 
         elif className == 'WorkbenchC':
-            ret += workbenchBody + '\n\n'
+            ret.append(Code(workbenchBody + '\n\n'))
 
         return ret
 
@@ -4,7 +4,6 @@ import xml.etree.ElementTree as ET
 from abc import ABC
 from collections.abc import Iterator
 from functools import cached_property, lru_cache
-from inspect import Parameter
 from pathlib import Path
 
 from freecad_stub_gen.cpp_code.converters import toBool
@@ -20,6 +19,7 @@ from freecad_stub_gen.generators.common.gen_method import MethodGenerator
 from freecad_stub_gen.generators.common.names import getClassNameFromNode
 from freecad_stub_gen.generators.common.signature_merger import SignatureMerger
 from freecad_stub_gen.generators.from_xml.base import BaseXmlGenerator
+from freecad_stub_gen.python_code.ir import FunctionDef, ParamData, SignatureData
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +34,7 @@ class XmlMethodGenerator(BaseXmlGenerator, MethodGenerator, ABC):
         finally:
             self.requiredImports = oldImports
 
-    def genInit(self) -> str:
+    def genInit(self) -> FunctionDef | None:
         """Generate stub for __init__ method."""
         className = getClassNameFromNode(self.currentNode)
 
@@ -49,12 +49,12 @@ class XmlMethodGenerator(BaseXmlGenerator, MethodGenerator, ABC):
 
         if not makeSignatures:
             # Cannot find `PyMake` signature, therefore we also do not find `PyInit`.
-            return ''
+            return None
 
-        if all(ms.return_annotation == Parameter.empty for ms in makeSignatures):
+        if all(ms.return_annotation == AnnotationParam.empty for ms in makeSignatures):
             # A return type of `PyMake` should not be empty,
             # otherwise it means that the developer do not want to call `__init__`.
-            return ''
+            return None
 
         return self.genMethod(
             self.currentNode,
@@ -71,7 +71,7 @@ class XmlMethodGenerator(BaseXmlGenerator, MethodGenerator, ABC):
         cClassName: str = '',
         pythonFunName: str | None = None,
         docsFunName: str | None = None,
-    ) -> str:
+    ) -> FunctionDef | None:
         """Generate stub for method specified in arguments."""
         cFunName = cFunName or node.attrib['Name']
         pythonFunName = pythonFunName or node.attrib['Name']
@@ -86,14 +86,19 @@ class XmlMethodGenerator(BaseXmlGenerator, MethodGenerator, ABC):
         allSignatures = list(
             self._signatureArgGen(cFunName, cClassName, docsFunName, node, firstParam)
         )
-        uniqueSignatures = dict.fromkeys(map(str, allSignatures))
-        signatures = list(uniqueSignatures.keys())
+        uniqueSignatures: dict[str, SelfSignature] = {}
+        for sig in allSignatures:
+            uniqueSignatures.setdefault(str(sig), sig)
 
         docs = getDocFromNode(node)
         docs += SelfSignature.getExceptionsDocs(allSignatures)
 
-        return self.convertMethodToStr(
-            pythonFunName, signatures, docs, isClassic=isClassic, isStatic=isStatic
+        return self.createFunction(
+            pythonFunName,
+            list(uniqueSignatures.values()),
+            docs,
+            isClassic=isClassic,
+            isStatic=isStatic,
         )
 
     def _signatureArgGen(
@@ -102,7 +107,7 @@ class XmlMethodGenerator(BaseXmlGenerator, MethodGenerator, ABC):
         cClassName: str,
         docsFunName: str,
         node: ET.Element,
-        firstParam: Parameter | None = None,
+        firstParam: AnnotationParam | None = None,
     ) -> Iterator[SelfSignature]:
         parameters = []
         if firstParam:
@@ -138,8 +143,8 @@ class XmlMethodGenerator(BaseXmlGenerator, MethodGenerator, ABC):
         yield from generateSignaturesFromDocstring(name, docString, argNumStart)
 
     @classmethod
-    def genRichCompare(cls) -> str:
-        ret = ''
+    def genRichCompare(cls) -> list[FunctionDef]:
+        ret: list[FunctionDef] = []
         ret += cls._genEmptyMethod('__eq__', 'other', retType='bool')
         ret += cls._genEmptyMethod('__ne__', 'other', retType='bool')
         ret += cls._genEmptyMethod('__lt__', 'other', retType='bool')
@@ -149,7 +154,7 @@ class XmlMethodGenerator(BaseXmlGenerator, MethodGenerator, ABC):
         return ret
 
     @classmethod
-    def genNumberProtocol(cls, className: str) -> str:
+    def genNumberProtocol(cls, className: str) -> list[FunctionDef]:
         """Generate number protocol.
 
         Source: find `PyNumberMethods` in
@@ -163,7 +168,7 @@ class XmlMethodGenerator(BaseXmlGenerator, MethodGenerator, ABC):
         # TODO @PO: [P3] remove fake methods
         #  - methods that always raise exception when called
         # TODO @PO: [P3] implement other Protocols - ex. PySequenceMethods
-        ret = ''
+        ret: list[FunctionDef] = []
         ret += cls._genEmptyMethod(
             '__add__', 'other', retType=className, reflected=True
         )
@@ -192,15 +197,20 @@ class XmlMethodGenerator(BaseXmlGenerator, MethodGenerator, ABC):
         return ret
 
     @classmethod
-    def _genEmptyMethod(cls, name: str, *args, retType=None, reflected=False) -> str:
+    def _genEmptyMethod(
+        cls, name: str, *args: str, retType: str | None = None, reflected=False
+    ) -> list[FunctionDef]:
         if reflected:
             reflectedName = '__r' + name[2:]
             ret = cls._genEmptyMethod(name, *args, retType=retType)
             ret += cls._genEmptyMethod(reflectedName, *args, retType=retType)
             return ret
 
-        retType = f' -> {retType}' if retType else ''
-        return f'def {name}({", ".join(("self", *args))}){retType}: ...\n\n'
+        parameters = [ParamData('self')]
+        for arg in args:
+            argName, _sep, default = arg.partition('=')
+            parameters.append(ParamData(argName, default=default or None))
+        return [FunctionDef(name, (SignatureData(tuple(parameters), retType),))]
 
     @lru_cache
     def findFunctionBody(self, cFuncName: str, cClassName: str) -> str | None:
@@ -211,7 +221,7 @@ class XmlMethodGenerator(BaseXmlGenerator, MethodGenerator, ABC):
         if self._currentNode is None:
             baseClass = None
         else:
-            baseClass = type(self).safeCreate(self.parentXmlPath)
+            baseClass = type(self).safeCreate(self.parentXmlPath, self.sourceTree)
 
         if baseClass:
             return baseClass.findFunctionBody(cFuncName, cClassName)
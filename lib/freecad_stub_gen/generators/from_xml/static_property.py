@@ -14,6 +14,7 @@ from freecad_stub_gen.generators.common.return_type_converter.full import (
 )
 from freecad_stub_gen.generators.from_xml.base import BaseXmlGenerator
 from freecad_stub_gen.generators.from_xml.method import XmlMethodGenerator
+from freecad_stub_gen.python_code.ir import PropertyDef
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +22,7 @@ logger = logging.getLogger(__name__)
 class XmlPropertyGenerator(
     XmlMethodGenerator, BaseXmlGenerator, BasePropertyGenerator, ABC
 ):
-    def getAttributes(self, node: ET.Element):
+    def getAttributes(self, node: ET.Element) -> PropertyDef:
         """Generate property based on xml file."""
         name = node.attrib['Name']
         docs = getDocFromNode(node)
@@ -2,17 +2,21 @@ import re
 from collections import defaultdict
 from operator import itemgetter
 
-from freecad_stub_gen.file_functions import genCppFiles, readContent
-from freecad_stub_gen.FreeCADTemplates import additionalPath
+from freecad_stub_gen.file_functions import SourceTree, getSourceTree
 from freecad_stub_gen.python_code import indent
 
 initType = re.compile(r'(\w[\w: ]+?)\s*::init\(\)')
+TYPES_FILE_NAME = 'type_consts.py'
 
 
-def generateTypes():
+def generateTypes(sourceTree: SourceTree | None = None) -> str:
+    """Return content of `type_consts.py` template with types found in sources."""
+    if sourceTree is None:
+        sourceTree = getSourceTree()
+
     prefixToTypes: defaultdict[str, set[tuple[str, str]]] = defaultdict(set)
-    for filePath in genCppFiles():
-        fileContent = readContent(filePath)
+    for filePath in sourceTree.genCppFiles():
+        fileContent = sourceTree.readContent(filePath)
 
         for match in initType.finditer(fileContent):
             originalType = match.group(1).replace(' ', '')
@@ -36,8 +40,4 @@ def generateTypes():
         )
         typeText += klassText + indent(body) + '\n\n\n'
 
-    typeText = typeText.rstrip() + '\n'
-
-    typesPath = additionalPath / 'type_consts.py'
-    with typesPath.open('w', encoding='utf-8') as outputFile:
-        outputFile.write(typeText)
+    return typeText.rstrip() + '\n'
@@ -0,0 +1,223 @@
+"""Source files read directly from objects of a git repository.
+
+Stubs may be generated for any revision of a local FreeCAD clone
+without checking it out (even from a bare repository).
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import shutil
+import subprocess
+import xml.etree.ElementTree as ET
+from functools import cached_property
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+from freecad_stub_gen.cpp_code.converters import removeComments
+from freecad_stub_gen.file_functions import SourceTree, decodeText
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from freecad_stub_gen.file_functions import (
+        FileStamp,
+        PathFilter,
+        StrippedContentCache,
+    )
+
+logger = logging.getLogger(__name__)
+
+
+class GitError(RuntimeError):
+    pass
+
+
+def runGit(repoPath: Path, *args: str) -> bytes:
+    if (git := shutil.which('git')) is None:
+        msg = 'Cannot find git executable'
+        raise GitError(msg)
+
+    result = subprocess.run(  # noqa: S603
+        [git, '-C', str(repoPath), *args], capture_output=True, check=False
+    )
+    if result.returncode:
+        msg = f'git {" ".join(args)} failed: {result.stderr.decode().strip()}'
+        raise GitError(msg)
+    return result.stdout
+
+
+def findRepoRoot(path: Path) -> Path:
+    """Return top level directory of the git repository containing `path`.
+
+    `path` does not have to exist (it may be not checked out),
+    for a bare repository its directory is returned.
+    """
+    directory = next(p for p in (path, *path.parents) if p.is_dir())
+    if runGit(directory, 'rev-parse', '--is-bare-repository').strip() == b'true':
+        output = runGit(directory, 'rev-parse', '--absolute-git-dir')
+    else:
+        output = runGit(directory, 'rev-parse', '--show-toplevel')
+    return Path(os.fsdecode(output.strip()))
+
+
+class GitObjectReader:
+    """Read objects through a persistent `git cat-file --batch` process.
+
+    Each process (ex. a forked worker) starts its own `git` process,
+    so requests and responses are never mixed.
+    """
+
+    def __init__(self, repoPath: Path):
+        self.repoPath = repoPath
+        self.process: subprocess.Popen[bytes] | None = None
+        self._pid = 0
+
+    def _getPipes(self) -> tuple[IO[bytes], IO[bytes]]:
+        if self.process is None or self._pid != os.getpid():
+            self.close()
+            git = shutil.which('git') or 'git'
+            self.process = subprocess.Popen(  # noqa: S603
+                [git, '-C', str(self.repoPath), 'cat-file', '--batch'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+            self._pid = os.getpid()
+
+        stdin, stdout = self.process.stdin, self.process.stdout
+        if stdin is None or stdout is None:
+            raise TypeError
+        return stdin, stdout
+
+    def read(self, objectName: str) -> bytes:
+        stdin, stdout = self._getPipes()
+        stdin.write(f'{objectName}\n'.encode())
+        stdin.flush()
+
+        header = stdout.readline()
+        if not header or header.endswith(b' missing\n'):
+            msg = f'Object {objectName} not found in {self.repoPath}'
+            raise FileNotFoundError(msg)
+
+        size = int(header.split()[2])
+        data = stdout.read(size + 1)  # object content is followed by a new line
+        return data[:-1]
+
+    def close(self):
+        """Stop `git` process (only pipes are closed if it was inherited by fork)."""
+        if self.process is not None:
+            for pipe in (self.process.stdin, self.process.stdout):
+                if pipe is not None:
+                    pipe.close()
+            if self._pid == os.getpid():
+                self.process.wait()
+        self.process = None
+
+
+class GitSourceTree(SourceTree):
+    """Files of `sourcePath` directory at `revision` of git repository.
+
+    The repository is any repository containing `sourcePath`,
+    which does not have to be checked out. Paths of files are the same
+    as in a working tree, but the files are read from the git object database.
+    File stamps are blob identifiers, so an incremental generation
+    of another revision regenerates only stubs of changed files.
+    """
+
+    def __init__(
+        self,
+        sourcePath: Path,
+        revision: str,
+        cache: StrippedContentCache | None = None,
+        pathFilter: PathFilter | None = None,
+    ):
+        super().__init__(sourcePath, cache, pathFilter)
+        self.revision = revision
+        self.repoPath = findRepoRoot(self.sourcePath.resolve())
+        self.reader = GitObjectReader(self.repoPath)
+        # path of `sourcePath` in trees of the repository
+        self.repoPrefix = self.sourcePath.resolve().relative_to(self.repoPath)
+
+    @cached_property
+    def commit(self) -> str:
+        return (
+            runGit(
+                self.repoPath, 'rev-parse', '--verify', f'{self.revision}^{{commit}}'
+            )
+            .decode()
+            .strip()
+        )
+
+    @cached_property
+    def _blobs(self) -> dict[Path, str]:
+        """Map each file path to its blob identifier, in the same order as `os.walk`."""
+        treePath = self.repoPrefix.as_posix()
+        pathSpec: tuple[str, ...]
+        if treePath == '.':  # sources are the whole repository
+            pathSpec, prefix = (), ''
+        else:
+            pathSpec, prefix = ('--', treePath), f'{treePath}/'
+        output = runGit(
+            self.repoPath, 'ls-tree', '-r', '-z', '--full-tree', self.commit, *pathSpec
+        )
+        relativeToBlob = {}
+        for entry in output.decode('utf-8', 'surrogateescape').split('\0'):
+            if not entry:
+                continue
+            info, path = entry.split('\t', 1)
+            _mode, objectType, blobId = info.split()
+            if objectType == 'blob':
+                relativeToBlob[path.removeprefix(prefix)] = blobId
+        if not relativeToBlob:
+            msg = f'There are no files in {self.repoPrefix} at {self.revision}'
+            raise GitError(msg)
+
+        # files of a directory are before files of its subdirectories
+        def walkKey(relativePath: str):
+            *dirs, name = relativePath.split('/')
+            return *((1, d) for d in dirs), (0, name)
+
+        return {
+            self.sourcePath / p: relativeToBlob[p]
+            for p in sorted(relativeToBlob, key=walkKey)
+        }
+
+    def _walkFiles(self) -> Iterator[Path]:
+        relativePaths = (p.relative_to(self.sourcePath).as_posix() for p in self._blobs)
+        for relativePath in self.pathFilter.filterPaths(relativePaths):
+            yield self.sourcePath / relativePath
+
+    def genSubDirs(self, directory: Path) -> Iterator[Path]:
+        subDirs = {
+            directory / p.relative_to(directory).parts[0]
+            for p in self._blobs
+            if p.parent != directory and p.is_relative_to(directory)
+        }
+        for subDir in sorted(subDirs):
+            if not self.isExcluded(subDir):
+                yield subDir
+
+    def _exists(self, file: Path) -> bool:
+        return file in self._blobs
+
+    def getFileStamp(self, file: Path) -> FileStamp:
+        return self._blobs.get(file)
+
+    def _readBytes(self, file: Path) -> bytes:
+        if (blobId := self._blobs.get(file)) is None:
+            msg = f'{file} does not exist in revision {self.revision}'
+            raise FileNotFoundError(msg)
+        return self.reader.read(blobId)
+
+    def _parseXml(self, file: Path) -> ET.ElementTree[ET.Element]:
+        return ET.parse(io.BytesIO(self._readBytes(file)))
+
+    def _readContent(self, file: Path) -> str:
+        if self.cache is None or (blobId := self._blobs.get(file)) is None:
+            return removeComments(decodeText(self._readBytes(file)))
+        return self.cache.readBlobContent(blobId, lambda: self.reader.read(blobId))
+
+    def close(self):
+        self.reader.close()
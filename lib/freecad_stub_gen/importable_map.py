@@ -1,11 +1,12 @@
 import re
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import ItemsView, Iterable
 from dataclasses import dataclass
 from functools import cached_property
+from itertools import chain
 
 from freecad_stub_gen.cpp_code.converters import removeQuote
-from freecad_stub_gen.file_functions import genCppFiles, readContent
+from freecad_stub_gen.file_functions import SourceTree, SourceTreeIndex
 from freecad_stub_gen.generators.common.cpp_function import generateExpressionUntilChar
 from freecad_stub_gen.module_namespace import moduleNamespace
 
@@ -45,8 +46,8 @@ class AddTypeArguments:
         self.pythonName = removeQuote(self.pythonName)
 
 
-class ImportableClassMap(dict[str, str]):
-    """This dict map c++ class name to python name available in imports."""
+class ImportableClassMap(SourceTreeIndex):
+    """This map c++ class name to python name available in imports."""
 
     # there are some types that are renamed in code
     # https://github.com/FreeCAD/FreeCAD/blob/8ac722c1e89ef530564293efd30987db09017e12/src/Mod/Part/App/AppPart.cpp#L226
@@ -54,23 +55,44 @@ class ImportableClassMap(dict[str, str]):
     # Base::Interpreter\(\).addType\(\&\w+::(\w+)Py\s*::Type,\s*\w+,"(?!\1")
 
     def __init__(self):
-        self.dup: defaultdict[str, set[str]] = defaultdict(set[str])
+        super().__init__()
+        self._classMap: dict[str, str] = {}
+        self._dup: defaultdict[str, set[str]] = defaultdict(set[str])
+        self._importableNames: frozenset[str] = frozenset()
+
+    def _build(self, sourceTree: SourceTree):
+        self._dup = defaultdict(set[str])
         # remove duplicated keys - not all classes have namespace
-        super().__init__(self._filterDuplicatedKeys(self._genTypes()))
-        for duplicatedKey in self.dup:
-            del self[duplicatedKey]
+        self._classMap = dict(self._filterDuplicatedKeys(self._genTypes(sourceTree)))
+        for duplicatedKey in self._dup:
+            del self._classMap[duplicatedKey]
+        self._importableNames = frozenset(
+            chain(self._classMap.values(), *self._dup.values())
+        )
+
+    @property
+    def dup(self) -> defaultdict[str, set[str]]:
+        self._ensureBuilt()
+        return self._dup
+
+    def get(self, className: str, default: str | None = None) -> str | None:
+        self._ensureBuilt()
+        return self._classMap.get(className, default)
+
+    def items(self) -> ItemsView[str, str]:
+        self._ensureBuilt()
+        return self._classMap.items()
 
     def isImportable(self, className: str):
-        return className in self.values() or any(
-            className in duplicatedSet for duplicatedSet in self.dup.values()
-        )
+        self._ensureBuilt()
+        return className in self._importableNames
 
     def _filterDuplicatedKeys(self, it: Iterable[tuple[str, str]]):
         seen: dict[str, str] = {}
         for key, val in it:
             if key in seen:
-                self.dup[key].add(seen[key])
-                self.dup[key].add(val)
+                self._dup[key].add(seen[key])
+                self._dup[key].add(val)
             else:
                 seen[key] = val
 
@@ -80,9 +102,9 @@ class ImportableClassMap(dict[str, str]):
         r'Base\s*:\s*:\s*Interpreter\s*\(\s*\)\s*\.\s*addType\s*\('
     )
 
-    def _genTypes(self):
-        for cppFile in genCppFiles():
-            cppContent = readContent(cppFile)
+    def _genTypes(self, sourceTree: SourceTree):
+        for cppFile in sourceTree.genCppFiles():
+            cppContent = sourceTree.readContent(cppFile)
             for match in self.REG_ADD_TYPE.finditer(cppContent):
                 addTypeList = [
                     c.replace(' ', '').replace('\n', '')
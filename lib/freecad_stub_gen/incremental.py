@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import pickle
+import tempfile
+import typing
+from pathlib import Path
+
+from freecad_stub_gen.config import CACHE_DIR, myDir
+from freecad_stub_gen.generators.exceptions.container import exceptionContainer
+from freecad_stub_gen.importable_map import importableMap
+from freecad_stub_gen.module_namespace import moduleNamespace
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from freecad_stub_gen.file_functions import FileStamp, SourceTree
+    from freecad_stub_gen.python_code.module_container import Module
+
+logger = logging.getLogger(__name__)
+
+
+class FileStub(typing.NamedTuple):
+    """Stubs generated from one source file and all files used to generate them."""
+
+    module: Module
+    dependencies: dict[Path, FileStamp]
+
+    def isUpToDate(self, sourceTree: SourceTree) -> bool:
+        return all(
+            sourceTree.getFileStamp(p) == s for p, s in self.dependencies.items()
+        )
+
+    @property
+    def packageNames(self) -> Iterable[str]:
+        return self.module.subModules.keys()
+
+
+class DependencyGraph:
+    """Map each source file to its stubs and dependencies, saved between runs.
+
+    Saved stubs are valid only if the `fingerprint` did not change,
+    it covers generator code and indexes built from the whole source tree.
+    """
+
+    VERSION = 4
+
+    def __init__(self, graphPath: Path, fingerprint: str):
+        self.graphPath = graphPath
+        self.fingerprint = fingerprint
+        self.fileStubs: dict[Path, FileStub] = {}
+
+    @classmethod
+    def forPaths(
+        cls, sourcePath: Path, targetPath: Path, revision: str | None = None
+    ) -> DependencyGraph | None:
+        """Return graph of the same source `revision` and `targetPath`."""
+        if CACHE_DIR is None:
+            return None
+
+        key = hashlib.sha1(
+            f'{sourcePath}\n{targetPath}\n{revision}'.encode(), usedforsecurity=False
+        ).hexdigest()
+        graphPath = CACHE_DIR / 'graphs' / f'{key}.pickle'
+        return cls(graphPath, calculateFingerprint())
+
+    def load(self) -> bool:
+        """Load saved stubs, return `False` if there is no valid saved graph."""
+        try:
+            with self.graphPath.open('rb') as graphFile:
+                # file created by `save` in the user cache directory
+                version, fingerprint, fileStubs = pickle.load(graphFile)  # noqa: S301
+        except FileNotFoundError:
+            return False
+        except (
+            OSError,
+            pickle.UnpicklingError,
+            EOFError,
+            AttributeError,
+            ValueError,
+            TypeError,
+        ):
+            logger.exception(f'Cannot load dependency graph {self.graphPath}')
+            return False
+
+        if (version, fingerprint) != (self.VERSION, self.fingerprint):
+            logger.info('Generator or global indexes changed, regenerating all stubs')
+            return False
+
+        self.fileStubs = fileStubs
+        return True
+
+    def save(self):
+        data = (self.VERSION, self.fingerprint, self.fileStubs)
+        try:
+            self.graphPath.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                'wb', dir=self.graphPath.parent, delete=False
+            ) as tmpFile:
+                pickle.dump(data, tmpFile, protocol=pickle.HIGHEST_PROTOCOL)
+            Path(tmpFile.name).replace(self.graphPath)
+        except OSError:
+            logger.exception(f'Cannot save dependency graph {self.graphPath}')
+
+    def isUpToDate(self, filePath: Path, sourceTree: SourceTree) -> bool:
+        fileStub = self.fileStubs.get(filePath)
+        return fileStub is not None and fileStub.isUpToDate(sourceTree)
+
+
+def calculateFingerprint() -> str:
+    sha = hashlib.sha1(usedforsecurity=False)
+    for part in _genFingerprintParts():
+        sha.update(part.encode('utf-8'))
+        sha.update(b'\0')
+    return sha.hexdigest()
+
+
+def _genFingerprintParts() -> Iterator[str]:
+    # generator code (including copied templates)
+    for codeFile in sorted((*myDir.rglob('*.py'), *myDir.rglob('*.pyi'))):
+        yield str(codeFile.relative_to(myDir))
+        yield hashlib.sha1(codeFile.read_bytes(), usedforsecurity=False).hexdigest()
+
+    # indexes created from all files, they are used by every generator
+    for stem, paths in sorted(moduleNamespace.stemToPaths.items()):
+        yield stem
+        yield from map(str, paths)
+
+    yield from map(str, sorted(importableMap.items()))
+    for key, values in sorted(importableMap.dup.items()):
+        yield key
+        yield from sorted(values)
+
+    for e in exceptionContainer.exceptions:
+        yield repr(e)
+        yield f'{e.baseCppNamespace}::{e.baseCppClass}'
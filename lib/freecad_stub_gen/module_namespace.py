@@ -3,18 +3,26 @@ from collections import defaultdict
 from pathlib import Path
 from typing import ClassVar
 
-from freecad_stub_gen.config import SOURCE_DIR
-from freecad_stub_gen.file_functions import genXmlFiles
+from freecad_stub_gen.file_functions import SourceTree, SourceTreeIndex
 
 logger = logging.getLogger(__name__)
 
 
-class _ModuleNamespace:
-    def __init__(self, sourcePath: Path = SOURCE_DIR):
-        self.sourcePath = sourcePath
-        self.stemToPaths: defaultdict[str, list[Path]] = defaultdict(list)
-        for file in genXmlFiles(sourcePath):
-            self.stemToPaths[file.stem].append(file)
+class _ModuleNamespace(SourceTreeIndex):
+    def __init__(self):
+        super().__init__()
+        self._stemToPaths: dict[str, list[Path]] = {}
+
+    def _build(self, sourceTree: SourceTree):
+        stemToPaths: defaultdict[str, list[Path]] = defaultdict(list)
+        for file in sourceTree.genXmlFiles():
+            stemToPaths[file.stem].append(file)
+        self._stemToPaths = dict(stemToPaths)
+
+    @property
+    def stemToPaths(self) -> dict[str, list[Path]]:
+        self._ensureBuilt()
+        return self._stemToPaths
 
     def getFileForStem(self, stem: str, namespace: str = '') -> Path:
         match stem:  # if there is xml file, use this `match`
@@ -23,7 +31,7 @@ class _ModuleNamespace:
             case 'GeomSurface':
                 stem = 'GeometrySurface'
 
-        match self.stemToPaths[stem]:
+        match self.stemToPaths.get(stem, []):
             case []:
                 msg = f'There is no path for {stem=}'
                 raise ValueError(msg)
@@ -35,7 +43,8 @@ class _ModuleNamespace:
                 # noinspection PyUnboundLocalVariable
                 return pathWithNamespace
             case [anyPath, *_] as possiblePaths:
-                paths = [p.relative_to(self.sourcePath) for p in possiblePaths]
+                sourcePath = self.sourceTree.sourcePath
+                paths = [p.relative_to(sourcePath) for p in possiblePaths]
                 logger.warning(f'There is more than one possible {paths=}')
                 return anyPath
             case _:
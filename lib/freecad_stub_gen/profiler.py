@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class Span(NamedTuple):
+    """Measured part of the generation."""
+
+    category: str
+    name: str
+    start: float  # `time.perf_counter` value - the same clock in all processes
+    wall: float
+    cpu: float
+    pid: int
+
+
+class Profiler:
+    """Record wall and CPU time of pipeline stages, generators, files and functions.
+
+    Spans are recorded only if the profiler is enabled, otherwise `span`
+    does nothing. Spans are inclusive - time of nested spans is also counted
+    in the outer span.
+    """
+
+    STAGE = 'stage'
+    DIRECTORY = 'directory'
+    GENERATOR = 'generator'
+    FILE = 'file'
+    FUNCTION = 'function'
+    SAVE = 'save'
+
+    def __init__(self):
+        self.enabled = False
+        self.spans: list[Span] = []
+
+    @contextlib.contextmanager
+    def span(self, category: str, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+
+        start, cpuStart = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.spans.append(
+                Span(
+                    category,
+                    name,
+                    start,
+                    time.perf_counter() - start,
+                    time.process_time() - cpuStart,
+                    os.getpid(),
+                )
+            )
+
+    def takeSpans(self, start: int) -> list[Span]:
+        """Remove and return spans recorded since `start` (a length of `spans`).
+
+        Spans recorded in a worker process are sent back this way.
+        """
+        spans = self.spans[start:]
+        del self.spans[start:]
+        return spans
+
+    def createReport(self, top: int = 20) -> dict:
+        """Return times aggregated by stage and generator and the slowest items."""
+
+        def aggregate(category: str) -> dict[str, dict[str, float]]:
+            totals: dict[str, dict[str, float]] = defaultdict(
+                lambda: {'count': 0, 'wall': 0.0, 'cpu': 0.0}
+            )
+            for s in self._genSpans(category):
+                total = totals[s.name]
+                total['count'] += 1
+                total['wall'] += s.wall
+                total['cpu'] += s.cpu
+            return dict(sorted(totals.items(), key=lambda i: -i[1]['wall']))
+
+        def slowest(category: str) -> list[dict[str, str | float]]:
+            spans = sorted(self._genSpans(category), key=lambda s: -s.wall)[:top]
+            return [{'name': s.name, 'wall': s.wall, 'cpu': s.cpu} for s in spans]
+
+        return {
+            'stages': aggregate(self.STAGE),
+            'generators': aggregate(self.GENERATOR),
+            'slowestFiles': slowest(self.FILE),
+            'slowestFunctions': slowest(self.FUNCTION),
+        }
+
+    def _genSpans(self, category: str) -> Iterable[Span]:
+        return (s for s in self.spans if s.category == category)
+
+    def saveReport(self, reportPath: Path, top: int = 20):
+        reportPath.write_text(json.dumps(self.createReport(top), indent=2))
+        logger.info(f'Profiler report saved in {reportPath}')
+
+    def createTrace(self) -> dict:
+        """Return all spans as trace events (`chrome://tracing` or Perfetto format).
+
+        Each process is shown as a separate track, times are in microseconds.
+        """
+        start = min((s.start for s in self.spans), default=0.0)
+        mainPid = os.getpid()
+        events: list[dict] = [
+            {
+                'name': 'process_name',
+                'ph': 'M',
+                'pid': pid,
+                'tid': pid,
+                'args': {'name': 'main' if pid == mainPid else f'worker {pid}'},
+            }
+            for pid in sorted({s.pid for s in self.spans})
+        ]
+        events.extend(
+            {
+                'name': s.name,
+                'cat': s.category,
+                'ph': 'X',
+                'ts': round((s.start - start) * 1e6, 3),
+                'dur': round(s.wall * 1e6, 3),
+                'pid': s.pid,
+                'tid': s.pid,
+                'args': {'cpu': round(s.cpu * 1e6, 3)},
+            }
+            for s in sorted(self.spans, key=lambda s: (s.start, -s.wall))
+        )
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def saveTrace(self, tracePath: Path):
+        tracePath.write_text(json.dumps(self.createTrace()))
+        logger.info(f'Profiler trace saved in {tracePath}')
+
+
+profiler = Profiler()
@@ -0,0 +1,254 @@
+"""Intermediate representation of the extracted API.
+
+Generators create these nodes, a stub text is rendered from them only
+when a module is saved. Nodes may be converted to plain data
+(see `nodeToData`), so they can be saved and rendered without FreeCAD sources.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import inspect
+from typing import TYPE_CHECKING
+
+from freecad_stub_gen.generators.common.annotation_parameter import (
+    AnnotationParam,
+    RawStringRepresentation,
+    SelfSignature,
+)
+from freecad_stub_gen.generators.common.doc_string import formatDocstring
+from freecad_stub_gen.python_code import indent
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class Node:
+    """Part of a stub module."""
+
+    __slots__ = ()
+
+    def render(self) -> str:
+        raise NotImplementedError
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Code(Node):
+    """Code copied to the stub without changes."""
+
+    text: str
+
+    def render(self) -> str:
+        return self.text
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ParamData:
+    """Function parameter, `default` and `annotation` are already formatted."""
+
+    name: str
+    kind: int = AnnotationParam.POSITIONAL_OR_KEYWORD.value
+    default: str | None = None
+    annotation: str | None = None
+
+    @classmethod
+    def fromParameter(cls, param: AnnotationParam) -> ParamData:
+        return cls(
+            param.name,
+            param.kind.value,
+            None if param.default is param.empty else repr(param.default),
+            _formatAnnotation(param.annotation),
+        )
+
+    def toParameter(self) -> AnnotationParam:
+        return AnnotationParam(
+            self.name,
+            inspect._ParameterKind(self.kind),  # noqa: SLF001
+            default=_rawOrEmpty(self.default),
+            annotation=_rawOrEmpty(self.annotation),
+        )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class SignatureData:
+    """Data of `SelfSignature` used in stubs."""
+
+    parameters: tuple[ParamData, ...] = ()
+    returnAnnotation: str | None = None
+    exceptions: tuple[str, ...] = ()
+
+    @classmethod
+    def fromSignature(cls, sig: SelfSignature) -> SignatureData:
+        return cls(
+            tuple(map(ParamData.fromParameter, sig.parameters.values())),
+            _formatAnnotation(sig.return_annotation),
+            tuple(sig.exceptions),
+        )
+
+    def __str__(self):
+        return str(
+            SelfSignature(
+                [p.toParameter() for p in self.parameters],
+                return_annotation=_rawOrEmpty(self.returnAnnotation),
+            )
+        )
+
+
+def _formatAnnotation(annotation) -> str | None:
+    if annotation is AnnotationParam.empty:
+        return None
+    return inspect.formatannotation(annotation)
+
+
+def _rawOrEmpty(value: str | None):
+    if value is None:
+        return AnnotationParam.empty
+    return RawStringRepresentation(value)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class FunctionDef(Node):
+    """Function or method, there is an overload for each signature."""
+
+    name: str
+    signatures: tuple[SignatureData, ...]
+    doc: str = ''
+    isStatic: bool = False
+    isClassic: bool = False
+    functionSpacing: int = 1
+
+    def render(self) -> str:
+        decorators = ''
+        if self.isStatic:
+            decorators += '@staticmethod\n'
+        if self.isClassic:
+            decorators += '@classmethod\n'
+        # only single signature should not have overload
+        if len(self.signatures) > 1:
+            decorators += '@typing.overload\n'
+
+        spacing = '\n' * self.functionSpacing
+        ret = ''.join(
+            f'{decorators}def {self.name}{sig}: ...\n{spacing}'
+            for sig in self.signatures[:-1]
+        )
+
+        # last signature should have docstring
+        doc = f'\n{indent(doc)}' if (doc := formatDocstring(self.doc)) else ' ...\n'
+        return f'{ret}{decorators}def {self.name}{self.signatures[-1]}:{doc}{spacing}'
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class PropertyDef(Node):
+    name: str
+    getType: str = ''
+    setType: str = ''
+    doc: str = ''
+    readOnly: bool = True
+
+    def render(self) -> str:
+        retType = f' -> {self.getType}' if self.getType else ''
+        doc = f'\n{indent(doc)}' if (doc := formatDocstring(self.doc)) else ' ...\n'
+        prop = f'@property\ndef {self.name}(self){retType}:{doc}\n'
+
+        if not self.readOnly:
+            valueType = f': {self.setType}' if self.setType else ''
+            prop += f'@{self.name}.setter\n'
+            prop += f'def {self.name}(self, value{valueType}): ...\n\n'
+
+        return prop
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class QtSignalDef(Node):
+    """Qt signal, call protocols are added to module imports by generator."""
+
+    name: str
+    className: str
+    argTypes: tuple[str, ...] = ()
+
+    def getProtocolName(self, argNum: int) -> str:
+        return f'__{self.className}_{self.name}_{argNum}'
+
+    def render(self) -> str:
+        slots = ' | '.join(map(self.getProtocolName, range(len(self.argTypes) + 1)))
+        return f'{self.name}: typing.ClassVar[qt.pyqtSignal[{slots}]]\n'
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ClassDef(Node):
+    """Class with its members.
+
+    Classes from xml files do not have an empty line
+    if there is no docstring and `pass` if there is no member.
+    """
+
+    name: str
+    bases: tuple[str, ...] = ()
+    doc: str = ''
+    members: tuple[Node, ...] = ()
+    fromXml: bool = False
+
+    def render(self) -> str:
+        bases = f'({", ".join(self.bases)})' if self.bases else ''
+        doc = indent(formatDocstring(self.doc)) if self.doc else ''
+        if self.doc or not self.fromXml:
+            doc += '\n'
+        members = renderNodes(self.members)
+        if not (members or self.fromXml):
+            members = 'pass'
+        return f'class {self.name}{bases}:\n{doc}{indent(members)}\n'
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ExceptionDef(Node):
+    name: str
+    base: str
+
+    def render(self) -> str:
+        return f'class {self.name}({self.base}):\n{indent("pass")}\n\n\n'
+
+
+NODE_TYPES: dict[str, type] = {
+    t.__name__: t
+    for t in (
+        Code,
+        ParamData,
+        SignatureData,
+        FunctionDef,
+        PropertyDef,
+        QtSignalDef,
+        ClassDef,
+        ExceptionDef,
+    )
+}
+
+
+def nodeToData(value):
+    """Convert node to JSON compatible data, fields with default value are skipped."""
+    if isinstance(value, tuple):
+        return [nodeToData(v) for v in value]
+    if not dataclasses.is_dataclass(value):
+        return value
+
+    data = {'type': type(value).__name__}
+    for field in dataclasses.fields(value):
+        fieldValue = getattr(value, field.name)
+        if fieldValue != field.default:
+            data[field.name] = nodeToData(fieldValue)
+    return data
+
+
+def nodeFromData(data):
+    """Revert `nodeToData`."""
+    if isinstance(data, list):
+        return tuple(map(nodeFromData, data))
+    if not isinstance(data, dict):
+        return data
+
+    fields = {k: nodeFromData(v) for k, v in data.items() if k != 'type'}
+    return NODE_TYPES[data['type']](**fields)
+
+
+def renderNodes(nodes: Iterable[Node]) -> str:
+    return ''.join(n.render() for n in nodes)
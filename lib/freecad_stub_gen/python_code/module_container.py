@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import gzip
+import json
 import logging
 import sys
 from typing import TYPE_CHECKING
@@ -7,21 +9,43 @@ from typing import TYPE_CHECKING
 from freecad_stub_gen.config import TARGET_DIR
 from freecad_stub_gen.module_namespace import moduleNamespace
 from freecad_stub_gen.ordered_set import OrderedStrSet
+from freecad_stub_gen.python_code.ir import Code, Node, nodeFromData, nodeToData
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Iterator, Sequence
     from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 
 class Module:
-    EXT = '.pyi'
+    """Stub module, its content is collected as IR nodes rendered only when read."""
 
-    def __init__(self, content='', imports: Iterable[str] = (), name: str = ''):
+    EXT = '.pyi'
+    __slots__ = (
+        '_chunks',
+        '_rendered',
+        'forcePackage',
+        'imports',
+        'name',
+        'parent',
+        'subModules',
+    )
+
+    def __init__(
+        self,
+        content: str | Sequence[Node] = '',
+        imports: Iterable[str] = (),
+        name: str = '',
+    ):
         self.name = name
         self.imports = OrderedStrSet(imports)
-        self.content = content
+        self._chunks: list[Node] = (
+            ([Code(content)] if content else [])
+            if isinstance(content, str)
+            else list(content)
+        )
+        self._rendered: str | None = None
         self.subModules = SourcesDict()
 
         self.parent: Module | None = None
@@ -51,38 +75,73 @@ class Module:
         mod = self[key]
         mod.update(value)
 
-    def __add__(self, other):
-        if isinstance(other, str):
-            if not other.endswith('\n'):
-                other += '\n'
-            self.content += other
-            return self
+    @property
+    def nodes(self) -> tuple[Node, ...]:
+        return tuple(self._chunks)
 
-        return NotImplemented
+    @property
+    def content(self) -> str:
+        """Rendered nodes, cached until the next change of this module."""
+        if self._rendered is None:
+            self._rendered = ''.join(n.render() for n in self._chunks)
+        return self._rendered
+
+    @content.setter
+    def content(self, content: str):
+        self._chunks = [Code(content)] if content else []
+        self._rendered = None
+
+    def __add__(self, other):
+        match other:
+            case str():
+                if not other.endswith('\n'):
+                    other += '\n'
+                self._chunks.append(Code(other))
+            case Node():
+                self._chunks.append(other)
+            case _:
+                return NotImplemented
+        self._rendered = None
+        return self
 
     def update(self, sameModule: Module):
+        """Append content of `sameModule` (and its submodules) to this module."""
         self.imports.update(sameModule.imports)
-        self.content += sameModule.content
-        self.subModules.update(sameModule.subModules)
+        self._chunks.extend(sameModule._chunks)
+        self._rendered = None
+        self.forcePackage |= sameModule.forcePackage
+
+        for name, subModule in sameModule.subModules.items():
+            mod = self.subModules[name]
+            if mod.parent is None:
+                mod.parent = self
+            mod.update(subModule)
 
     def save(self, targetPath: Path = TARGET_DIR):
-        savePath = targetPath / self.name
+        for filePath, content in self.genFiles(targetPath / self.name):
+            filePath.parent.mkdir(parents=True, exist_ok=True)
+            filePath.write_text(content)
 
-        if self.subModules:
-            for sm in self.subModules.values():
-                sm.save(savePath)
+    def genFiles(self, savePath: Path) -> Iterator[tuple[Path, str]]:
+        """Generate path and content of each file of this module saved as `savePath`.
 
-            if savePath.exists():
-                (savePath / f'__init__{self.EXT}').touch()
+        Submodule files are generated before the file of this module.
+        """
+        isPackage = False
+        for sm in self.subModules.values():
+            for filePath, content in sm.genFiles(savePath / sm.name):
+                isPackage = True
+                yield filePath, content
 
-        if not self.content:
+        if not self._chunks:
+            if isPackage:
+                yield savePath / f'__init__{self.EXT}', ''
             return
 
         if self.subModules or self.forcePackage:
             savePath = savePath / '__init__'
 
-        savePath.parent.mkdir(parents=True, exist_ok=True)
-        savePath.with_suffix(self.EXT).write_text(self.getContent())
+        yield savePath.with_suffix(self.EXT), self.getContent()
 
     def getContent(self):
         return f'{self._genImports()}{self.content.rstrip()}\n'
@@ -130,6 +189,50 @@ class Module:
             res += '\n\n\n'
         return res
 
+    def toData(self) -> dict:
+        """Convert module tree to JSON compatible data."""
+        return {
+            'name': self.name,
+            'imports': list(self.imports),
+            'forcePackage': self.forcePackage,
+            'nodes': [nodeToData(n) for n in self._chunks],
+            'subModules': [sm.toData() for sm in self.subModules.values()],
+        }
+
+    @classmethod
+    def fromData(cls, data: dict) -> Module:
+        mod = cls(
+            [nodeFromData(n) for n in data['nodes']], data['imports'], data['name']
+        )
+        mod.forcePackage = data['forcePackage']
+        for subData in data['subModules']:
+            subModule = cls.fromData(subData)
+            subModule.parent = mod
+            mod.subModules[subModule.name] = subModule
+        return mod
+
+    def dump(self, irPath: Path, typeConsts: str | None = None):
+        """Save module tree as JSON (`.json` suffix) or gzip compressed JSON.
+
+        `typeConsts` is content of the types file generated together with stubs.
+        """
+        data = {'module': self.toData(), 'typeConsts': typeConsts}
+        text = json.dumps(data, separators=(',', ':'))
+        if irPath.suffix == '.json':
+            irPath.write_text(text)
+        else:
+            irPath.write_bytes(gzip.compress(text.encode('utf-8')))
+        logger.info(f'Intermediate representation saved in {irPath}')
+
+    @classmethod
+    def load(cls, irPath: Path) -> tuple[Module, str | None]:
+        """Return module tree and content of the types file saved by `dump`."""
+        if irPath.suffix == '.json':
+            data = json.loads(irPath.read_text())
+        else:
+            data = json.loads(gzip.decompress(irPath.read_bytes()))
+        return cls.fromData(data['module']), data['typeConsts']
+
     def setSubModulesAsPackage(self):
         for sm in self.subModules.values():
             sm.forcePackage = True
@@ -0,0 +1,78 @@
+import inspect
+
+import pytest
+from freecad_stub_gen.generators.common.annotation_parameter import (
+    AnnotationParam,
+    RawRepr,
+    RawStringRepresentation,
+    SelfSignature,
+)
+
+
+def _createParams(paramType):
+    return [
+        paramType('a', paramType.POSITIONAL_ONLY),
+        paramType('b', paramType.POSITIONAL_OR_KEYWORD, annotation=int, default=1),
+        paramType('args', paramType.VAR_POSITIONAL),
+        paramType(
+            'c',
+            paramType.KEYWORD_ONLY,
+            annotation=RawStringRepresentation('str | None'),
+            default=None,
+        ),
+        paramType('kwargs', paramType.VAR_KEYWORD),
+    ]
+
+
+def test_signature_str_as_inspect():
+    sig = SelfSignature(_createParams(AnnotationParam), return_annotation=float)
+    expected = inspect.Signature(
+        _createParams(inspect.Parameter), return_annotation=float
+    )
+    assert str(sig) == str(expected)
+    retType = RawRepr('bool')
+    assert str(sig.replace(return_annotation=retType)) == str(
+        expected.replace(return_annotation=retType)
+    )
+
+
+def test_signature_validation():
+    a = AnnotationParam('a', AnnotationParam.POSITIONAL_OR_KEYWORD)
+    with pytest.raises(ValueError, match='duplicate'):
+        SelfSignature([a, a])
+    with pytest.raises(ValueError, match='not a valid'):
+        AnnotationParam('class', AnnotationParam.POSITIONAL_OR_KEYWORD)
+
+
+def test_signature_eq_and_hash_as_inspect():
+    def createSignatures(paramType, signatureType):
+        a = paramType('a', paramType.POSITIONAL_OR_KEYWORD)
+        b = paramType('b', paramType.KEYWORD_ONLY, annotation='int', default=1)
+        c = paramType('c', paramType.KEYWORD_ONLY)
+        return [
+            signatureType([a, b, c]),
+            signatureType([a, c, b]),  # keyword only parameters in other order
+            signatureType([a, c, b], return_annotation='int'),
+            signatureType([a.replace(kind=paramType.POSITIONAL_ONLY), b, c]),
+            signatureType([a]),
+            signatureType(),
+        ]
+
+    signatures = createSignatures(AnnotationParam, SelfSignature)
+    expected = createSignatures(inspect.Parameter, inspect.Signature)
+    for sig, exp in zip(signatures, expected, strict=True):
+        assert [sig == s for s in signatures] == [exp == e for e in expected]
+        assert [hash(sig) == hash(s) for s in signatures] == [
+            hash(exp) == hash(e) for e in expected
+        ]
+    assert len(set(signatures)) == len(set(expected)) == 5
+
+
+def test_signature_read_only():
+    sig = SelfSignature([AnnotationParam('a', AnnotationParam.POSITIONAL_ONLY)])
+    assert str(sig) == '(a, /)'
+    for name in ('parameters', 'return_annotation', 'exceptions', 'unknown_parameters'):
+        with pytest.raises(AttributeError):
+            setattr(sig, name, getattr(sig, name))
+    assert str(sig.replace(return_annotation=RawRepr('int'))) == '(a, /) -> int'
+    assert str(sig) == '(a, /)'
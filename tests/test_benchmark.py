@@ -0,0 +1,39 @@
+from freecad_stub_gen.benchmark.harness import (
+    formatTimings,
+    runBenchmark,
+    timeEndToEnd,
+)
+from freecad_stub_gen.benchmark.synthetic_tree import generateSourceTree
+
+
+def test_benchmark_synthetic_tree(tmp_path, monkeypatch):
+    monkeypatch.setattr('freecad_stub_gen.incremental.CACHE_DIR', None)
+    sourcePath = generateSourceTree(tmp_path / 'src', size=2)
+    targetPath = tmp_path / 'stubs'
+
+    timings = runBenchmark(sourcePath, targetPath, repeat=1)
+    assert list(timings) == ['total', 'walk', 'read', 'parseXml', 'indexes', 'generate']
+    assert all(len(times) == 1 for times in timings.values())
+    assert 'generate' in formatTimings(timings)
+
+    stubs = (targetPath / 'FreeCAD-stubs' / '__init__.pyi').read_text()
+    assert 'class Object1(FreeCAD.PyObjectBase):' in stubs
+    assert 'def make1(name: str, count: int = 1, /):' in stubs
+    assert (targetPath / 'Workbench1-stubs' / '__init__.pyi').exists()
+
+
+def test_same_stubs_in_parallel(tmp_path, monkeypatch):
+    monkeypatch.setattr('freecad_stub_gen.incremental.CACHE_DIR', None)
+    sourcePath = generateSourceTree(tmp_path / 'src', size=3)
+
+    def readStubs(jobs: int) -> dict[str, str]:
+        targetPath = tmp_path / f'stubs{jobs}'
+        timeEndToEnd(sourcePath, targetPath, jobs)
+        return {
+            p.relative_to(targetPath).as_posix(): p.read_text()
+            for p in targetPath.rglob('*.pyi')
+        }
+
+    serialStubs = readStubs(1)
+    assert 'Workbench2-stubs/__init__.pyi' in serialStubs
+    assert readStubs(2) == serialStubs
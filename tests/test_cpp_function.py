@@ -0,0 +1,139 @@
+from freecad_stub_gen.generators.common.cpp_function import (
+    ClassBlock,
+    ClassDeclarationIndex,
+    FunctionBodyIndex,
+    MemberDeclarationIndex,
+    PreprocessorRegions,
+    findFunctionCall,
+    generateExpressionUntilChar,
+)
+
+
+def test_find_function_call_ignores_literals():
+    text = 'void f() { g("}", \'{\'); if (x) { y(); } } void h() {}'
+    assert findFunctionCall(text, 0) == text[: text.index(' void h')]
+    assert findFunctionCall(text, text.index('if')) == 'if (x) { y(); }'
+    assert findFunctionCall(text, text.index('g('), '(', ')') == 'g("}", \'{\')'
+
+
+def test_find_function_call_skips_directive_branches():
+    text = 'f() {\n#if A\n if (a) {\n#else\n if (b) {\n#endif\n }\n}\nrest'
+    assert findFunctionCall(text, 0) == text.removesuffix('\nrest')
+
+
+def test_find_function_call_starts_in_else_branch():
+    text = (
+        '#ifdef OLD\nint a;\n#else\nPyObject* f(PyObject *args)\n{ return x; }\n'
+        '#endif\nPyObject* g(PyObject *args)\n{ return y; }'
+    )
+    assert findFunctionCall(text, text.index('{')) == '{ return x; }'
+    assert findFunctionCall(text, text.index('PyObject* g')).endswith('{ return y; }')
+
+
+def test_generate_expression_until_char():
+    text = 'a, f(b, c), "d, )", [e, f]) tail'
+    assert list(generateExpressionUntilChar(text, 0, ',', '([', ')]')) == [
+        'a',
+        ' f(b, c)',
+        ' "d, )"',
+        ' [e, f]',
+    ]
+    assert list(generateExpressionUntilChar('x{a;b};y', 0, ';', '{', '}')) == [
+        'x{a;b}',
+        'y',
+    ]
+    assert list(generateExpressionUntilChar('a, (b', 0)) == ['a', ' (b']
+
+
+def test_preprocessor_regions():
+    text = (
+        '#if A\na\n#if B\nb\n#else\nc\n#endif\n#else\nd\n#if E\ne\n#endif\n#endif\nf\n'
+    )
+    regions = PreprocessorRegions(text)
+    innerElse = text.index('#else') + len('#else')
+    outerElse = text.index('#else', innerElse) + len('#else')
+    assert list(regions.genInactiveSpans()) == [
+        (innerElse, text.index('#endif')),
+        (outerElse, text.rindex('#endif')),
+    ]
+
+
+def test_preprocessor_regions_relative_to_scan_start():
+    text = '#ifdef A\na\n#else\nb\n#if C\nc\n#else\nd\n#endif\ne\n#endif\nf\n'
+    regions = PreprocessorRegions(text)
+    # the scan starts inside inactive `#else` branch, so the branch is active
+    innerElse = text.index('#else', text.index('#if C')) + len('#else')
+    assert list(regions.genInactiveSpans(text.index('\nb\n'))) == [
+        (innerElse, text.index('#endif'))
+    ]
+    assert list(regions.genInactiveSpans(text.index('\na\n'))) == [
+        (text.index('#else') + len('#else'), len(text))
+    ]
+
+
+def test_function_body_index():
+    text = (
+        'PyObject* A::rescale(PyObject *args) { a(); }\n'
+        'PyObject* A::scale(PyObject *args) { b(); }\n'
+        'Py::Object B::get(const Py::Tuple& args) { c(); }\n'
+        'Py::Object free(const Py::Tuple& args) { d(); }\n'
+    )
+    index = FunctionBodyIndex(text)
+
+    def body(name, className=''):
+        end = index.findDeclarationEnd(name, className)
+        return None if end is None else findFunctionCall(text, end).strip()
+
+    assert body('rescale') == '{ a(); }'
+    assert body('scale') == '{ b(); }'
+    assert body('cale') is None
+    assert body('get', 'B') == '{ c(); }'
+    assert body('free') == '{ d(); }'
+    assert body('missing', 'A') is None
+
+
+def test_class_declaration_index():
+    text = (
+        'class AppExport FeaturePython : public Feature\n{\n int a; };\n'
+        '#ifdef X\nclass Feature : public DocumentObject {\n#else\n'
+        'class Feature : public Base {\n#endif\n int b; };\n'
+    )
+    index = ClassDeclarationIndex(text)
+    featurePythonBody = text.index('{') + 1
+    assert index.findBodyStart('FeaturePython') == featurePythonBody
+    assert index.findBodyStart('Feature') == featurePythonBody  # prefix matches
+    assert index.findBodyStart('Missing') is None
+    assert index.findInheritance('FeaturePython') == 'public Feature\n{'
+    assert index.findInheritance('Feature') == 'public DocumentObject {'
+    assert index.findDeclarationStarts('Feature') == [
+        0,
+        text.index('class Feature'),
+        text.index('class Feature : public Base'),
+    ]
+
+
+def test_member_declaration_index():
+    body = (
+        '{ App::PropertyLink  Base, Tool;\n'
+        '  App::PropertyFloat\tLength;\n void f(int Length); }'
+    )
+    index = MemberDeclarationIndex(body)
+    assert index.findType('Tool') == 'App::PropertyLink '
+    assert index.findType('Length') == 'App::PropertyFloat'
+    assert index.findType('f') is None
+    assert MemberDeclarationIndex('{ int a, b c; }').findType('c') == 'int'
+
+
+def test_class_blocks():
+    text = (
+        'class GuiExport View : public QObject {\n  Q_OBJECT\npublic:\n  View();\n'
+        'Q_SIGNALS:\n  void changed(int a);\nprivate Q_SLOTS:\n  void onClick();\n};'
+    )
+    index = ClassDeclarationIndex(text)
+    assert index.findBlocks('View') == (
+        ClassBlock('public:', 'View();'),
+        ClassBlock('Q_SIGNALS:', 'void changed(int a);'),
+        ClassBlock('private Q_SLOTS:', 'void onClick();'),
+    )
+    assert index.findBlocks('Missing') is None
+    assert index.findDeclarationBodies('View') == (text.removesuffix(';'),)
@@ -0,0 +1,31 @@
+import pytest
+
+from freecad_stub_gen.file_functions import SourceTree
+from freecad_stub_gen.generators.exceptions.container import ExceptionContainer
+
+
+def test_exception_container(tmp_path):
+    (tmp_path / 'Exception.cpp').write_text(
+        'PyObject* Base::PyExc_FC_GeneralError = PyErr_NewException('
+        '"Base.FreeCADError", PyExc_RuntimeError, nullptr);\n'
+        'PyObject* Base::PyExc_FC_CADKernelError = PyErr_NewException('
+        '"Base.CADKernelError", Base::PyExc_FC_GeneralError, nullptr);\n'
+        'PyObject* Part::PyExc_FC_CADKernelError = PyErr_NewException('
+        '"Part.CADKernelError", Base::PyExc_FC_CADKernelError, nullptr);\n'
+    )
+    container = ExceptionContainer()
+    container.build(SourceTree(tmp_path))
+    base, kernel, partKernel = container.exceptions
+
+    assert container.getExceptionData('PyExc_FC_GeneralError', 'Base') is base
+    assert container.getExceptionData('PyExc_FC_CADKernelError', 'Base') is kernel
+    assert container.getExceptionData('PyExc_FC_CADKernelError', 'Part') is partKernel
+    with pytest.raises(ValueError, match='Cannot find exception'):
+        container.getExceptionData('PyExc_FC_GeneralError', 'Part')
+
+    # the first exception of the class is used, regardless of its namespace
+    assert (
+        container.getExceptionText('Part::PyExc_FC_CADKernelError')
+        == 'FreeCAD.Base.CADKernelError'
+    )
+    assert container.getExceptionText('PyExc_ValueError') == 'ValueError'
@@ -0,0 +1,218 @@
+import os
+
+from freecad_stub_gen.file_functions import (
+    FileWriter,
+    PathFilter,
+    SourceFile,
+    SourceTree,
+    SourceTreeIndex,
+    StrippedContentCache,
+    decodeText,
+    getFileStamp,
+    getSourceTree,
+    readText,
+)
+
+
+def test_source_tree(tmp_path):
+    (tmp_path / 'App').mkdir()
+    (tmp_path / 'App' / 'A.cpp').write_text('int a; // comment\n')
+    (tmp_path / 'App' / 'APy.xml').write_text('<xml/>')
+    (tmp_path / 'AppGui').mkdir()
+    (tmp_path / 'AppGui' / 'B.cpp').write_text('int b;\n')
+
+    tree = SourceTree(tmp_path)
+    assert sorted(p.name for p in tree.genCppFiles()) == ['A.cpp', 'B.cpp']
+    assert [p.name for p in tree.genCppFiles(tmp_path / 'App')] == ['A.cpp']
+    assert [p.name for p in tree.genXmlFiles()] == ['APy.xml']
+    assert tree.readContent(tmp_path / 'App' / 'A.cpp') == 'int a;  \n'
+
+
+def test_shared_source_tree(tmp_path, monkeypatch):
+    monkeypatch.setattr('freecad_stub_gen.file_functions.CACHE_DIR', None)
+    monkeypatch.setattr('freecad_stub_gen.file_functions._sourceTrees', {})
+    (tmp_path / 'Sub').mkdir()
+    (tmp_path / 'Sub' / 'B.cpp').write_text('int b;\n')
+    (tmp_path / 'Z.cpp').write_text('int a; // comment\n')
+
+    tree = getSourceTree(tmp_path)
+    assert getSourceTree(tmp_path / 'Sub' / '..') is tree
+    # files of a directory are before files of its subdirectories
+    assert [p.name for p in tree.genCppFiles()] == ['Z.cpp', 'B.cpp']
+    assert tree.readContent(tmp_path / 'Z.cpp') == 'int a;  \n'
+
+    def fail(file):
+        raise AssertionError(file)
+
+    # files are walked and read only once
+    monkeypatch.setattr('os.scandir', fail)
+    monkeypatch.setattr('freecad_stub_gen.file_functions.readContent', fail)
+    assert [p.name for p in tree.genCppFiles(tmp_path / 'Sub')] == ['B.cpp']
+    assert tree.readContent(tmp_path / 'Z.cpp') == 'int a;  \n'
+
+
+def test_stripped_content_cache(tmp_path, monkeypatch):
+    source = tmp_path / 'A.cpp'
+    source.write_text('int a; /* comment */\n')
+    cache = StrippedContentCache(tmp_path / 'cache')
+    assert cache.readContent(source) == 'int a;  \n'
+
+    def fail(text):
+        raise AssertionError(text)
+
+    monkeypatch.setattr('freecad_stub_gen.file_functions.removeComments', fail)
+    assert cache.readContent(source) == 'int a;  \n'
+
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.readContent(source) == 'int a;  \n'  # touched, content unchanged
+    assert (
+        StrippedContentCache(tmp_path / 'cache', verifyHash=True).readContent(source)
+        == 'int a;  \n'
+    )
+
+    monkeypatch.undo()
+    source.write_text('int b; // other\n')
+    assert cache.readContent(source) == 'int b;  \n'
+
+
+def test_record_dependencies(tmp_path):
+    (tmp_path / 'A.cpp').write_text('int a;\n')
+    tree = SourceTree(tmp_path)
+    tree.readContent(tmp_path / 'A.cpp')  # not recorded
+
+    with tree.recordDependencies() as dependencies:
+        tree.readContent(tmp_path / 'A.cpp')
+        assert not tree.exists(tmp_path / 'B.h')
+
+    assert dependencies == {tmp_path / 'A.cpp', tmp_path / 'B.h'}
+    assert getFileStamp(tmp_path / 'B.h') is None
+    assert getFileStamp(tmp_path / 'A.cpp') == (
+        7,
+        (tmp_path / 'A.cpp').stat().st_mtime_ns,
+    )
+
+
+def test_file_writer(tmp_path):
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / 'same.pyi').write_bytes(b'same\n')
+    (tmp_path / 'pkg' / 'stale.pyi').write_bytes(b'stale\n')
+    (tmp_path / 'old').mkdir()
+    (tmp_path / 'old' / 'stale.pyi').write_bytes(b'stale\n')
+    mtime = (tmp_path / 'pkg' / 'same.pyi').stat().st_mtime_ns
+
+    writer = FileWriter()
+    assert not writer.write(tmp_path / 'pkg' / 'same.pyi', b'same\n')
+    assert writer.write(tmp_path / 'pkg' / 'sub' / 'new.pyi', b'new\n')
+    writer.removeStale(tmp_path)
+
+    assert (tmp_path / 'pkg' / 'same.pyi').stat().st_mtime_ns == mtime
+    assert (tmp_path / 'pkg' / 'sub' / 'new.pyi').read_bytes() == b'new\n'
+    assert sorted(p.name for p in tmp_path.rglob('*')) == [
+        'new.pyi',
+        'pkg',
+        'same.pyi',
+        'sub',
+    ]
+    assert (writer.changedCount, writer.removedCount) == (1, 2)
+
+
+def test_parse_xml_once(tmp_path, monkeypatch):
+    (tmp_path / 'APy.xml').write_text('<GenerateModel><PythonExport/></GenerateModel>')
+    tree = SourceTree(tmp_path)
+    root = tree.parseXml(tmp_path / 'APy.xml').getroot()
+
+    def fail(file):
+        raise AssertionError(file)
+
+    monkeypatch.setattr('xml.etree.ElementTree.parse', fail)
+    with tree.recordDependencies() as dependencies:
+        assert tree.parseXml(tmp_path / 'APy.xml').getroot() is root
+    assert dependencies == {tmp_path / 'APy.xml'}
+
+
+def test_source_tree_index_built_once(tmp_path):
+    class Index(SourceTreeIndex):
+        builds: list[SourceTree] = []
+
+        def _build(self, sourceTree):
+            self.builds.append(sourceTree)
+
+    tree = SourceTree(tmp_path)
+    index = Index()
+    assert not index.builds
+
+    index.build(tree)
+    index.build(tree)
+    assert index.sourceTree is tree
+    assert index.builds == [tree]
+
+
+def test_source_file_markers(tmp_path):
+    (tmp_path / 'A.cpp').write_text(
+        'void A::init_type() {}\n'
+        '// PyMethodDef in comment\n'
+        'static PyMethodDef a[] = {}, b[] = {};\n'
+    )
+    (tmp_path / 'B.cpp').write_text('int b;\n')
+    tree = SourceTree(tmp_path)
+
+    sourceFile = SourceFile(tmp_path / 'A.cpp', tree)
+    assert sourceFile.markers == {'::init_type(': [6], 'PyMethodDef': [32]}
+    assert sourceFile.findMarker('PyMethodDef') == sourceFile.markers['PyMethodDef'][0]
+    assert sourceFile.findMarker('PyErr_NewException') == -1
+    assert not SourceFile(tmp_path / 'B.cpp', tree).markers
+
+
+def test_source_file(tmp_path, monkeypatch):
+    (tmp_path / 'APy.xml').write_text('<xml/>')
+    (tmp_path / 'APyImp.cpp').write_text('int imp; // comment\n')
+    (tmp_path / 'A.h').write_text('class A;\n')
+    (tmp_path / 'BPy.cpp').write_text('int b;\n')
+    tree = SourceTree(tmp_path)
+
+    sourceFile = SourceFile(tmp_path / 'APy.xml', tree)
+    assert sourceFile.impPath == tmp_path / 'APyImp.cpp'
+    assert sourceFile.content == 'int imp;  \n'
+    assert sourceFile.twinHeaderContent == 'class A;\n'
+    assert SourceFile(tmp_path / 'BPy.cpp', tree).impPath == tmp_path / 'BPy.cpp'
+
+    def fail(file):
+        raise AssertionError(file)
+
+    # other generators of the same file use content which is already read
+    monkeypatch.setattr('freecad_stub_gen.file_functions.readContent', fail)
+    assert SourceFile(tmp_path / 'APy.cpp', tree).content is sourceFile.content
+    assert sourceFile.twinHeaderContent == 'class A;\n'
+
+
+def test_path_filter(tmp_path):
+    for file in ('A.cpp', 'A.h', 'Mod/Test/T.cpp', 'Mod/Part/App/P.xml', 'build/B.cpp'):
+        (tmp_path / file).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / file).write_text('')
+
+    pathFilter = PathFilter(('*.cpp', '*.xml'), ('Mod/Test', '*build'))
+    assert list(pathFilter.walk(tmp_path)) == [
+        tmp_path / 'A.cpp',
+        tmp_path / 'Mod' / 'Part' / 'App' / 'P.xml',
+    ]
+
+    tree = SourceTree(tmp_path, pathFilter=pathFilter)
+    assert [p.name for p in tree.genCppFiles()] == ['A.cpp']
+    assert tree.isExcluded(tmp_path / 'Mod' / 'Test' / 'App')
+    assert not tree.isExcluded(tmp_path / 'Mod' / 'Part')
+
+
+def test_decode_text(tmp_path):
+    assert decodeText('a\r\nb\rc\nż'.encode()) == 'a\nb\nc\nż'
+    assert decodeText('ż'.encode('iso8859-2')) == 'ż'.encode('iso8859-2').decode(
+        'iso8859-1'
+    )
+
+    for data in (b'a\r\nb\r', 'ó\r\n'.encode('cp1250')):
+        (tmp_path / 'A.cpp').write_bytes(data)
+        try:
+            expected = (tmp_path / 'A.cpp').read_text('utf-8')
+        except UnicodeDecodeError:
+            expected = (tmp_path / 'A.cpp').read_text('iso8859-1')
+        assert readText(tmp_path / 'A.cpp') == expected
@@ -0,0 +1,84 @@
+import shutil
+
+import pytest
+from freecad_stub_gen.git_source import GitError, GitSourceTree, runGit
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git not found')
+
+
+def _git(repoPath, *args):
+    runGit(repoPath, '-c', 'user.name=a', '-c', 'user.email=a@b', *args)
+
+
+def test_git_source_tree(tmp_path):
+    repo = tmp_path / 'FreeCAD'
+    for file in ('src/App/Sub/B.cpp', 'src/App/A.cpp', 'src/3rdParty/C.cpp'):
+        (repo / file).parent.mkdir(parents=True, exist_ok=True)
+        (repo / file).write_text('int a; // comment\r\n')
+    (repo / 'src/App/APy.xml').write_text('<GenerateModel/>')
+    _git(repo, 'init', '-q')
+    _git(repo, 'add', '.')
+    _git(repo, 'commit', '-q', '-m', 'v1')
+    _git(repo, 'tag', 'v1')
+    shutil.rmtree(repo / 'src')  # files are read from git objects only
+
+    src = repo / 'src'
+    tree = GitSourceTree(src, 'v1')
+    assert list(tree.genCppFiles()) == [src / 'App/A.cpp', src / 'App/Sub/B.cpp']
+    assert tree.readContent(src / 'App/Sub/B.cpp') == 'int a;  \n'
+    assert tree.parseXml(src / 'App/APy.xml').getroot().tag == 'GenerateModel'
+    assert tree.exists(src / 'App/A.cpp')
+    assert not tree.exists(src / 'App/A.h')
+    assert tree.getFileStamp(src / 'App/A.cpp') == tree.getFileStamp(
+        src / 'App/Sub/B.cpp'
+    )
+    assert list(tree.genSubDirs(src)) == [src / 'App']
+    with pytest.raises(FileNotFoundError):
+        tree.readContent(src / 'App/A.h')
+    with pytest.raises(GitError):
+        list(GitSourceTree(src, 'v2').genCppFiles())
+
+
+def test_git_object_reader_close(tmp_path):
+    repo = tmp_path / 'FreeCAD'
+    (repo / 'src').mkdir(parents=True)
+    (repo / 'src/A.cpp').write_text('int a;\n')
+    _git(repo, 'init', '-q')
+    _git(repo, 'add', '.')
+    _git(repo, 'commit', '-q', '-m', 'v1')
+
+    tree = GitSourceTree(repo / 'src', 'HEAD')
+    assert tree.readContent(repo / 'src/A.cpp') == 'int a;\n'
+    process = tree.reader.process
+    assert process is not None
+    tree.close()
+    assert process.returncode == 0
+    assert tree.reader.process is None
+    assert tree.reader.read(tree.getFileStamp(repo / 'src/A.cpp')) == b'int a;\n'
+    tree.close()
+
+
+def test_git_source_tree_in_subdirectory(tmp_path):
+    repo = tmp_path / 'repo'
+    (repo / 'vendor/FreeCAD/src/App').mkdir(parents=True)
+    (repo / 'vendor/FreeCAD/src/App/A.cpp').write_text('int a;\n')
+    (repo / 'src').mkdir()
+    (repo / 'src/B.cpp').write_text('int b;\n')
+    _git(repo, 'init', '-q')
+    _git(repo, 'add', '.')
+    _git(repo, 'commit', '-q', '-m', 'v1')
+    shutil.rmtree(repo / 'vendor/FreeCAD/src')
+
+    src = repo / 'vendor/FreeCAD/src'
+    tree = GitSourceTree(src, 'HEAD')
+    assert tree.repoPath == repo.resolve()
+    assert list(tree.genCppFiles()) == [src / 'App/A.cpp']
+    assert tree.readContent(src / 'App/A.cpp') == 'int a;\n'
+
+    bare = tmp_path / 'bare.git'
+    _git(tmp_path, 'clone', '-q', '--bare', str(repo), str(bare))
+    tree = GitSourceTree(bare / 'vendor/FreeCAD/src', 'HEAD')
+    assert tree.readContent(bare / 'vendor/FreeCAD/src/App/A.cpp') == 'int a;\n'
+
+    with pytest.raises(GitError, match='There are no files'):
+        list(GitSourceTree(repo / 'vendor/src', 'HEAD').genCppFiles())
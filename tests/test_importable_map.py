@@ -0,0 +1,22 @@
+from freecad_stub_gen.file_functions import SourceTree
+from freecad_stub_gen.importable_map import ImportableClassMap
+
+
+def test_importable_class_map(tmp_path):
+    (tmp_path / 'AppPart.cpp').write_text(
+        'void init() {\n'
+        'Base::Interpreter().addType(&Part::TopoShapePy::Type, mod, "TopoShape");\n'
+        'Base::Interpreter().addType(&Part::ArcPy::Type, mod, "Arc");\n'
+        'Base::Interpreter().addType(&Sketcher::ArcPy::Type, mod, "Arc");\n'
+        '}\n'
+    )
+    classMap = ImportableClassMap()
+    classMap.build(SourceTree(tmp_path))
+
+    assert dict(classMap.items()) == {'TopoShapePy': 'PartModule.TopoShape'}
+    assert classMap.dup == {'ArcPy': {'PartModule.Arc', 'Sketcher.Arc'}}
+    # names of the map and names with duplicated keys
+    assert classMap.isImportable('PartModule.TopoShape')
+    assert classMap.isImportable('Sketcher.Arc')
+    assert not classMap.isImportable('TopoShapePy')
+    assert not classMap.isImportable('TopoShape')
@@ -0,0 +1,98 @@
+import gzip
+import json
+from pathlib import Path
+
+from freecad_stub_gen.benchmark.synthetic_tree import generateSourceTree
+from freecad_stub_gen.file_functions import getSourceTree
+from freecad_stub_gen.generate import generateFreeCadStubs, generateFreeCadStubsFromIr
+from freecad_stub_gen.generators.types_enum import generateTypes
+from freecad_stub_gen.python_code.ir import (
+    ClassDef,
+    Code,
+    FunctionDef,
+    ParamData,
+    PropertyDef,
+    SignatureData,
+)
+from freecad_stub_gen.python_code.module_container import Module
+
+
+def _createModule() -> Module:
+    signature = SignatureData(
+        (ParamData('self'), ParamData('value', default="'a'", annotation='str')),
+        'int',
+    )
+    classDef = ClassDef(
+        'Feature',
+        ('FreeCAD.DocumentObject',),
+        'Feature doc.',
+        (
+            PropertyDef('Label', 'str', 'str', readOnly=False),
+            FunctionDef('run', (signature,)),
+        ),
+        fromXml=True,
+    )
+    root = Module()
+    mod = root['Part']
+    mod.imports.add('FreeCAD')
+    mod += Code('# FeaturePy.xml\n')
+    mod += classDef
+    return root
+
+
+def test_ir_render():
+    mod = _createModule()['Part']
+    assert mod.content == (
+        '# FeaturePy.xml\n'
+        'class Feature(FreeCAD.DocumentObject):\n'
+        '    """Feature doc."""\n'
+        '\n'
+        '    @property\n'
+        '    def Label(self) -> str: ...\n'
+        '\n'
+        '    @Label.setter\n'
+        '    def Label(self, value: str): ...\n'
+        '\n'
+        "    def run(self, value: str = 'a') -> int: ...\n"
+        '\n'
+        '\n'
+    )
+
+
+def test_ir_dump_and_load(tmp_path: Path):
+    root = _createModule()
+    for irPath in (tmp_path / 'ir.json', tmp_path / 'ir.bin'):
+        root.dump(irPath, '# types\n')
+        loaded, typeConsts = Module.load(irPath)
+        assert typeConsts == '# types\n'
+        assert loaded['Part'].nodes == root['Part'].nodes
+        assert loaded['Part'].getContent() == root['Part'].getContent()
+
+
+def test_ir_binary_is_compressed_json(tmp_path: Path):
+    irPath = tmp_path / 'ir.bin'
+    _createModule().dump(irPath)
+    data = json.loads(gzip.decompress(irPath.read_bytes()))
+    assert data['module']['subModules'][0]['name'] == 'Part'
+
+
+def test_stubs_from_ir(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr('freecad_stub_gen.incremental.CACHE_DIR', None)
+    sourcePath = generateSourceTree(tmp_path / 'src', size=2)
+    typeConsts = generateTypes(getSourceTree(sourcePath))
+
+    def readStubs(targetPath: Path) -> dict[str, bytes]:
+        return {
+            p.relative_to(targetPath).as_posix(): p.read_bytes()
+            for p in targetPath.rglob('*')
+            if p.is_file()
+        }
+
+    for irPath in (tmp_path / 'ir.json', tmp_path / 'ir.bin'):
+        generateFreeCadStubs(
+            sourcePath, tmp_path / 'direct', irPath=irPath, typeConsts=typeConsts
+        )
+        generateFreeCadStubsFromIr(irPath, tmp_path / 'fromIr')
+        stubs = readStubs(tmp_path / 'direct')
+        assert stubs['FreeCADTemplates/type_consts.py'] == typeConsts.encode()
+        assert readStubs(tmp_path / 'fromIr') == stubs
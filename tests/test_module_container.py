@@ -0,0 +1,67 @@
+from pathlib import Path
+
+from freecad_stub_gen.python_code.module_container import Module
+
+
+def test_module_content_chunks():
+    mod = Module()
+    assert mod.content == ''
+
+    mod += 'a = 1'
+    other = Module('b = 2\n', ['typing'])
+    subModule = other['Sub']
+    subModule += 'c = 3'
+    mod.update(other)
+    mod += 'd = 4\n'
+    assert mod.content == 'a = 1\nb = 2\nd = 4\n'
+    assert mod.getContent() == 'import typing\n\n\na = 1\nb = 2\nd = 4\n'
+    assert mod['Sub'].content == 'c = 3\n'
+
+    mod.content = ''
+    assert list(mod.genFiles(Path('M'))) == [
+        (Path('M/Sub.pyi'), 'c = 3\n'),
+        (Path('M/__init__.pyi'), ''),
+    ]
+
+
+def test_module_content_cache():
+    mod = Module('a = 1\n')
+    assert mod.content is mod.content
+
+    mod += 'b = 2'
+    assert mod.content == 'a = 1\nb = 2\n'
+
+    other = Module('c = 3\n')
+    subModule = other['Sub']
+    subModule += 'd = 4'
+    assert mod['Sub'].content == ''
+    mod.update(other)
+    assert mod.content == 'a = 1\nb = 2\nc = 3\n'
+    assert mod['Sub'].content == 'd = 4\n'
+
+    mod.content = 'e = 5\n'
+    assert mod.content == 'e = 5\n'
+
+
+def test_module_update_merges_sub_modules():
+    mod = Module()
+    subModule = mod['Sub']
+    subModule += 'a = 1'
+    subModule.imports.add('typing')
+
+    other = Module()
+    otherSub = other['Sub']
+    otherSub += 'b = 2'
+    otherSub.forcePackage = True
+    nested = other['Sub.Nested']
+    nested += 'c = 3'
+    mod.update(other)
+
+    # existing submodules are extended, not replaced
+    assert mod['Sub'] is subModule
+    assert subModule.content == 'a = 1\nb = 2\n'
+    assert list(subModule.imports) == ['typing']
+    assert subModule.forcePackage
+    assert subModule['Nested'].content == 'c = 3\n'
+    assert subModule['Nested'] is not nested
+    assert subModule['Nested'].parent is subModule
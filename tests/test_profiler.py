@@ -0,0 +1,43 @@
+import os
+
+from freecad_stub_gen.profiler import Profiler
+
+
+def test_profiler_report():
+    profiler = Profiler()
+    with profiler.span(profiler.STAGE, 'walk'):
+        pass
+    assert not profiler.spans  # disabled
+
+    profiler.enabled = True
+    with profiler.span(profiler.STAGE, 'generate'):
+        for name in ('a.cpp', 'b.cpp', 'a.cpp'):
+            with profiler.span(profiler.FILE, name):
+                pass
+    workerSpans = profiler.takeSpans(1)
+    assert [s.name for s in profiler.spans] == ['a.cpp']
+    profiler.spans.extend(workerSpans)
+
+    top = 2
+    report = profiler.createReport(top)
+    assert report['stages']['generate']['count'] == 1
+    assert report['stages']['generate']['wall'] >= report['slowestFiles'][0]['wall']
+    assert len(report['slowestFiles']) == top
+    assert report['generators'] == {}
+    assert report['slowestFunctions'] == []
+
+
+def test_profiler_trace():
+    profiler = Profiler()
+    profiler.enabled = True
+    with profiler.span(profiler.DIRECTORY, 'App'), profiler.span(
+        profiler.FILE, 'a.cpp'
+    ):
+        pass
+    profiler.spans.append(profiler.spans[0]._replace(pid=0))  # span from worker
+
+    events = profiler.createTrace()['traceEvents']
+    assert [(e['ph'], e['pid']) for e in events[:2]] == [('M', 0), ('M', os.getpid())]
+    spans = [(e['cat'], e['name']) for e in events if e['ph'] == 'X']
+    assert spans == [('directory', 'App'), ('file', 'a.cpp'), ('file', 'a.cpp')]
+    assert events[2]['ts'] == 0
@@ -0,0 +1,32 @@
+import pytest
+
+from freecad_stub_gen.generators.common.gen_property.macro.base import ClassContext
+from freecad_stub_gen.generators.common.gen_property.macro.full import PropertyMacro
+
+
+def test_property_macro_type_id(monkeypatch):
+    context = ClassContext(
+        namespace='Part',
+        classDeclarationBodies=(
+            '{ App::PropertyLength Radius; PropertyPartShape Shape; }',
+        ),
+    )
+    radius = PropertyMacro('Radius', '1.0', context=context)
+    shape = PropertyMacro('Shape', 'TopoShape()', context=context)
+    assert radius.context is shape.context
+    assert not hasattr(radius, '__dict__')
+
+    def fail(text):
+        raise AssertionError(text)
+
+    # type is found when the macro is created
+    monkeypatch.setattr(
+        'freecad_stub_gen.generators.common.gen_property.macro.base'
+        '.getMemberDeclarationIndex',
+        fail,
+    )
+    assert radius.typeId == 'App::PropertyLength'
+    assert shape.typeId == 'Part::PropertyPartShape'
+    assert radius.pythonGetType == 'FreeCAD.Quantity'
+    with pytest.raises(AttributeError):
+        radius.other = 1  # type: ignore[attr-defined]